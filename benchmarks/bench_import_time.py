@@ -0,0 +1,129 @@
+"""
+Measure what loading the plugin URLconfs costs at LMS worker startup.
+
+Runs `python -X importtime` in a subprocess which sets up Django with the
+plugin installed and imports `mobile_api_extensions.urls` and
+`mobile_api_extensions.auth_urls`, then reports the cumulative import time
+of the plugin modules.
+
+Outside an LMS environment edx-platform and its dependencies are replaced
+by stub modules (so their own import time is not measured) and the script
+lists the platform modules the URLconfs asked for at import time.
+
+Usage:
+    python benchmarks/bench_import_time.py [--no-stubs]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STUBBED_PACKAGES = (
+    'celery', 'common', 'crum', 'edx_django_utils', 'edx_rest_framework_extensions', 'lms', 'oauth2_provider',
+    'oauthlib', 'opaque_keys', 'openedx', 'search', 'social_core', 'social_django', 'xmodule',
+)
+
+CHILD_SCRIPT = '''
+import importlib.abc, importlib.machinery, json, sys, types
+from unittest import mock
+
+STUBBED_PACKAGES = {stubbed_packages!r}
+requested = []
+
+
+class StubModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        value = mock.MagicMock(name=f'{{self.__name__}}.{{name}}')
+        value.__name__ = name
+        setattr(self, name, value)
+        return value
+
+
+class StubFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def find_spec(self, fullname, path, target=None):
+        if fullname.split('.')[0] in STUBBED_PACKAGES:
+            return importlib.machinery.ModuleSpec(fullname, self, is_package=True)
+        return None
+
+    def create_module(self, spec):
+        requested.append(spec.name)
+        module = StubModule(spec.name)
+        module.__path__ = []
+        return module
+
+    def exec_module(self, module):
+        pass
+
+
+if {use_stubs!r}:
+    sys.meta_path.insert(0, StubFinder())
+
+import django
+from django.conf import settings
+
+settings.configure(
+    INSTALLED_APPS=['django.contrib.auth', 'django.contrib.contenttypes', 'mobile_api_extensions'],
+    DATABASES={{'default': {{'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}}}},
+    USERNAME_PATTERN=r'(?P<username>[\\w.@+-]+)',
+    COURSE_ID_PATTERN=r'(?P<course_id>[^/+]+(/|\\+)[^/+]+(/|\\+)[^/?]+)',
+    COURSE_KEY_PATTERN=r'(?P<course_key_string>[^/+]+(/|\\+)[^/+]+(/|\\+)[^/?]+)',
+    FEATURES={{}},
+)
+django.setup()
+startup_modules = [name for name in requested]
+
+import mobile_api_extensions.urls
+import mobile_api_extensions.auth_urls
+
+print(json.dumps({{
+    'startup': sorted(set(startup_modules)),
+    'urls': sorted(set(requested) - set(startup_modules)),
+}}))
+'''
+
+
+def parse_importtime(stderr, prefix):
+    """
+    Return {module: cumulative microseconds} for modules starting with `prefix`.
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        if name.startswith(prefix) and cumulative.isdigit():
+            times[name] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--no-stubs', action='store_true', help='import the real edx-platform modules')
+    args = parser.parse_args()
+
+    code = CHILD_SCRIPT.format(stubbed_packages=STUBBED_PACKAGES, use_stubs=not args.no_stubs)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True, check=False,
+    )
+    if result.returncode:
+        sys.exit(result.stderr)
+
+    for module, cumulative in sorted(parse_importtime(result.stderr, 'mobile_api_extensions').items()):
+        print(f'{cumulative / 1000:9.2f} ms  {module}')
+
+    if not args.no_stubs:
+        requested = json.loads(result.stdout.splitlines()[-1])
+        print('\nPlatform modules imported by AppConfig.ready():')
+        print('\n'.join(f'  {name}' for name in requested['startup']) or '  (none)')
+        print('\nPlatform modules imported by the URLconfs:')
+        print('\n'.join(f'  {name}' for name in requested['urls']) or '  (none)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Compare render time and payload size of the mobile API renderers.
+
+Covers the JSON renderers and the MessagePack/CBOR renderers whose libraries
+are installed.
+
+Uses synthetic blocks and progress payloads shaped like the responses of
+`BlocksInCourseViewExtended` and `CourseProgressView`.
+
+Usage:
+    python benchmarks/bench_renderers.py [--blocks 5000] [--repeat 20]
+"""
+import argparse
+import datetime
+import gzip
+import os
+import sys
+import timeit
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if not settings.configured:
+    settings.configure(INSTALLED_APPS=[], USE_TZ=True)
+    django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from mobile_api_extensions.renderers import (  # noqa: E402
+    BINARY_RENDERER_CLASSES,
+    FastJSONRenderer,
+    brotli,
+    orjson,
+)
+
+
+def make_blocks_payload(blocks_count):
+    """
+    Build a payload shaped like a blocks outline response.
+    """
+    now = datetime.datetime(2024, 1, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc)
+    blocks = {}
+    for index in range(blocks_count):
+        block_id = f'block-v1:edX+DemoX+Demo_Course+type@vertical+block@{index:032x}'
+        blocks[block_id] = {
+            'id': block_id,
+            'block_id': f'{index:032x}',
+            'lms_web_url': f'https://lms.example.com/courses/course-v1:edX+DemoX+Demo_Course/jump_to/{block_id}',
+            'student_view_url': f'https://lms.example.com/xblock/{block_id}',
+            'type': 'vertical',
+            'display_name': f'Unit {index}',
+            'graded': index % 3 == 0,
+            'format': 'Homework' if index % 3 == 0 else None,
+            'due': now,
+            'completion': index % 7 / 7,
+            'student_view_multi_device': True,
+            'block_counts': {'video': index % 4},
+            'children': [
+                f'block-v1:edX+DemoX+Demo_Course+type@html+block@{index:016x}{child:016x}' for child in range(4)
+            ],
+        }
+    return {
+        'root': next(iter(blocks)),
+        'blocks': blocks,
+        'id': 'course-v1:edX+DemoX+Demo_Course',
+        'name': 'Demonstration Course',
+        'start': now,
+        'end': None,
+        'media': {'image': {'raw': '/asset-v1:edX+DemoX+Demo_Course+type@asset+block@images_course_image.jpg'}},
+    }
+
+
+def make_progress_payload(chapters_count):
+    """
+    Build a payload shaped like a course progress response.
+    """
+    return {'sections': [
+        {
+            'display_name': f'Chapter {chapter}',
+            'subsections': [
+                {
+                    'earned': 3.0,
+                    'total': 5.0,
+                    'percentageString': '60%',
+                    'display_name': f'Subsection {chapter}.{section}',
+                    'score': [{'earned': 1.0, 'possible': 1.0} for _ in range(5)],
+                    'show_grades': True,
+                    'graded': True,
+                    'grade_type': 'Homework',
+                }
+                for section in range(10)
+            ],
+        }
+        for chapter in range(chapters_count)
+    ]}
+
+
+def bench(name, payload, repeat):
+    """
+    Print render time and encoded sizes of `payload` for every renderer.
+    """
+    print(f'\n{name}')
+    for renderer in (JSONRenderer(), FastJSONRenderer(), *(cls() for cls in BINARY_RENDERER_CLASSES)):
+        seconds = min(timeit.repeat(lambda: renderer.render(payload), number=1, repeat=repeat))  # noqa: B023
+        content = renderer.render(payload)
+        sizes = f'raw={len(content)} gzip={len(gzip.compress(content, compresslevel=6))}'
+        if brotli is not None:
+            sizes += f' br={len(brotli.compress(content, quality=4))}'
+        print(f'  {type(renderer).__name__:<18} {seconds * 1000:8.2f} ms  {sizes}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--blocks', type=int, default=5000)
+    parser.add_argument('--chapters', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print('orjson is not installed, FastJSONRenderer falls back to the stock renderer.')
+    bench(f'blocks ({args.blocks} blocks)', make_blocks_payload(args.blocks), args.repeat)
+    bench(f'progress ({args.chapters} chapters)', make_progress_payload(args.chapters), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
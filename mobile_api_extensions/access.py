@@ -0,0 +1,72 @@
+"""
+Request-scoped memoization of courseware access decisions.
+
+Views and helpers of the plugin check access through `has_access` below, so
+a (user, action, course) decision is only computed once per request however
+many code paths ask for it. The number of avoided checks is reported as the
+`mobile_api_extensions.has_access_avoided` custom attribute, and the computed
+and avoided checks of a request are exported by the metrics middleware.
+
+Nothing is batch-resolved here. Roles come from the platform's `RoleCache`,
+loaded once per user by the first role check, and enrollments from the
+request cache of `CourseEnrollment.is_enrolled`, filled one course at a time.
+The course-level actions checked by the plugin don't read course groups.
+"""
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.monitoring import accumulate
+
+ACCESS_CACHE_NAMESPACE = 'mobile_api_extensions.access'
+AVOIDED_CHECKS_ATTRIBUTE = 'mobile_api_extensions.has_access_avoided'
+CHECK_COUNTS_KEY = 'check_counts'
+
+
+def _count_check(result):
+    request_cache = RequestCache(ACCESS_CACHE_NAMESPACE)
+    counts = request_cache.get_cached_response(CHECK_COUNTS_KEY).get_value_or_default(None)
+    if counts is None:
+        counts = {'computed': 0, 'avoided': 0}
+        request_cache.set(CHECK_COUNTS_KEY, counts)
+    counts[result] += 1
+
+
+def get_access_check_counts():
+    """
+    Return the number of computed and avoided access checks of the current request.
+    """
+    cached_response = RequestCache(ACCESS_CACHE_NAMESPACE).get_cached_response(CHECK_COUNTS_KEY)
+    return cached_response.get_value_or_default(None) or {'computed': 0, 'avoided': 0}
+
+
+def has_access(user, action, obj, course_key=None):
+    """
+    Memoized version of courseware's `has_access` for courses and course overviews.
+
+    Objects without an `id` are checked without memoization.
+    """
+    # Deferred import, courseware access loads the whole courseware app.
+    from lms.djangoapps.courseware.access import has_access as courseware_has_access
+
+    obj_id = getattr(obj, 'id', None)
+    if obj_id is None:
+        _count_check('computed')
+        return courseware_has_access(user, action, obj, course_key)
+
+    request_cache = RequestCache(ACCESS_CACHE_NAMESPACE)
+    key = (user.id, action, type(obj).__name__, str(obj_id), str(course_key) if course_key else None)
+    cached_response = request_cache.get_cached_response(key)
+    if cached_response.is_found:
+        accumulate(AVOIDED_CHECKS_ATTRIBUTE, 1)
+        _count_check('avoided')
+        return cached_response.value
+
+    access = courseware_has_access(user, action, obj, course_key)
+    request_cache.set(key, access)
+    _count_check('computed')
+    return access
+
+
+def clear_access_cache():
+    """
+    Forget the memoized decisions, for code running outside of a request.
+    """
+    RequestCache(ACCESS_CACHE_NAMESPACE).clear()
@@ -1,6 +1,20 @@
-from django.contrib import admin
+from django.conf import settings
+from django.contrib import admin, messages
 
 from .models import MobileUserAuth
+from .tasks import revoke_user_credentials, schedule_task
 
 
-admin.site.register(MobileUserAuth)
+@admin.register(MobileUserAuth)
+class MobileUserAuthAdmin(admin.ModelAdmin):
+    actions = ['revoke_credentials']
+
+    def revoke_credentials(self, request, queryset):
+        if not getattr(settings, 'MOBILE_OAUTH_CLIENT_IDS', None):
+            self.message_user(request, 'Set MOBILE_OAUTH_CLIENT_IDS to revoke mobile tokens.', level=messages.ERROR)
+            return
+        user_ids = list(queryset.values_list('user_id', flat=True))
+        schedule_task(revoke_user_credentials, user_ids)
+        self.message_user(request, f'Revoking the credentials of {len(user_ids)} users in the background.')
+
+    revoke_credentials.short_description = 'Revoke the authorization codes and OAuth tokens of the selected users'
@@ -1,75 +1,179 @@
 """
 Views for user API
 """
+import hashlib
+from contextlib import nullcontext
+
 from common.djangoapps.student.models import CourseEnrollment
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
 from edx_rest_framework_extensions.paginators import DefaultPagination
-from lms.djangoapps.certificates.api import certificate_downloadable_status
 from lms.djangoapps.course_api.blocks.views import BlocksInCourseView
 from lms.djangoapps.course_api.views import CourseDetailView, CourseListView
 from lms.djangoapps.course_api.forms import CourseListGetForm
-from lms.djangoapps.courseware.access import has_access
-from lms.djangoapps.courseware.courses import get_course_with_access
+from lms.djangoapps.courseware.courses import get_course_overview_with_access, get_course_with_access
+from lms.djangoapps.courseware.exceptions import CourseAccessRedirect
 from lms.djangoapps.discussion.rest_api.views import CommentViewSet
-from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+from lms.djangoapps.mobile_api.users.serializers import CourseEnrollmentSerializer, CourseEnrollmentSerializerv05
 from lms.djangoapps.mobile_api.users.views import UserCourseEnrollmentsList
+from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.user_api.accounts.serializers import AccountLegacyProfileSerializer
 from openedx.core.djangoapps.user_api.accounts.views import DeactivateLogoutView
 from openedx.core.lib.api.authentication import BearerAuthentication
 from openedx.core.lib.api.view_utils import view_auth_classes
+from rest_framework import status
 from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .utils import list_courses
+from .access import has_access
+from .cache import single_flight
+from .certificates import get_certificate_download_urls
+from .mixins import MobileResponseMixin, ReadReplicaMixin, SparseFieldsMixin
+from .offline import get_course_package, package_response
+from .progress import get_precomputed_progress, get_progress_sections
+from .query_budget import query_budget
+from .renderers import BINARY_RENDERER_CLASSES, FastJSONRenderer
+from .retirement import get_job_status, start_deactivation
+from .routers import read_replica
+from .subviews import init_view, list_page
+from .utils import iter_courses, list_courses
+from .warming import ensure_course_overview_warm, ensure_course_warm
 
 
 User = get_user_model()
 
 
+def get_certificate_data(request, user, course_id):
+    """Returns the information about the user's certificate in the course."""
+    download_url = get_certificate_download_urls(user).get(str(course_id))
+    if download_url:
+        return {
+            'url': request.build_absolute_uri(download_url),
+        }
+    else:
+        return {}
+
+
+class BulkCertificateSerializerMixin:
+    """
+    Resolve the `certificate` field of enrollment serializers with `get_certificate_data`.
+    """
+
+    def get_certificate(self, model):
+        return get_certificate_data(self.context['request'], model.user, model.course_id)
+
+
+class CourseEnrollmentSerializerExtended(BulkCertificateSerializerMixin, CourseEnrollmentSerializer):
+    """
+    `CourseEnrollmentSerializer` resolving certificates from the bulk certificate status.
+    """
+
+
+class CourseEnrollmentSerializerv05Extended(BulkCertificateSerializerMixin, CourseEnrollmentSerializerv05):
+    """
+    `CourseEnrollmentSerializerv05` resolving certificates from the bulk certificate status.
+    """
+
+
+BULK_CERTIFICATE_SERIALIZERS = {
+    CourseEnrollmentSerializer: CourseEnrollmentSerializerExtended,
+    CourseEnrollmentSerializerv05: CourseEnrollmentSerializerv05Extended,
+}
+
+
+def get_course_summary(request, user, course_overview):
+    """
+    Return the course information the mobile app shows next to the course outline.
+    """
+    return {
+        # identifiers
+        'id': str(course_overview.id),
+        'name': course_overview.display_name,
+        'number': course_overview.display_number_with_default,
+        'org': course_overview.display_org_with_default,
+
+        # dates
+        'start': course_overview.start,
+        'start_display': course_overview.start_display,
+        'start_type': course_overview.start_type,
+        'end': course_overview.end,
+
+        # access info
+        'courseware_access': has_access(
+            user,
+            'load_mobile',
+            course_overview
+        ).to_json(),
+
+        # various URLs
+        'media': {
+            'image': course_overview.image_urls,
+        },
+        'certificate': get_certificate_data(request, user, course_overview.id),
+        'is_self_paced': course_overview.self_paced
+    }
+
+
 @view_auth_classes()
-class CourseProgressView(APIView):
+class CourseProgressView(ReadReplicaMixin, MobileResponseMixin, APIView):
+    extra_renderer_classes = BINARY_RENDERER_CLASSES
 
+    @query_budget(30)
     def get(self, request, course_id):
         course_key = CourseKey.from_string(course_id)
-        course = get_course_with_access(request.user, 'load', course_key)
+        course_overview = get_course_overview_with_access(request.user, 'load', course_key)
+        sections = get_precomputed_progress(request.user, course_overview)
+        if sections is None:
+            course = get_course_with_access(request.user, 'load', course_key)
+            sections = get_progress_sections(request.user, course)
+        return Response({'sections': sections})
 
-        course_grade = CourseGradeFactory().read(request.user, course)
-        courseware_summary = course_grade.chapter_grades.values()
 
-        progress_data = []
+@view_auth_classes()
+class CourseOfflinePackageView(APIView):
+    """
+    **Use Case**
 
-        staff_access = bool(has_access(request.user, 'staff', course))
+        Download the offline package of a course the user is enrolled in: a zip
+        archive with the course outline (outline.json), the student view data
+        of its blocks (student_views.json), the course asset manifest
+        (assets.json) and manifest.json.
 
-        for chapter in courseware_summary:
-            chapter_data = {
-                'display_name': chapter['display_name'],
-                'subsections': []
-            }
+        The package holds the content every enrolled learner can see: staff
+        only, unreleased and cohort, content group or enrollment track
+        restricted blocks and locked assets are left out.
 
-            for section in chapter['sections']:
-                earned = section.all_total.earned
-                total = section.all_total.possible
-                section_data = dict(
-                    earned=earned,
-                    total=total,
-                    percentageString="{0:.0%}".format(section.percent_graded),
-                    display_name=section.display_name,
-                    score=[{'earned': score.earned, 'possible': score.possible} for score in section.problem_scores.values()],
-                    show_grades=section.show_grades(staff_access),
-                    graded=section.graded,
-                    grade_type=section.format or '',
-                )
-                chapter_data['subsections'].append(section_data)
+    **Example Request**
+
+        GET /mobile_api_extensions/v1/courses/{course_id}/offline_package/
 
-            progress_data.append(chapter_data)
-        return Response({'sections': progress_data})
+    **Response Values**
 
+        The archive, with the package version as ETag. Single byte ranges are
+        supported (Range and If-Range headers) to resume interrupted downloads.
 
-class UserCourseEnrollmentsListExtended(UserCourseEnrollmentsList):
+        Returns 404 while the course has no package, packages are built when the
+        course is published if `MOBILE_OFFLINE_PACKAGES_ENABLED` is set.
+    """
+
+    def get(self, request, course_id):
+        course_key = CourseKey.from_string(course_id)
+        get_course_overview_with_access(request.user, 'load', course_key, check_if_enrolled=True)
+        package = get_course_package(course_key)
+        if package is None:
+            raise Http404
+        return package_response(request, package)
+
+
+class UserCourseEnrollmentsListExtended(ReadReplicaMixin, MobileResponseMixin, UserCourseEnrollmentsList):
     """
     **Use Case**
 
@@ -139,6 +243,14 @@ class UserCourseEnrollmentsListExtended(UserCourseEnrollmentsList):
     """
     pagination_class = DefaultPagination
 
+    def get_serializer_class(self):
+        serializer_class = super().get_serializer_class()
+        return BULK_CERTIFICATE_SERIALIZERS.get(serializer_class, serializer_class)
+
+    @query_budget(10, per_item=3)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 class CommentViewSetExtended(CommentViewSet):
     """
@@ -244,7 +356,7 @@ class CommentViewSetExtended(CommentViewSet):
         return response
 
 
-class BlocksInCourseViewExtended(BlocksInCourseView):
+class BlocksInCourseViewExtended(ReadReplicaMixin, MobileResponseMixin, BlocksInCourseView):
     """
     **Use Case**
 
@@ -282,20 +394,13 @@ class BlocksInCourseViewExtended(BlocksInCourseView):
 
         If an invalid course_id is supplied, a 400: Bad Request is returned,
         with a message indicating that the course_id is not valid.
-    """
 
-    def get_certificate(self, request, user, course_id):
-        """Returns the information about the user's certificate in the course."""
-        certificate_info = certificate_downloadable_status(user, course_id)
-        if certificate_info['is_downloadable']:
-            return {
-                'url': request.build_absolute_uri(
-                    certificate_info['download_url']
-                ),
-            }
-        else:
-            return {}
+        Clients sending `Accept: application/msgpack` or `Accept: application/cbor`
+        get the same payload in the requested binary encoding.
+    """
+    extra_renderer_classes = BINARY_RENDERER_CLASSES
 
+    @query_budget(40)
     def list(self, request, hide_access_denials=False):  # pylint: disable=arguments-differ
         """
         Retrieves the usage_key for the requested course, and then returns the
@@ -305,6 +410,10 @@ class BlocksInCourseViewExtended(BlocksInCourseView):
         Arguments:
             request - Django request object
         """
+        try:
+            ensure_course_warm(CourseKey.from_string(request.query_params.get('course_id', '')))
+        except InvalidKeyError:
+            pass
         response = super().list(request,
                                 hide_access_denials=hide_access_denials)
 
@@ -312,39 +421,11 @@ class BlocksInCourseViewExtended(BlocksInCourseView):
         course_key = CourseKey.from_string(course_id)
         course_overview = CourseOverview.get_from_id(course_key)
 
-        course_data = {
-            # identifiers
-            'id': course_id,
-            'name': course_overview.display_name,
-            'number': course_overview.display_number_with_default,
-            'org': course_overview.display_org_with_default,
-
-            # dates
-            'start': course_overview.start,
-            'start_display': course_overview.start_display,
-            'start_type': course_overview.start_type,
-            'end': course_overview.end,
-
-            # access info
-            'courseware_access': has_access(
-                request.user,
-                'load_mobile',
-                course_overview
-            ).to_json(),
-
-            # various URLs
-            'media': {
-                'image': course_overview.image_urls,
-            },
-            'certificate': self.get_certificate(request, request.user, course_key),
-            'is_self_paced': course_overview.self_paced
-        }
-
-        response.data.update(course_data)
+        response.data.update(get_course_summary(request, request.user, course_overview))
         return response
 
 
-class CourseDetailViewExtended(CourseDetailView):
+class CourseDetailViewExtended(ReadReplicaMixin, SparseFieldsMixin, MobileResponseMixin, CourseDetailView):
     """
     **Use Cases**
 
@@ -397,6 +478,11 @@ class CourseDetailViewExtended(CourseDetailView):
             is being accessed. The username is not only required if the API is
             requested by an Anonymous user.
 
+        fields (optional):
+            Comma separated list of the response fields to return, e.g.
+            `fields=id,name,media,start`. Fields that are not listed are not
+            computed. All fields are returned by default.
+
     **Returns**
 
         * 200 on success with above fields.
@@ -434,8 +520,13 @@ class CourseDetailViewExtended(CourseDetailView):
     """
 
     def get(self, request, course_key_string):
+        try:
+            ensure_course_overview_warm(CourseKey.from_string(course_key_string))
+        except InvalidKeyError:
+            pass
         response = super().get(request, course_key_string)
-        response.data['is_enrolled'] = CourseEnrollment.is_enrolled(request.user, course_key_string)
+        if self.is_field_requested('is_enrolled'):
+            response.data['is_enrolled'] = CourseEnrollment.is_enrolled(request.user, course_key_string)
         return response
 
 
@@ -471,13 +562,72 @@ class DeactivateLogoutViewExtended(DeactivateLogoutView):
     -  Change the user's password permanently to Django's unusable password
     -  Log the user out
     - Create a row in the retirement table for that user
+
+    **Asynchronous Mode**
+
+     With `MOBILE_ASYNC_DEACTIVATION` enabled, the password is made unusable,
+     the OAuth tokens are deleted and the user is logged out during the
+     request, the retirement request and deletion email are handled by a
+     background task. The request returns an HTTP 202 "Accepted" response:
+
+        {
+            "job_id": "3f2b...",
+            "status_url": "https://.../mobile_api_extensions/user/v1/accounts/deactivate_logout/3f2b.../"
+        }
+
+     The status URL needs no authentication and returns the job "status":
+     "pending", "succeeded" or "failed".
     """
 
     authentication_classes = (JwtAuthentication, SessionAuthentication, BearerAuthentication,)
 
+    def post(self, request):
+        if not settings.MOBILE_ASYNC_DEACTIVATION:
+            return super().post(request)
+
+        try:
+            verify_user_password_response = self._verify_user_password(request)
+        except KeyError:
+            return Response('Username not specified.', status=status.HTTP_400_BAD_REQUEST)
+        if verify_user_password_response.status_code != status.HTTP_204_NO_CONTENT:
+            return verify_user_password_response
+
+        job_id = start_deactivation(request)
+        status_url = reverse('mobile_api_extensions:deactivate_logout_status', kwargs={'job_id': job_id})
+        return Response(
+            {'job_id': job_id, 'status_url': request.build_absolute_uri(status_url)},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class DeactivationStatusView(APIView):
+    """
+    **Use Case**
+
+        Poll the status of an asynchronous account deactivation.
+
+    **Example Request**
+
+        GET /mobile_api_extensions/user/v1/accounts/deactivate_logout/{job_id}/
+
+    **Response Values**
+
+        * status: "pending", "succeeded" or "failed".
+
+        Returns 404 for unknown or expired job ids.
+    """
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+
+    def get(self, request, job_id):
+        job_status = get_job_status(job_id)
+        if job_status is None:
+            raise Http404
+        return Response({'status': job_status})
+
 
 @view_auth_classes(is_authenticated=False)
-class CourseListViewExtended(CourseListView):
+class CourseListViewExtended(ReadReplicaMixin, SparseFieldsMixin, MobileResponseMixin, CourseListView):
     """
     **Use Cases**
 
@@ -513,6 +663,18 @@ class CourseListViewExtended(CourseListView):
             Notice that Staff users are always granted permission to list any
             course.
 
+        fields (optional):
+            Comma separated list of the fields to return for every course,
+            e.g. `fields=id,name,media,start`. Fields that are not listed are
+            not computed. All fields are returned by default.
+
+        stream (optional):
+            "json" or "ndjson". Stream every visible course, unpaginated and
+            ordered by id, as a JSON array or as newline delimited JSON. Courses
+            are loaded, checked and serialized `MOBILE_COURSE_LIST_STREAM_CHUNK_SIZE`
+            at a time while the response is sent, so large catalogs do not have
+            to fit in memory.
+
     **Returns**
 
         * 200 on success, with a list of course discovery objects as returned
@@ -550,18 +712,143 @@ class CourseListViewExtended(CourseListView):
             ]
     """
 
+    stream_content_types = {
+        'json': 'application/json',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    def _get_list_kwargs(self):
+        form = CourseListGetForm(self.request.query_params, initial={'requesting_user': self.request.user})
+        if not form.is_valid():
+            raise ValidationError(form.errors)
+        return {
+            'username': form.cleaned_data['username'],
+            'org': form.cleaned_data['org'],
+            'filter_': form.cleaned_data['filter_'],
+            'search_term': form.cleaned_data['search_term'],
+            'permissions': form.cleaned_data.get('permissions', None),
+        }
+
     def get_queryset(self):
         """
         Yield courses visible to the user.
         """
-        form = CourseListGetForm(self.request.query_params, initial={'requesting_user': self.request.user})
-        if not form.is_valid():
-            raise ValidationError(form.errors)
-        return list_courses(
-            self.request,
-            form.cleaned_data['username'],
-            org=form.cleaned_data['org'],
-            filter_=form.cleaned_data['filter_'],
-            search_term=form.cleaned_data['search_term'],
-            permissions=form.cleaned_data.get('permissions', None)
+        return list_courses(self.request, **self._get_list_kwargs())
+
+    @query_budget(10, per_item=2)
+    def list(self, request, *args, **kwargs):
+        stream_format = request.query_params.get('stream')
+        if stream_format not in self.stream_content_types:
+            timeout = settings.MOBILE_ANONYMOUS_CATALOG_CACHE_TIMEOUT
+            if request.user.is_authenticated or not timeout:
+                return super().list(request, *args, **kwargs)
+            # The anonymous catalog is the same for every visitor of a site,
+            # a single request rebuilds it when it expires.
+            parent_list = super().list
+            cache_key = 'mobile_api_extensions.anonymous_catalog.' + hashlib.md5(
+                request.build_absolute_uri().encode()
+            ).hexdigest()
+            return Response(single_flight(
+                cache_key, lambda: parent_list(request, *args, **kwargs).data, timeout, name='anonymous_catalog'
+            ))
+
+        courses = iter_courses(
+            request, chunk_size=settings.MOBILE_COURSE_LIST_STREAM_CHUNK_SIZE, **self._get_list_kwargs()
         )
+        return StreamingHttpResponse(
+            self._stream_courses(courses, stream_format),
+            content_type=self.stream_content_types[stream_format],
+        )
+
+    def _stream_courses(self, courses, stream_format):
+        """
+        Yield the serialized courses as a JSON array or as JSON lines.
+
+        The response is consumed after the view returned, so the read replica
+        is enabled again for the queries made while streaming.
+        """
+        serializer = self.get_serializer()
+        renderer = FastJSONRenderer() if settings.MOBILE_FAST_JSON_RENDERER else JSONRenderer()
+        separator, prefix, suffix = (b'\n', b'', b'\n') if stream_format == 'ndjson' else (b',', b'[', b']')
+        with read_replica() if self._read_replica_token is not None else nullcontext():
+            yield prefix
+            for index, course in enumerate(courses):
+                yield (separator if index else b'') + renderer.render(serializer.to_representation(course))
+            yield suffix
+
+
+@view_auth_classes()
+class AppLaunchView(ReadReplicaMixin, MobileResponseMixin, APIView):
+    """
+    **Use Case**
+
+        Return the data the mobile app loads on launch in a single request:
+        the user's course enrollments, the course catalog and a summary of
+        every enrolled course.
+
+    **Example Requests**
+
+        GET /mobile_api_extensions/v1/app_launch/
+        GET /mobile_api_extensions/v1/app_launch/?include_progress=true
+
+    **Parameters**
+
+        include_progress (optional):
+            If "true", the summary of every enrolled course also contains its
+            progress "sections" as returned by `CourseProgressView`.
+
+        page, page_size (optional):
+            Pagination of the enrollments and course list sections.
+
+    **Response Values**
+
+        * enrollments: The response of `UserCourseEnrollmentsListExtended` (v1).
+        * courses: The response of `CourseListViewExtended` for the user.
+        * course_summaries: The course information returned by
+          `BlocksInCourseViewExtended`, keyed by the id of every enrolled course.
+
+        The sections are built in the request thread, so the access decisions,
+        roles and enrollments cached for the request are shared by all of them.
+        The permissions and throttles of the section views apply, each of them
+        runs on its own copy of the request.
+    """
+
+    def get(self, request):
+        username = request.user.username
+        enrollments_view = init_view(UserCourseEnrollmentsListExtended, request, api_version='v1', username=username)
+        courses_view = init_view(CourseListViewExtended, request, query_params={'username': username})
+
+        enrollments, enrollments_section = list_page(enrollments_view)
+        sections = {
+            'enrollments': enrollments_section,
+            'courses': list_page(courses_view)[1],
+        }
+
+        course_overviews = [enrollment.course_overview for enrollment in enrollments]
+        sections['course_summaries'] = {
+            str(course_overview.id): get_course_summary(request, request.user, course_overview)
+            for course_overview in course_overviews
+        }
+
+        if request.query_params.get('include_progress') == 'true':
+            for course_overview in course_overviews:
+                sections['course_summaries'][str(course_overview.id)]['sections'] = self._get_progress(
+                    request, course_overview.id
+                )
+
+        return Response(sections)
+
+    def _get_progress(self, request, course_key):
+        """
+        Return the course progress or None if the user can't load the course.
+        """
+        try:
+            course_overview = get_course_overview_with_access(request.user, 'load', course_key)
+            sections = get_precomputed_progress(request.user, course_overview)
+            if sections is None:
+                sections = get_progress_sections(
+                    request.user, get_course_with_access(request.user, 'load', course_key)
+                )
+        except (Http404, CourseAccessRedirect):
+            return None
+        return sections
@@ -63,3 +63,9 @@ class MobileApiExtensionsConfig(AppConfig):
             },
         }
     }
+
+    def ready(self):
+        """
+        Connect signal receivers.
+        """
+        from . import signals  # pylint: disable=unused-import,import-outside-toplevel
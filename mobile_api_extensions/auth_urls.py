@@ -1,35 +1,39 @@
 from django.urls import path, re_path, include
-from django.views.decorators.csrf import csrf_exempt
 
-from .views import (
-    AuthorizationCodeExchangeView,
-    auth_mobile,
-    complete_mobile,
-    redirect_to_mobile_deeplink,
-    redirect_to_mobile,
-)
-from .utils import is_enabled_mobile
+from .lazy import lazy_api_view, lazy_view
+
+VIEWS = 'mobile_api_extensions.views.'
 
 
 def append_mobile_urls(urlpatterns):
     """
-    Appends mobile-specific authentication URLs if mobile auth is enabled.
+    Appends mobile-specific authentication URLs.
+
+    The exchange endpoint is always routed, `AuthorizationCodeExchangeView`
+    checks per site whether mobile auth is enabled on every dispatch.
     """
-    if is_enabled_mobile():
-        urlpatterns.append(
-            re_path(
-                r'^exchange_authorization_code/?$',
-                csrf_exempt(AuthorizationCodeExchangeView.as_view()),
-                name='exchange_authorization_code',
-            )
+    urlpatterns.append(
+        re_path(
+            r'^exchange_authorization_code/?$',
+            lazy_api_view(VIEWS + 'AuthorizationCodeExchangeView'),
+            name='exchange_authorization_code',
         )
+    )
     return urlpatterns
 
 
 urlpatterns = [
-    re_path(r'^auth/login/(?P<backend>[^/]+)/$', auth_mobile, name='social_login_override'),
-    re_path(r'^auth/complete/(?P<backend>[^/]+)/$', complete_mobile, name='social_complete_override'),
+    re_path(r'^auth/login/(?P<backend>[^/]+)/$', lazy_view(VIEWS + 'auth_mobile'), name='social_login_override'),
+    re_path(
+        r'^auth/complete/(?P<backend>[^/]+)/$',
+        lazy_view(VIEWS + 'complete_mobile', csrf_exempt=True),
+        name='social_complete_override'
+    ),
     path('auth/', include('social_django.urls', namespace='social')),
-    path('sso_deeplink', redirect_to_mobile_deeplink, name='sso-deeplink'),
-    re_path(r'^auth/login/mobile/(?P<backend_name>[^/]+)/$', redirect_to_mobile, name='redirect-mobile'),
-]
\ No newline at end of file
+    path('sso_deeplink', lazy_api_view(VIEWS + 'redirect_to_mobile_deeplink'), name='sso-deeplink'),
+    re_path(
+        r'^auth/login/mobile/(?P<backend_name>[^/]+)/$',
+        lazy_view(VIEWS + 'redirect_to_mobile'),
+        name='redirect-mobile'
+    ),
+]
@@ -0,0 +1,141 @@
+"""
+Caching helpers for mobile_api_extensions.
+
+`ProcessCache` memoizes values in the memory of a worker process,
+`single_flight` and `single_flight_call` protect expensive cache misses
+shared by all processes from stampedes.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import record_cache
+
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+
+
+class ProcessCache:
+    """
+    Small thread-safe in-process cache with a TTL and a size bound.
+
+    Entries live in the memory of a single worker process, so callers must
+    clear it from the relevant model signals to drop stale values early.
+    Hits and misses of `get_or_set` are counted under `name` when metrics are enabled.
+    """
+
+    _missing = object()
+
+    def __init__(self, timeout, max_size=1024, name=None):
+        self.timeout = timeout
+        self.max_size = max_size
+        self.name = name
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return default
+        return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._data) >= self.max_size:
+                self._data.clear()
+            self._data[key] = (time.monotonic() + self.timeout, value)
+
+    def get_or_set(self, key, default_func):
+        """
+        Return the cached value for `key`, computing it with `default_func` on a miss.
+        """
+        value = self.get(key, self._missing)
+        if value is self._missing:
+            value = default_func()
+            self.set(key, value)
+            result = 'miss'
+        else:
+            result = 'hit'
+        if self.name:
+            record_cache(self.name, result)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def _lock_timeout():
+    return getattr(settings, 'MOBILE_SINGLE_FLIGHT_LOCK_TIMEOUT', 30)
+
+
+def _wait_for_unlock(lock_key, ready=None):
+    """
+    Wait up to `MOBILE_SINGLE_FLIGHT_WAIT` seconds for `lock_key` to be released
+    or for `ready()` to return something, and return that.
+    """
+    deadline = time.monotonic() + getattr(settings, 'MOBILE_SINGLE_FLIGHT_WAIT', 5)
+    while time.monotonic() < deadline:
+        time.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+        result = ready() if ready else None
+        if result is not None or cache.get(lock_key) is None:
+            return result
+    return None
+
+
+def single_flight(key, compute, timeout, stale_timeout=None, name='single_flight'):
+    """
+    Return the value cached under `key`, letting a single caller at a time
+    recompute it with `compute` when it is missing or expired.
+
+    Expired values are kept `stale_timeout` more seconds (`timeout` by default)
+    and returned to concurrent callers while one of them recomputes the value.
+    Without any value, the other callers wait for the recomputation for up to
+    `MOBILE_SINGLE_FLIGHT_WAIT` seconds and then compute it themselves.
+    Lookups are counted under the `name` cache when metrics are enabled.
+    """
+    entry = cache.get(key)
+    if entry is not None and entry[0] > time.time():
+        record_cache(name, 'hit')
+        return entry[1]
+    record_cache(name, 'miss' if entry is None else 'stale')
+
+    lock_key = f'{key}.lock'
+    if cache.add(lock_key, True, _lock_timeout()):
+        try:
+            value = compute()
+            stale_timeout = timeout if stale_timeout is None else stale_timeout
+            cache.set(key, (time.time() + timeout, value), timeout + stale_timeout)
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    if entry is not None:
+        return entry[1]
+    entry = _wait_for_unlock(lock_key, ready=lambda: cache.get(key))
+    if entry is None:
+        entry = cache.get(key)
+    return entry[1] if entry is not None else compute()
+
+
+def single_flight_call(key, func):
+    """
+    Call `func`, but when another caller is already running it for `key`, wait
+    for that call to finish first (for up to `MOBILE_SINGLE_FLIGHT_WAIT` seconds).
+
+    Meant for functions filling caches of their own: the waiting callers then
+    find the result in those caches instead of all computing it at once.
+    """
+    lock_key = f'{key}.lock'
+    if not cache.add(lock_key, True, _lock_timeout()):
+        _wait_for_unlock(lock_key)
+        return func()
+    try:
+        return func()
+    finally:
+        cache.delete(lock_key)
@@ -0,0 +1,135 @@
+"""
+Compact, shared representation of the course catalog served by `CourseListViewExtended`.
+
+Listing courses used to keep the full `CourseOverview` instances of the whole
+catalog, with their modes and image sets, in memory for every request. The
+catalog is instead turned into `CatalogEntry` objects holding only the values
+the course list serializer reads, once per catalog version and process, and
+the entries are shared read-only by all the requests of the process.
+
+The catalog version is bumped when a course overview, its image set or a site
+configuration changes. Processes also rebuild their catalogs after
+`MOBILE_CATALOG_CACHE_TIMEOUT` seconds.
+"""
+import sys
+from types import MappingProxyType
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import ProcessCache
+from .metrics import record_cache
+
+CATALOG_VERSION_KEY = 'mobile_api_extensions.catalog_version'
+
+# Every entry holds a whole catalog, keep a handful of them (sites, orgs, filters) per process.
+_catalogs = ProcessCache(timeout=getattr(settings, 'MOBILE_CATALOG_CACHE_TIMEOUT', 300), max_size=32)
+
+
+def _course_overview_property(name):
+    """
+    Return a property computing `name` with the `CourseOverview` implementation,
+    for values which depend on the language of the request.
+    """
+    def getter(entry):
+        # Deferred import, the course overview models are not loaded at startup.
+        from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+        return getattr(CourseOverview, name).fget(entry)
+    return property(getter)
+
+
+class CatalogEntry:
+    """
+    The values of a `CourseOverview` read by the course list serializer.
+    """
+    __slots__ = (
+        'id',
+        'display_name_with_default_escaped',
+        'display_number_with_default',
+        'display_org_with_default',
+        'short_description',
+        'effort',
+        'start',
+        'end',
+        'advertised_start',
+        'enrollment_start',
+        'enrollment_end',
+        'pacing',
+        'mobile_available',
+        'invitation_only',
+        'catalog_visibility',
+        'course_image_url',
+        'course_video_url',
+        'image_urls',
+    )
+    # Strings repeated across the courses of a catalog are stored once.
+    _interned = ('display_org_with_default', 'pacing', 'catalog_visibility')
+
+    start_display = _course_overview_property('start_display')
+    start_type = _course_overview_property('start_type')
+
+    def __init__(self, course_overview):
+        for name in self.__slots__:
+            value = getattr(course_overview, name)
+            if name in self._interned and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, name, value)
+        self.image_urls = MappingProxyType(self.image_urls)
+
+    def __repr__(self):
+        return f'<CatalogEntry {self.id}>'
+
+
+def iter_chunked(course_queryset, chunk_size):
+    """
+    Yield the courses of a queryset ordered by id, loading `chunk_size` of them at a time.
+    """
+    course_queryset = course_queryset.order_by('id')
+    last_id = None
+    while True:
+        chunk_qs = course_queryset if last_id is None else course_queryset.filter(id__gt=last_id)
+        chunk = list(chunk_qs[:chunk_size])
+        yield from chunk
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1].id
+
+
+def get_catalog_version():
+    return cache.get(CATALOG_VERSION_KEY)
+
+
+def invalidate_catalogs():
+    """
+    Make every process rebuild its catalogs on next use.
+    """
+    cache.set(CATALOG_VERSION_KEY, uuid4().hex, None)
+
+
+def get_catalog(key, course_queryset, visit=None):
+    """
+    Return the tuple of `CatalogEntry` of the courses of `course_queryset`, ordered by id.
+
+    `key` identifies the queryset (site, filters...), the entries built for a
+    key are reused until the catalog version changes. When the catalog is
+    built, `visit` is called with every course overview loaded.
+    """
+    version = get_catalog_version()
+    cached = _catalogs.get(key)
+    if cached is not None and cached[0] == version:
+        record_cache('catalog', 'hit')
+        return cached[1]
+
+    record_cache('catalog', 'miss')
+    # Replacing the entry of the key drops the outdated catalog right away.
+    chunk_size = getattr(settings, 'MOBILE_CATALOG_CHUNK_SIZE', 500)
+    catalog = []
+    for course in iter_chunked(course_queryset, chunk_size):
+        catalog.append(CatalogEntry(course))
+        if visit is not None:
+            visit(course)
+    catalog = tuple(catalog)
+    _catalogs.set(key, (version, catalog))
+    return catalog
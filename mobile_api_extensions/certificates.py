@@ -0,0 +1,95 @@
+"""
+Bulk certificate status of a user across courses.
+
+`certificate_downloadable_status` queries the certificate and the course
+overview of one course at a time. Here the downloadable certificates of a
+user are loaded with one query and the course overviews they belong to with
+another, and the course display rules and download URLs are resolved from
+those rows. The resulting download URLs are cached per user and dropped when
+one of the user's certificates is generated or revoked.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+
+from .metrics import record_cache
+
+
+def get_certificate_cache_key(user_id):
+    return f'mobile_api_extensions.certificate_urls.{user_id}'
+
+
+def _certificates_viewable(course_overview):
+    """
+    Return whether the display rules of the course let learners see their certificate.
+    """
+    # Deferred import, the certificates app is heavy and this module is loaded by the signal receivers.
+    try:
+        from lms.djangoapps.certificates.api import certificates_viewable_for_course
+    except ImportError:
+        # Releases before Maple.
+        return course_overview.may_certify()
+    return certificates_viewable_for_course(course_overview)
+
+
+def _load_certificate_download_urls(user):
+    """
+    Return the download URLs of the user's certificates, as `certificate_downloadable_status` would.
+    """
+    # Deferred imports, the certificates app is heavy and this module is loaded by the signal receivers.
+    from lms.djangoapps.certificates.api import has_html_certificates_enabled
+    from lms.djangoapps.certificates.data import CertificateStatuses
+    from lms.djangoapps.certificates.models import GeneratedCertificate
+    from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+    certificates = list(GeneratedCertificate.eligible_certificates.filter(
+        user=user, status=CertificateStatuses.downloadable
+    ).values('course_id', 'download_url', 'verify_uuid'))
+    if not certificates:
+        return {}
+    course_overviews = {
+        course_overview.id: course_overview
+        for course_overview in CourseOverview.objects.filter(
+            id__in=[certificate['course_id'] for certificate in certificates]
+        )
+    }
+
+    download_urls = {}
+    for certificate in certificates:
+        course_overview = course_overviews.get(certificate['course_id'])
+        if course_overview is None or not _certificates_viewable(course_overview):
+            continue
+        if certificate['download_url']:
+            download_url = certificate['download_url']
+        elif has_html_certificates_enabled(course_overview):
+            download_url = reverse(
+                'certificates:render_cert_by_uuid', kwargs={'certificate_uuid': certificate['verify_uuid']}
+            )
+        else:
+            continue
+        download_urls[str(certificate['course_id'])] = download_url
+    return download_urls
+
+
+def get_certificate_download_urls(user):
+    """
+    Return a dict of course id strings to the download URL of the user's
+    downloadable certificate in the course.
+    """
+    if not user.is_authenticated:
+        return {}
+
+    cache_key = get_certificate_cache_key(user.id)
+    download_urls = cache.get(cache_key)
+    record_cache('certificates', 'miss' if download_urls is None else 'hit')
+    if download_urls is None:
+        download_urls = _load_certificate_download_urls(user)
+        cache.set(cache_key, download_urls, getattr(settings, 'MOBILE_CERTIFICATE_CACHE_TIMEOUT', 300))
+    return download_urls
+
+
+def invalidate_certificate_download_urls(user_id):
+    """
+    Drop the cached download URLs of the user.
+    """
+    cache.delete(get_certificate_cache_key(user_id))
@@ -1,18 +1,33 @@
 """Mobile-api extensions form."""
+import re
+
 from django import forms
 from django.contrib.auth import get_user_model
+from django.core.validators import RegexValidator
 from django.utils.translation import gettext as _
+from django.utils.translation import gettext_lazy
 from oauth2_provider.models import Application
 
 User = get_user_model()
 
+AUTHORIZATION_CODE_RE = re.compile(r'^[0-9a-f]{32}$')
+CLIENT_ID_RE = re.compile(r'^[\w.-]{1,100}$')
+
 
 class AuthorizationCodeExchangeForm(forms.Form):
     """
     Form for access authorization code exchange endpoint.
+
+    Field validators reject malformed values before `clean` runs any query.
     """
-    authorization_code = forms.CharField(max_length=32)
-    client_id = forms.CharField()
+    authorization_code = forms.CharField(
+        max_length=32,
+        validators=[RegexValidator(AUTHORIZATION_CODE_RE, gettext_lazy("Malformed authorization code."))],
+    )
+    client_id = forms.CharField(
+        max_length=100,
+        validators=[RegexValidator(CLIENT_ID_RE, gettext_lazy("Malformed client id."))],
+    )
 
     def __init__(self, request, oauth2_adapter, *args, **kwargs):
         super().__init__(*args, **kwargs)
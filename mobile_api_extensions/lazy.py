@@ -0,0 +1,74 @@
+"""
+Lazily imported views for the mobile_api_extensions URL configurations.
+
+The plugin views subclass edx-platform views whose modules pull in grades,
+certificates, discussions, social auth, etc. Routing them through `LazyView`
+keeps those imports out of URLconf loading, they happen on the first request
+to each view instead.
+"""
+import threading
+
+from django.utils.module_loading import import_string
+
+
+class LazyView:
+    """
+    URL callback which imports and builds the real view on first use.
+
+    Arguments:
+        view_path (str): dotted path to a view function or a class based view.
+        decorators (list[str]): dotted paths of view decorators, applied innermost first.
+        actions (dict): ViewSet method to action mapping, actions missing on the
+            ViewSet are dropped like DRF routers do.
+        csrf_exempt (bool): must match the real view since the CSRF middleware
+            checks the URL callback. Class based DRF views are always exempt.
+        initkwargs: passed to `as_view()`.
+    """
+
+    def __init__(self, view_path, decorators=(), actions=None, csrf_exempt=False, **initkwargs):
+        self.view_path = view_path
+        self.decorators = decorators
+        self.actions = actions
+        self.csrf_exempt = csrf_exempt
+        self.initkwargs = initkwargs
+        self._view = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'<LazyView {self.view_path}>'
+
+    def _build_view(self):
+        view = import_string(self.view_path)
+        if self.actions is not None:
+            actions = {method: action for method, action in self.actions.items() if hasattr(view, action)}
+            view = view.as_view(actions, **self.initkwargs)
+        elif hasattr(view, 'as_view'):
+            view = view.as_view(**self.initkwargs)
+        for decorator_path in self.decorators:
+            view = import_string(decorator_path)(view)
+        return view
+
+    @property
+    def view(self):
+        if self._view is None:
+            with self._lock:
+                if self._view is None:
+                    self._view = self._build_view()
+        return self._view
+
+    def __call__(self, request, *args, **kwargs):
+        return self.view(request, *args, **kwargs)
+
+
+def lazy_view(view_path, **kwargs):
+    """
+    Return a `LazyView` for a view function.
+    """
+    return LazyView(view_path, **kwargs)
+
+
+def lazy_api_view(view_path, **kwargs):
+    """
+    Return a `LazyView` for a DRF view class, these are always CSRF exempt.
+    """
+    return LazyView(view_path, csrf_exempt=True, **kwargs)
@@ -0,0 +1,51 @@
+"""
+Build the offline download packages of courses, e.g. for courses published
+before MOBILE_OFFLINE_PACKAGES_ENABLED was set.
+
+Packages whose content did not change are not rewritten.
+
+Examples:
+    ./manage.py lms build_mobile_course_packages --all
+    ./manage.py lms build_mobile_course_packages course-v1:edX+DemoX+Demo_Course
+"""
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+
+class Command(BaseCommand):
+    """
+    Build the offline packages of courses.
+    """
+    help = __doc__
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', help='Course keys to build packages for.')
+        parser.add_argument('--all', action='store_true', help='Build the packages of every course.')
+
+    def handle(self, *args, **options):
+        # Deferred imports, the builder loads the modulestore.
+        from mobile_api_extensions.offline import build_course_package
+        from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+        if options['all']:
+            course_keys = CourseOverview.get_all_course_keys()
+        elif options['course_ids']:
+            try:
+                course_keys = [CourseKey.from_string(course_id) for course_id in options['course_ids']]
+            except InvalidKeyError as error:
+                raise CommandError(f'Invalid course key: {error}') from error
+        else:
+            raise CommandError('Pass course keys or --all.')
+
+        failed = []
+        for course_key in course_keys:
+            try:
+                package = build_course_package(course_key)
+            except Exception as error:  # pylint: disable=broad-except
+                failed.append(str(course_key))
+                self.stderr.write(f'{course_key}: {error}')
+                continue
+            self.stdout.write(f'{course_key}: {package.version} ({package.size} bytes)')
+        if failed:
+            raise CommandError(f'Failed to build: {", ".join(failed)}')
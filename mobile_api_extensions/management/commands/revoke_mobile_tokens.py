@@ -0,0 +1,80 @@
+"""
+Revoke mobile authorization codes and OAuth tokens in batches, e.g. after
+an SSO provider was disabled or a security incident.
+
+Only the tokens of the MOBILE_OAUTH_CLIENT_IDS applications, or of --client,
+are deleted. --all-applications also deletes the tokens of every other OAuth
+application, service and backend clients included.
+
+Examples:
+    ./manage.py lms revoke_mobile_tokens --provider tpa-saml:my-idp --dry-run
+    ./manage.py lms revoke_mobile_tokens --client mobile-app-client-id --created-before 2024-05-01
+    ./manage.py lms revoke_mobile_tokens --all --batch-size 500 --pause 0.5
+    ./manage.py lms revoke_mobile_tokens --all --all-applications --dry-run
+"""
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from mobile_api_extensions.revocation import revoke_mobile_credentials
+
+
+def parse_moment(value):
+    """
+    Parse an ISO date or datetime argument, naive values are in the default timezone.
+    """
+    moment = parse_datetime(value)
+    if moment is None:
+        date = parse_date(value)
+        if date is None:
+            raise ValueError(value)
+        moment = datetime.combine(date, time.min)
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+class Command(BaseCommand):
+    """
+    Revoke the mobile credentials of users.
+    """
+    help = __doc__
+
+    def add_arguments(self, parser):
+        parser.add_argument('--provider', help='Backend name, or tpa-saml:<idp slug>, users are linked to.')
+        parser.add_argument(
+            '--client', action='append', help='Client id of an OAuth application the tokens were issued to.'
+        )
+        parser.add_argument(
+            '--all-applications', action='store_true', help='Delete the tokens of every OAuth application.'
+        )
+        parser.add_argument('--created-after', type=parse_moment, help='Only tokens created from this date.')
+        parser.add_argument('--created-before', type=parse_moment, help='Only tokens created before this date.')
+        parser.add_argument('--all', action='store_true', help='Revoke the credentials of every user.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows changed per statement.')
+        parser.add_argument('--pause', type=float, default=0.1, help='Seconds to sleep between batches.')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be revoked.')
+
+    def handle(self, *args, **options):
+        filters = ('provider', 'client', 'created_after', 'created_before')
+        if not options['all'] and not any(options[name] for name in filters):
+            raise CommandError('Pass --provider, --client, --created-after, --created-before or --all.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        try:
+            counts = revoke_mobile_credentials(
+                provider=options['provider'],
+                client_ids=options['client'],
+                all_applications=options['all_applications'],
+                created_after=options['created_after'],
+                created_before=options['created_before'],
+                batch_size=options['batch_size'],
+                pause=options['pause'],
+                dry_run=options['dry_run'],
+                progress=lambda label, total: self.stdout.write(f'{label}: {total}'),
+            )
+        except ValueError as error:
+            raise CommandError(str(error)) from error
+        prefix = 'Would revoke' if options['dry_run'] else 'Revoked'
+        self.stdout.write(', '.join(f'{prefix} {count} {label.replace("_", " ")}' for label, count in counts.items()))
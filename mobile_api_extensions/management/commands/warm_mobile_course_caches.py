@@ -0,0 +1,49 @@
+"""
+Warm the caches of the mobile course views, e.g. after a deploy.
+
+Examples:
+    ./manage.py lms warm_mobile_course_caches --all --workers 8
+    ./manage.py lms warm_mobile_course_caches course-v1:edX+DemoX+Demo_Course
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from mobile_api_extensions.warming import warm_courses
+
+
+class Command(BaseCommand):
+    """
+    Precompute course overviews, course images and block structures of courses.
+    """
+    help = __doc__
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', help='Course keys to warm.')
+        parser.add_argument('--all', action='store_true', help='Warm every course.')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.MOBILE_CACHE_WARMER_WORKERS,
+            help='Number of courses warmed concurrently.',
+        )
+
+    def handle(self, *args, **options):
+        if options['all']:
+            # Deferred import, the overview model is only needed to list all courses.
+            from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+            course_keys = CourseOverview.get_all_course_keys()
+        elif options['course_ids']:
+            try:
+                course_keys = [CourseKey.from_string(course_id) for course_id in options['course_ids']]
+            except InvalidKeyError as error:
+                raise CommandError(f'Invalid course key: {error}') from error
+        else:
+            raise CommandError('Pass course keys or --all.')
+
+        results = warm_courses(course_keys, options['workers'])
+        failed = [course_id for course_id, warmed in results.items() if not warmed]
+        self.stdout.write(f'Warmed {len(results) - len(failed)} of {len(results)} courses.')
+        if failed:
+            raise CommandError(f'Failed to warm: {", ".join(failed)}')
@@ -0,0 +1,142 @@
+"""
+Prometheus metrics of the plugin hot paths.
+
+Metrics are recorded when `prometheus_client` is installed and
+`MOBILE_METRICS_ENABLED` is set, the record helpers are no-ops otherwise.
+With gunicorn, point the `PROMETHEUS_MULTIPROC_DIR` environment variable to
+a directory shared by the workers: each worker writes its values there and
+`metrics_view` aggregates them. The gunicorn `child_exit` hook should call
+`prometheus_client.multiprocess.mark_process_dead(worker.pid)`.
+
+The metrics endpoint only answers requests with the `MOBILE_METRICS_TOKEN`
+bearer token, set as `bearer_token` in the Prometheus scrape config, and
+staff users logged in with a session.
+"""
+import hmac
+import os
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+PREFIX = 'mobile_api_extensions'
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = prometheus_client.Histogram(
+        f'{PREFIX}_request_duration_seconds', 'Duration of plugin endpoint requests.',
+        ['endpoint', 'method', 'status'],
+    )
+    RESPONSE_SIZE = prometheus_client.Histogram(
+        f'{PREFIX}_response_size_bytes', 'Body size of plugin endpoint responses.',
+        ['endpoint'], buckets=SIZE_BUCKETS,
+    )
+    ACCESS_CHECKS = prometheus_client.Histogram(
+        f'{PREFIX}_access_checks_per_request', 'has_access decisions per plugin request.',
+        ['endpoint', 'result'], buckets=COUNT_BUCKETS,
+    )
+    CACHE_REQUESTS = prometheus_client.Counter(
+        f'{PREFIX}_cache_requests_total', 'Lookups of the plugin caches.',
+        ['cache', 'result'],
+    )
+    SSO_COMPLETIONS = prometheus_client.Counter(
+        f'{PREFIX}_sso_completions_total', 'Completed mobile SSO logins.',
+        ['backend', 'status'],
+    )
+    CODE_EXCHANGES = prometheus_client.Counter(
+        f'{PREFIX}_code_exchanges_total', 'Authorization code exchanges.',
+        ['result'],
+    )
+
+
+def is_enabled():
+    return prometheus_client is not None and getattr(settings, 'MOBILE_METRICS_ENABLED', False)
+
+
+def record_cache(cache_name, result):
+    """
+    Count a lookup of a plugin cache, `result` is "hit", "miss" or "stale".
+    """
+    if is_enabled():
+        CACHE_REQUESTS.labels(cache_name, result).inc()
+
+
+def record_sso_completion(backend_name, status):
+    if is_enabled():
+        SSO_COMPLETIONS.labels(backend_name, status).inc()
+
+
+def record_code_exchange(result):
+    """
+    Count an authorization code exchange, `result` is "success" or the failure reason.
+    """
+    if is_enabled():
+        CODE_EXCHANGES.labels(result).inc()
+
+
+class MobileMetricsMiddleware:
+    """
+    Record the latency, response size and access checks of plugin endpoint requests.
+
+    Requests to `MOBILE_METRICS_PATH_PREFIXES` are labelled with their URL name.
+    """
+
+    def __init__(self, get_response):
+        if not is_enabled():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request.path.startswith(tuple(settings.MOBILE_METRICS_PATH_PREFIXES)):
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        response = self.get_response(request)
+        resolver_match = getattr(request, 'resolver_match', None)
+        endpoint = resolver_match.url_name if resolver_match and resolver_match.url_name else 'unknown'
+
+        REQUEST_LATENCY.labels(endpoint, request.method, response.status_code).observe(time.perf_counter() - start)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(endpoint).observe(len(response.content))
+
+        # Deferred import, the access module is only needed once a request was served.
+        from .access import get_access_check_counts  # pylint: disable=import-outside-toplevel
+        for result, count in get_access_check_counts().items():
+            ACCESS_CHECKS.labels(endpoint, result).observe(count)
+        return response
+
+
+def _is_authorized(request):
+    """
+    Return whether the request sends the `MOBILE_METRICS_TOKEN` bearer token or comes from a staff user.
+    """
+    token = getattr(settings, 'MOBILE_METRICS_TOKEN', None)
+    scheme, __, value = request.headers.get('Authorization', '').partition(' ')
+    if token and scheme.lower() == 'bearer' and hmac.compare_digest(value.strip().encode(), token.encode()):
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_authenticated and user.is_staff)
+
+
+def metrics_view(request):
+    """
+    Expose the metrics in the Prometheus text format when `MOBILE_METRICS_ENDPOINT` is set.
+    """
+    if not is_enabled() or not getattr(settings, 'MOBILE_METRICS_ENDPOINT', False):
+        raise Http404
+    if not _is_authorized(request):
+        return HttpResponseForbidden()
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return HttpResponse(prometheus_client.generate_latest(registry), content_type=prometheus_client.CONTENT_TYPE_LATEST)
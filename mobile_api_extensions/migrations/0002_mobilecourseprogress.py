@@ -0,0 +1,35 @@
+# Generated by Django 3.2.17 on 2026-10-19 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('mobile_api_extensions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MobileCourseProgress',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(db_index=True, max_length=255)),
+                ('sections', models.TextField(blank=True, null=True)),
+                ('is_stale', models.BooleanField(db_index=True, default=True)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('modified', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Mobile Course Progress',
+                'verbose_name_plural': 'Mobile Course Progress',
+                'unique_together': {('user', 'course_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.17 on 2026-10-19 11:00
+
+from django.db import migrations, models
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobile_api_extensions', '0002_mobilecourseprogress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MobileCoursePackage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(max_length=255, unique=True)),
+                ('version', models.CharField(max_length=64)),
+                ('file_name', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField()),
+                ('expires', models.DateTimeField(blank=True, null=True)),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Mobile Course Package',
+                'verbose_name_plural': 'Mobile Course Packages',
+            },
+        ),
+    ]
@@ -0,0 +1,89 @@
+"""
+View mixins shared by mobile_api_extensions API views.
+"""
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+from .renderers import FastJSONRenderer, compress_response
+from .routers import can_use_read_replica, enable_read_replica, reset_read_replica
+
+
+class ReadReplicaMixin:
+    """
+    Serve GET requests of read-only views from the configured read replica.
+
+    Authentication runs against the primary, the rest of the request switches
+    to the replica unless the user has just written something.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in ('GET', 'HEAD') and can_use_read_replica(request.user):
+            self._read_replica_token = enable_read_replica()
+
+    def dispatch(self, request, *args, **kwargs):
+        self._read_replica_token = None
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self._read_replica_token is not None:
+                reset_read_replica(self._read_replica_token)
+
+
+class MobileResponseMixin:
+    """
+    Render responses with `FastJSONRenderer` when `MOBILE_FAST_JSON_RENDERER`
+    is enabled and compress large payloads for clients that accept it.
+
+    Views can offer more formats through `extra_renderer_classes`, they are
+    only picked when the client asks for them in the Accept header.
+    """
+    extra_renderer_classes = ()
+
+    def get_renderers(self):
+        renderers = super().get_renderers() + [renderer() for renderer in self.extra_renderer_classes]
+        if getattr(settings, 'MOBILE_FAST_JSON_RENDERER', False):
+            # Subclasses of the stock renderer may change its output, they are kept.
+            renderers = [
+                FastJSONRenderer() if renderer.__class__ is JSONRenderer else renderer
+                for renderer in renderers
+            ]
+        return renderers
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(lambda rendered: compress_response(request, rendered))
+        return response
+
+
+class SparseFieldsMixin:
+    """
+    Limit the serialized fields to the comma separated `fields` query parameter.
+
+    Fields that were not requested are dropped from the serializer before it
+    runs, so their sources and method fields are never evaluated.
+    """
+    fields_param = 'fields'
+
+    def get_requested_fields(self):
+        """
+        Return the set of requested field names or None if all fields are wanted.
+        """
+        value = self.request.query_params.get(self.fields_param)
+        if not value:
+            return None
+        return {field.strip() for field in value.split(',') if field.strip()}
+
+    def is_field_requested(self, field_name):
+        requested_fields = self.get_requested_fields()
+        return requested_fields is None or field_name in requested_fields
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        requested_fields = self.get_requested_fields()
+        if requested_fields is not None:
+            fields = getattr(serializer, 'child', serializer).fields
+            for field_name in set(fields) - requested_fields:
+                fields.pop(field_name)
+        return serializer
@@ -5,6 +5,9 @@ import logging
 import uuid
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
+from opaque_keys.edx.django.models import CourseKeyField
 
 log = logging.getLogger(__name__)
 User = get_user_model()
@@ -45,3 +48,70 @@ class MobileUserAuth(models.Model):
                 return self.set_authorization_code()
 
         return self.authorization_code
+
+
+class MobileCourseProgress(models.Model):
+    """
+    Progress of a user in a course precomputed for `CourseProgressView`.
+
+    Rows are created and marked stale by score change signals and filled in
+    by a background task, `version` lets the task detect scores that changed
+    while it was computing.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    # JSON document of the sections, see `progress.compute_progress_sections`.
+    sections = models.TextField(null=True, blank=True)
+    is_stale = models.BooleanField(default=True, db_index=True)
+    version = models.PositiveIntegerField(default=0)
+    modified = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = 'Mobile Course Progress'
+        verbose_name_plural = 'Mobile Course Progress'
+        unique_together = ('user', 'course_id')
+
+    @classmethod
+    def mark_stale(cls, user_id, course_key, create=False):
+        """
+        Mark the user's progress in the course as outdated.
+
+        With `create` a stale row is added if the user has none yet, so the
+        background task computes it.
+        """
+        updated = cls.objects.filter(user_id=user_id, course_id=course_key).update(
+            is_stale=True, version=F('version') + 1, modified=timezone.now()
+        )
+        if not updated and create:
+            cls.objects.get_or_create(user_id=user_id, course_id=course_key)
+
+    @classmethod
+    def mark_course_stale(cls, course_key):
+        """
+        Mark the progress of every user in the course as outdated.
+        """
+        cls.objects.filter(course_id=course_key).update(
+            is_stale=True, version=F('version') + 1, modified=timezone.now()
+        )
+
+
+class MobileCoursePackage(models.Model):
+    """
+    The current offline download archive of a course, see `offline.py`.
+    """
+
+    course_id = CourseKeyField(max_length=255, unique=True)
+    version = models.CharField(max_length=64)
+    file_name = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    # Release date of the next block left out of the package, which is then rebuilt.
+    expires = models.DateTimeField(null=True, blank=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Mobile Course Package'
+        verbose_name_plural = 'Mobile Course Packages'
+
+    def __str__(self):
+        return f'{self.course_id} ({self.version[:12]})'
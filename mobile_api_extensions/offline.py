@@ -0,0 +1,277 @@
+"""
+Offline download packages of courses for the mobile apps.
+
+A package is a zip archive holding the published course outline, the
+`student_view_data` of the blocks which expose it and a manifest of the
+course assets. It is rebuilt from a task on publish, the archive is only
+rewritten when its content changed, and served with byte range support so
+interrupted downloads can resume.
+
+One package is served to every enrolled learner, so it only holds what all
+of them can see: the blocks are loaded through the Course Blocks API with the
+access transformers of a learner without any group (cohort, content group or
+enrollment track), which leaves out staff-only, unreleased and group
+restricted content, and locked assets are left out of the manifest. The
+package expires when the next block is released and is then rebuilt.
+"""
+import hashlib
+import json
+import logging
+import re
+import tempfile
+import zipfile
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.test import RequestFactory
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import MobileCoursePackage
+from .tasks import schedule_course_package_build
+
+log = logging.getLogger(__name__)
+
+PACKAGE_FORMAT = 2
+PACKAGE_CONTENT_TYPE = 'application/zip'
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def get_package_storage():
+    """
+    Return the storage of the packages, `MOBILE_OFFLINE_PACKAGE_STORAGE` or the default storage.
+    """
+    storage_class = getattr(settings, 'MOBILE_OFFLINE_PACKAGE_STORAGE', None)
+    return import_string(storage_class)() if storage_class else default_storage
+
+
+def _learner_request():
+    """
+    Return an LMS request of an anonymous user for the Course Blocks API.
+    """
+    request = RequestFactory().get('/', HTTP_HOST=settings.LMS_BASE)
+    request.user = AnonymousUser()
+    return request
+
+
+def _serialize_block(block):
+    """
+    Return the outline entry of a block of the Course Blocks API.
+    """
+    return {
+        'id': block['id'],
+        'type': block['type'],
+        'display_name': block.get('display_name', ''),
+        'graded': block.get('graded', False),
+        'format': block.get('format'),
+        'children': block.get('children', []),
+    }
+
+
+def get_next_release(course_key):
+    """
+    Return the start date of the next block of the published course to be released, None if all are.
+    """
+    # Deferred imports, the modulestore is only needed by the worker and the management command.
+    from xmodule.modulestore import ModuleStoreEnum
+    from xmodule.modulestore.django import modulestore
+
+    now = timezone.now()
+    store = modulestore()
+    with store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+        starts = [block.start for block in store.get_items(course_key) if block.start and block.start > now]
+    return min(starts, default=None)
+
+
+def collect_course_content(course_key):
+    """
+    Return the outline, student view data and asset manifest of the published
+    course, limited to the content every enrolled learner can see.
+    """
+    # Deferred imports, the course API and modulestore are only needed by the worker and the management command.
+    from lms.djangoapps.course_api.blocks.api import get_blocks
+    from xmodule.contentstore.content import StaticContent
+    from xmodule.contentstore.django import contentstore
+    from xmodule.modulestore.django import modulestore
+
+    request = _learner_request()
+    course_blocks = get_blocks(
+        request,
+        modulestore().make_course_usage_key(course_key),
+        user=request.user,
+        requested_fields=['children', 'display_name', 'type', 'graded', 'format', 'student_view_data'],
+        student_view_data=settings.MOBILE_OFFLINE_PACKAGE_STUDENT_VIEW_DATA,
+        hide_access_denials=True,
+    )
+
+    outline = []
+    student_views = {}
+    blocks = course_blocks['blocks']
+    block_ids = [course_blocks['root']]
+    while block_ids:
+        block = blocks[block_ids.pop()]
+        outline.append(_serialize_block(block))
+        if 'student_view_data' in block:
+            student_views[block['id']] = block['student_view_data']
+        block_ids.extend(reversed(block.get('children', [])))
+
+    assets, __ = contentstore().get_all_content_for_course(course_key)
+    asset_manifest = [
+        {
+            'url': StaticContent.serialize_asset_key_with_slash(asset['asset_key']),
+            'name': asset.get('displayname'),
+            'content_type': asset.get('contentType'),
+            'size': asset.get('length'),
+            'md5': asset.get('md5'),
+        }
+        for asset in assets
+        if not asset.get('locked', False)
+    ]
+    return {'outline': outline, 'student_views': student_views, 'assets': asset_manifest}
+
+
+def _dump(data):
+    return json.dumps(data, sort_keys=True, default=str).encode()
+
+
+def _package_file_name(course_key, version):
+    course_dir = re.sub(r'[^\w.+-]', '_', str(course_key))
+    return f'{settings.MOBILE_OFFLINE_PACKAGE_DIR}/{course_dir}/{version}.zip'
+
+
+def build_course_package(course_key):
+    """
+    Build the offline package of a course unless the current one is up to date.
+
+    Returns the `MobileCoursePackage` of the course.
+    """
+    expires = get_next_release(course_key)
+    content = collect_course_content(course_key)
+    files = {f'{name}.json': _dump(data) for name, data in content.items()}
+    digest = hashlib.sha256(str(PACKAGE_FORMAT).encode())
+    for name in sorted(files):
+        digest.update(name.encode())
+        digest.update(files[name])
+    version = digest.hexdigest()
+
+    storage = get_package_storage()
+    current = MobileCoursePackage.objects.filter(course_id=course_key).first()
+    if current and current.version == version and storage.exists(current.file_name):
+        if current.expires != expires:
+            current.expires = expires
+            current.save(update_fields=['expires', 'modified'])
+        return current
+
+    files['manifest.json'] = _dump({
+        'course_id': str(course_key),
+        'version': version,
+        'format': PACKAGE_FORMAT,
+        'built': timezone.now(),
+        'expires': expires,
+    })
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as archive:
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for name, data in files.items():
+                zip_file.writestr(name, data)
+        size = archive.tell()
+        archive.seek(0)
+        file_name = storage.save(_package_file_name(course_key, version), File(archive))
+
+    package, __ = MobileCoursePackage.objects.update_or_create(
+        course_id=course_key,
+        defaults={'version': version, 'file_name': file_name, 'size': size, 'expires': expires},
+    )
+    if current and current.file_name != file_name:
+        storage.delete(current.file_name)
+    log.info(  # pylint: disable=logging-fstring-interpolation
+        f'Built the offline package {version} of {course_key}, {size} bytes'
+    )
+    return package
+
+
+def get_course_package(course_key):
+    """
+    Return the `MobileCoursePackage` of a course or None, and schedule a rebuild if it expired.
+
+    The expired package is still served meanwhile, it only misses the newly released content.
+    """
+    package = MobileCoursePackage.objects.filter(course_id=course_key).first()
+    if package is not None and package.expires is not None and package.expires <= timezone.now():
+        schedule_course_package_build(course_key)
+    return package
+
+
+def parse_range(range_header, size):
+    """
+    Parse a single `bytes` range of a Range header.
+
+    Returns an inclusive (start, end) tuple, None if the header is missing or
+    not supported (the whole file should be sent) and raises ValueError if the
+    range can't be satisfied.
+    """
+    match = RANGE_RE.match(range_header.replace(' ', '')) if range_header else None
+    if match is None or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if not start:
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+    if start > end or start >= size:
+        raise ValueError(range_header)
+    return start, end
+
+
+def _read_range(file, length):
+    try:
+        while length > 0:
+            chunk = file.read(min(READ_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def package_response(request, package):
+    """
+    Return the response streaming the package, or the requested part of it.
+    """
+    etag = f'"{package.version}"'
+    if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    range_header = request.META.get('HTTP_RANGE')
+    if request.META.get('HTTP_IF_RANGE', etag) != etag:
+        range_header = None
+    try:
+        byte_range = parse_range(range_header, package.size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{package.size}'
+        return response
+
+    file = get_package_storage().open(package.file_name, 'rb')
+    if byte_range is None:
+        response = FileResponse(
+            file, content_type=PACKAGE_CONTENT_TYPE, as_attachment=True, filename=f'{package.version}.zip'
+        )
+        response['Content-Length'] = str(package.size)
+    else:
+        start, end = byte_range
+        file.seek(start)
+        response = StreamingHttpResponse(
+            _read_range(file, end - start + 1), status=206, content_type=PACKAGE_CONTENT_TYPE
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{package.size}'
+        response['Content-Length'] = str(end - start + 1)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    return response
@@ -0,0 +1,154 @@
+"""
+Opt-in profiling of plugin requests.
+
+`MobileProfilingMiddleware` runs a sample of the requests to
+`MOBILE_PROFILING_PATH_PREFIXES` (`MOBILE_PROFILING_SAMPLE_RATE`), and the
+requests sending the `MOBILE_PROFILING_HEADER` header, under cProfile while
+capturing their SQL queries. The header is only honoured when its value is
+`MOBILE_PROFILING_SECRET` or the request comes from a staff user logged in
+with a session. Each profiled request writes two files to
+`MOBILE_PROFILING_DIR`:
+
+* `<name>.prof`: the cProfile stats, open with `python -m pstats` or snakeviz.
+* `<name>.json`: the request metadata and its SQL queries with their database
+  and timings.
+
+Queries are captured on every database connection. They are stored with their
+placeholders, their parameters (user data) are only stored when
+`MOBILE_PROFILING_SQL_PARAMS` is enabled.
+
+Profiling is disabled while `MOBILE_PROFILING_DIR` is None.
+"""
+import cProfile
+import hmac
+import json
+import logging
+import marshal
+import random
+import re
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import connections
+from django.utils import timezone
+
+log = logging.getLogger(__name__)
+
+
+class _QueryRecorder:
+    """
+    Database execute wrapper recording the queries run on a connection.
+    """
+
+    def __init__(self, alias, queries, with_params):
+        self.alias = alias
+        self.queries = queries
+        self.with_params = with_params
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            query = {'database': self.alias, 'sql': sql, 'time': time.perf_counter() - start}
+            if self.with_params:
+                query['params'] = params
+            self.queries.append(query)
+
+
+@contextmanager
+def _record_queries():
+    """
+    Record the queries run on every database connection of the current thread.
+    """
+    queries = []
+    with_params = getattr(settings, 'MOBILE_PROFILING_SQL_PARAMS', False)
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(_QueryRecorder(alias, queries, with_params)))
+        yield queries
+
+
+class MobileProfilingMiddleware:
+    """
+    Profile sampled or explicitly flagged requests and store the results locally.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'MOBILE_PROFILING_DIR', None):
+            return self.get_response(request)
+
+        requested = self._is_requested(request)
+        sampled = request.path.startswith(tuple(settings.MOBILE_PROFILING_PATH_PREFIXES)) and (
+            random.random() < settings.MOBILE_PROFILING_SAMPLE_RATE
+        )
+        if not (requested or sampled):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        with _record_queries() as queries:
+            start = time.perf_counter()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is already active in this thread.
+                return self.get_response(request)
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        duration = time.perf_counter() - start
+
+        try:
+            self._save(request, response, profiler, queries, duration)
+        except Exception:  # pylint: disable=broad-except
+            log.exception('Could not store the profile of a mobile request')
+        return response
+
+    @staticmethod
+    def _is_requested(request):
+        """
+        Return whether the request may ask to be profiled with `MOBILE_PROFILING_HEADER`.
+
+        Token and JWT users are only authenticated by DRF inside the view, so
+        the header needs `MOBILE_PROFILING_SECRET` as value unless the session
+        user, resolved by the authentication middleware, is staff.
+        """
+        value = request.headers.get(settings.MOBILE_PROFILING_HEADER)
+        if value is None:
+            return False
+        secret = getattr(settings, 'MOBILE_PROFILING_SECRET', None)
+        if secret and hmac.compare_digest(value.encode(), secret.encode()):
+            return True
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_authenticated and user.is_staff)
+
+    @staticmethod
+    def _save(request, response, profiler, queries, duration):
+        """
+        Write the cProfile stats and the request metadata with its SQL queries.
+        """
+        storage = FileSystemStorage(location=settings.MOBILE_PROFILING_DIR)
+        path_slug = re.sub(r'[^\w-]+', '_', request.path).strip('_')[:80]
+        name = f'{timezone.now():%Y%m%dT%H%M%S}-{path_slug}-{uuid.uuid4().hex[:8]}'
+
+        profiler.create_stats()
+        storage.save(f'{name}.prof', ContentFile(marshal.dumps(profiler.stats)))
+        storage.save(f'{name}.json', ContentFile(json.dumps({
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'user_id': getattr(getattr(request, 'user', None), 'id', None),
+            'duration': duration,
+            'query_count': len(queries),
+            'query_time': sum(query['time'] for query in queries),
+            'queries': queries,
+        }, indent=2, default=str)))
+        log.info(f'Stored the profile {name} of {request.path}')  # pylint: disable=logging-fstring-interpolation
@@ -0,0 +1,193 @@
+"""
+Course progress of the mobile progress view, computed live or precomputed in
+the background.
+
+Score change signals mark `MobileCourseProgress` rows stale and a batch task
+recomputes them, so the progress view usually reads one row instead of
+running the grades machinery on the request path.
+
+Whether the scores of a subsection are shown depends on its due date and on
+the time of the request, so `show_grades` is not precomputed: the stored
+sections keep the due date and correctness setting it is derived from.
+
+Publishing a course only outdates the precomputed progress of its learners
+when the grading policy or the graded outline changed, see
+`outdate_published_course_progress`.
+"""
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from lms.djangoapps.courseware.courses import get_course_by_id
+from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+from xmodule.graders import ShowCorrectness
+
+from .access import clear_access_cache, has_access
+from .models import MobileCourseProgress
+
+log = logging.getLogger(__name__)
+
+GRADING_FINGERPRINT_KEY = 'mobile_api_extensions.progress.grading_fingerprint.{}'
+
+
+def compute_progress_sections(user, course):
+    """
+    Return the grade summary of every chapter of the course for the user, in
+    the stored form read by `add_show_grades`.
+    """
+    course_grade = CourseGradeFactory().read(user, course)
+    courseware_summary = course_grade.chapter_grades.values()
+
+    progress_data = []
+
+    for chapter in courseware_summary:
+        chapter_data = {
+            'display_name': chapter['display_name'],
+            'subsections': []
+        }
+
+        for section in chapter['sections']:
+            earned = section.all_total.earned
+            total = section.all_total.possible
+            scores = section.problem_scores.values()
+            section_data = dict(
+                earned=earned,
+                total=total,
+                percentageString="{0:.0%}".format(section.percent_graded),
+                display_name=section.display_name,
+                score=[{'earned': score.earned, 'possible': score.possible} for score in scores],
+                due=section.due.isoformat() if section.due else None,
+                show_correctness=section.show_correctness,
+                graded=section.graded,
+                grade_type=section.format or '',
+            )
+            chapter_data['subsections'].append(section_data)
+
+        progress_data.append(chapter_data)
+    return progress_data
+
+
+def add_show_grades(progress_data, staff_access):
+    """
+    Turn sections from `compute_progress_sections` into the response form,
+    with the `show_grades` flag of every subsection computed for now.
+    """
+    for chapter in progress_data:
+        for section_data in chapter['subsections']:
+            due = section_data.pop('due')
+            section_data['show_grades'] = ShowCorrectness.correctness_available(
+                section_data.pop('show_correctness'), due and parse_datetime(due), staff_access
+            )
+    return progress_data
+
+
+def get_progress_sections(user, course):
+    """
+    Return the grade summary of every chapter of the course for the user.
+    """
+    staff_access = bool(has_access(user, 'staff', course))
+    return add_show_grades(compute_progress_sections(user, course), staff_access)
+
+
+def get_precomputed_progress(user, course):
+    """
+    Return the precomputed progress sections or None if they are missing, stale
+    or older than `MOBILE_PROGRESS_MAX_AGE` seconds.
+
+    `course` may be the course overview.
+    """
+    max_age = getattr(settings, 'MOBILE_PROGRESS_MAX_AGE', None)
+    if max_age is None:
+        return None
+    sections = MobileCourseProgress.objects.filter(
+        user=user,
+        course_id=course.id,
+        is_stale=False,
+        modified__gte=timezone.now() - timedelta(seconds=max_age),
+    ).values_list('sections', flat=True).first()
+    if sections is None:
+        return None
+    return add_show_grades(json.loads(sections), bool(has_access(user, 'staff', course)))
+
+
+def precompute_progress_batch(batch_size):
+    """
+    Recompute up to `batch_size` stale progress rows, oldest first.
+
+    Rows whose scores changed again during the computation stay stale, rows
+    which can't be computed are deleted so the view falls back to the live
+    computation. Returns True if stale rows remain.
+    """
+    rows = list(
+        MobileCourseProgress.objects.filter(is_stale=True).select_related('user').order_by('modified')[:batch_size]
+    )
+    for row in rows:
+        clear_access_cache()
+        try:
+            sections = compute_progress_sections(row.user, get_course_by_id(row.course_id))
+        except Exception:  # pylint: disable=broad-except
+            log.exception(  # pylint: disable=logging-fstring-interpolation
+                f'Could not precompute the progress of user {row.user_id} in {row.course_id}'
+            )
+            MobileCourseProgress.objects.filter(pk=row.pk, version=row.version).delete()
+            continue
+        MobileCourseProgress.objects.filter(pk=row.pk, version=row.version).update(
+            sections=json.dumps(sections), is_stale=False, modified=timezone.now()
+        )
+    return len(rows) == batch_size and MobileCourseProgress.objects.filter(is_stale=True).exists()
+
+
+
+def _scored_blocks(block):
+    """
+    Yield the scored descendants of a course block.
+    """
+    for child in block.get_children():
+        if getattr(child, 'has_score', False):
+            yield child
+        yield from _scored_blocks(child)
+
+
+def get_grading_fingerprint(course):
+    """
+    Return a digest of what the precomputed progress depends on besides the
+    scores of the learners: the grading policy of the course and its outline
+    of chapters, subsections and scored blocks.
+
+    `course` must be loaded with all its descendants.
+    """
+    outline = [
+        [str(chapter.location), chapter.display_name, [
+            [
+                str(subsection.location), subsection.display_name, subsection.due, subsection.show_correctness,
+                subsection.graded, subsection.format,
+                [[str(block.location), getattr(block, 'weight', None)] for block in _scored_blocks(subsection)],
+            ]
+            for subsection in chapter.get_children()
+        ]]
+        for chapter in course.get_children()
+    ]
+    document = json.dumps([course.grading_policy, outline], sort_keys=True, default=str)
+    return hashlib.md5(document.encode()).hexdigest()
+
+
+def outdate_published_course_progress(course_key):
+    """
+    Mark the precomputed progress of every learner of a published course stale
+    if its grading policy or graded outline changed since the last publish.
+
+    Score changes of a learner are handled by the grades signals, so most
+    publishes don't touch the progress rows. Returns True if they were marked.
+    """
+    fingerprint = get_grading_fingerprint(get_course_by_id(course_key, depth=None))
+    fingerprint_key = GRADING_FINGERPRINT_KEY.format(course_key)
+    if cache.get(fingerprint_key) == fingerprint:
+        return False
+    MobileCourseProgress.mark_course_stale(course_key)
+    cache.set(fingerprint_key, fingerprint, None)
+    return True
@@ -0,0 +1,116 @@
+"""
+Memoized third party auth lookups used by the mobile SSO flow.
+
+The lookups are kept in process memory and keyed by a version stored in the
+shared cache. Saving a provider configuration bumps the version, so every
+process looks the providers up again on its next request.
+
+The third party auth pipeline pulls in social_core, it is imported on first
+use since this module is loaded at startup by the signal receivers.
+"""
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth import REDIRECT_FIELD_NAME
+from django.core.cache import cache
+
+from .cache import ProcessCache
+from .site_config import get_current_site_id
+
+SAML_BACKEND_NAME = 'tpa-saml'
+LTI_BACKEND_NAME = 'lti'
+PROVIDER_CACHE_VERSION_KEY = 'mobile_api_extensions.provider_cache_version'
+
+_provider_cache = ProcessCache(timeout=getattr(settings, 'MOBILE_PROVIDER_CACHE_TIMEOUT', 300), name='providers')
+_login_url_cache = ProcessCache(timeout=getattr(settings, 'MOBILE_PROVIDER_CACHE_TIMEOUT', 300))
+
+
+def _cache_key(*parts):
+    """
+    Return the key of a lookup on the current site under the shared provider cache version.
+    """
+    return (cache.get(PROVIDER_CACHE_VERSION_KEY), get_current_site_id()) + parts
+
+
+def _pipeline_provider_key(running_pipeline):
+    """
+    Return what tells the providers of the pipeline backend apart: the IdP slug
+    for SAML, the consumer key for LTI and None for other backends.
+    """
+    response = running_pipeline.get('kwargs', {}).get('response') or {}
+    if not isinstance(response, dict):
+        return None
+    if running_pipeline.get('backend') == LTI_BACKEND_NAME:
+        from common.djangoapps.third_party_auth.lti import LTI_PARAMS_KEY  # pylint: disable=import-outside-toplevel
+
+        return (response.get(LTI_PARAMS_KEY) or {}).get('oauth_consumer_key')
+    return response.get('idp_name')
+
+
+def get_provider_from_pipeline(running_pipeline):
+    """
+    Cached version of `provider.Registry.get_from_pipeline`.
+
+    Providers are enabled per site, they are keyed by site, backend name and
+    IdP slug or LTI consumer key.
+    """
+    from common.djangoapps.third_party_auth import provider  # pylint: disable=import-outside-toplevel
+
+    key = _cache_key(running_pipeline.get('backend'), _pipeline_provider_key(running_pipeline))
+    return _provider_cache.get_or_set(key, lambda: provider.Registry.get_from_pipeline(running_pipeline))
+
+
+def _is_enabled_provider(backend_name, idp):
+    """
+    Return whether the backend, and for SAML the IdP, match a provider enabled on the current site.
+    """
+    from common.djangoapps.third_party_auth import provider  # pylint: disable=import-outside-toplevel
+
+    if backend_name == SAML_BACKEND_NAME:
+        return provider.Registry.get(f'saml-{idp}') is not None
+    return any(True for __ in provider.Registry.get_enabled_by_backend_name(backend_name))
+
+
+def get_mobile_login_url(backend_name, idp=None):
+    """
+    Return the SSO login URL which redirects back to the mobile deeplink.
+
+    Both arguments come from the request, so URLs are only cached for
+    backends and IdPs of providers enabled on the current site.
+    """
+    if backend_name != SAML_BACKEND_NAME:
+        idp = None
+
+    def _build_url():
+        from common.djangoapps.third_party_auth import pipeline  # pylint: disable=import-outside-toplevel
+
+        extra_params = {
+            REDIRECT_FIELD_NAME: settings.MOBILE_SSO_DEEPLINK,
+        }
+        if backend_name == SAML_BACKEND_NAME:
+            extra_params.update({
+                "auth_entry": "login",
+                "idp": idp,
+            })
+        return pipeline._get_url(  # pylint: disable=protected-access
+            'social_login_override',
+            backend_name,
+            extra_params=extra_params
+        )
+
+    key = _cache_key(backend_name, idp)
+    url = _login_url_cache.get(key)
+    if url is None:
+        url = _build_url()
+        if _is_enabled_provider(backend_name, idp):
+            _login_url_cache.set(key, url)
+    return url
+
+
+def clear_provider_cache():
+    """
+    Make every process look the providers and login URLs up again on next use.
+    """
+    cache.set(PROVIDER_CACHE_VERSION_KEY, uuid4().hex, None)
+    _provider_cache.clear()
+    _login_url_cache.clear()
@@ -0,0 +1,136 @@
+"""
+Query budgets of the plugin views.
+
+View handlers declare the most SQL queries they should run with
+`query_budget`: a fixed number plus an optional number per item of the
+requested page. When `MOBILE_QUERY_BUDGET_WARNINGS` is enabled (it follows
+`DEBUG` by default) the queries of decorated handlers are counted and a
+`QueryBudgetWarning` is issued when a request goes over budget. Tests use
+`assert_query_budget` to fail on regressions.
+
+Queries are counted on every database in `DATABASES`, the views reading
+from the replica included.
+"""
+import functools
+import logging
+import warnings
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+log = logging.getLogger(__name__)
+
+
+class QueryBudgetWarning(RuntimeWarning):
+    pass
+
+
+class QueryBudget:
+    """
+    Maximum number of queries: `base` plus `per_item` for every item of a page.
+    """
+
+    def __init__(self, base, per_item=0):
+        self.base = base
+        self.per_item = per_item
+
+    def __repr__(self):
+        return f'<QueryBudget {self.base} + {self.per_item}/item>'
+
+    def limit(self, page_size=0):
+        return self.base + self.per_item * (page_size or 0)
+
+
+def _page_size(view, request):
+    paginator = getattr(view, 'paginator', None)
+    return paginator.get_page_size(request) if paginator is not None else 0
+
+
+def _format_queries(queries):
+    return '\n'.join(f'{index}. {query["sql"]}' for index, query in enumerate(queries, start=1))
+
+
+class _CapturedQueries:
+    """
+    The queries captured on several database connections.
+    """
+
+    def __init__(self, contexts):
+        self.contexts = contexts
+
+    def __len__(self):
+        return sum(len(context) for context in self.contexts)
+
+    @property
+    def captured_queries(self):
+        return [query for context in self.contexts for query in context.captured_queries]
+
+
+@contextmanager
+def _capture_queries(using=None):
+    """
+    Capture the queries run on the `using` database, or on all of them.
+    """
+    aliases = [using] if using else list(settings.DATABASES)
+    with ExitStack() as stack:
+        yield _CapturedQueries([
+            stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in aliases
+        ])
+
+
+def _warnings_enabled():
+    enabled = getattr(settings, 'MOBILE_QUERY_BUDGET_WARNINGS', None)
+    return settings.DEBUG if enabled is None else enabled
+
+
+def query_budget(base, per_item=0, using=None):
+    """
+    Declare the query budget of a view handler method (`get`, `list`, ...).
+
+    The budget is available as the `query_budget` attribute of the handler.
+    Only the queries run on the `using` database are counted if given.
+    """
+    budget = QueryBudget(base, per_item)
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            if not _warnings_enabled():
+                return handler(self, request, *args, **kwargs)
+            with _capture_queries(using) as context:
+                response = handler(self, request, *args, **kwargs)
+            limit = budget.limit(_page_size(self, request))
+            if len(context) > limit:
+                message = (
+                    f'{type(self).__name__}.{handler.__name__} ran {len(context)} queries, '
+                    f'its budget is {limit} ({budget!r}).'
+                )
+                log.warning('%s\n%s', message, _format_queries(context.captured_queries))
+                warnings.warn(message, QueryBudgetWarning, stacklevel=2)
+            return response
+
+        wrapper.query_budget = budget
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def assert_query_budget(max_queries, using=None):
+    """
+    Fail with the list of executed queries when the block runs more than `max_queries` queries.
+
+    The limit of a decorated view comes from its declared budget:
+
+        with assert_query_budget(CourseListViewExtended.list.query_budget.limit(page_size=10)):
+            client.get(url, {'page_size': 10})
+    """
+    with _capture_queries(using) as context:
+        yield context
+    if len(context) > max_queries:
+        raise AssertionError(
+            f'{len(context)} queries executed, the budget is {max_queries}:\n'
+            f'{_format_queries(context.captured_queries)}'
+        )
@@ -0,0 +1,168 @@
+"""
+Renderers and response compression for mobile_api_extensions views.
+
+orjson, brotli, msgpack and cbor2 are optional, they come with the `fast`,
+`brotli` and `binary` extras. A feature whose library is missing falls back
+to the stock behaviour and logs a warning once per process.
+"""
+import datetime
+import gzip
+import logging
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover
+    cbor2 = None
+
+log = logging.getLogger(__name__)
+
+_reported_missing_libraries = set()
+
+
+def report_missing_library(library, extra):
+    """
+    Warn once per process that the library of a requested feature is not installed.
+    """
+    if library in _reported_missing_libraries:
+        return
+    _reported_missing_libraries.add(library)
+    log.warning('%s is not installed, install the mobile_api_extensions[%s] extra to use it.', library, extra)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    Datetimes keep their microseconds and UTC values end with `Z`, like DRF's
+    encoder. Types orjson does not know (Decimal, lazy strings, querysets...)
+    go through DRF's `JSONEncoder.default`. Falls back to the stock renderer
+    when orjson is not installed or an indented response is requested.
+    """
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            report_missing_library('orjson', 'fast')
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=JSONEncoder().default, option=self.options)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Render the JSON payload as MessagePack.
+
+    Values MessagePack has no type for (datetimes, Decimal, lazy strings...)
+    are converted exactly like in JSON responses.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=JSONEncoder().default)
+
+
+class CBORRenderer(BaseRenderer):
+    """
+    Render the JSON payload as CBOR.
+
+    Datetimes are written as standard CBOR date/time strings, naive values are
+    treated as UTC. Other unknown values are converted like in JSON responses.
+    """
+    media_type = 'application/cbor'
+    format = 'cbor'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        json_default = JSONEncoder().default
+        return cbor2.dumps(
+            data,
+            timezone=datetime.timezone.utc,
+            default=lambda encoder, value: encoder.encode(json_default(value)),
+        )
+
+
+# The binary formats are offered by the blocks and progress views whenever their library is installed.
+BINARY_RENDERER_CLASSES = tuple(
+    renderer_class for renderer_class, library in ((MessagePackRenderer, msgpack), (CBORRenderer, cbor2))
+    if library is not None
+)
+for _library_name, _library in (('msgpack', msgpack), ('cbor2', cbor2)):
+    if _library is None:
+        report_missing_library(_library_name, 'binary')
+
+
+def _accepted_encodings(request):
+    """
+    Return the set of content codings listed in the request Accept-Encoding header.
+    """
+    accepted = set()
+    for coding in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        name, _, params = coding.strip().partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0'):
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def compress_response(request, response):
+    """
+    Compress a rendered response with brotli or gzip if the client accepts it.
+
+    Only successful responses larger than `MOBILE_COMPRESSION_MIN_SIZE` are
+    compressed, smaller payloads are not worth the CPU time.
+    """
+    min_size = getattr(settings, 'MOBILE_COMPRESSION_MIN_SIZE', None)
+    if (
+        min_size is None
+        or response.streaming
+        or response.status_code != 200
+        or response.has_header('Content-Encoding')
+        or len(response.content) < min_size
+    ):
+        return
+
+    patch_vary_headers(response, ('Accept-Encoding',))
+    accepted = _accepted_encodings(request)
+    if brotli is None and 'br' in accepted:
+        report_missing_library('brotli', 'brotli')
+    if brotli is not None and 'br' in accepted:
+        response.content = brotli.compress(response.content, quality=4)
+        response['Content-Encoding'] = 'br'
+    elif 'gzip' in accepted:
+        response.content = gzip.compress(response.content, compresslevel=6)
+        response['Content-Encoding'] = 'gzip'
+    else:
+        return
+
+    response['Content-Length'] = str(len(response.content))
+    if response.has_header('ETag') and not response['ETag'].startswith('W/'):
+        response['ETag'] = 'W/' + response['ETag']
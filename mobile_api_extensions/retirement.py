@@ -0,0 +1,125 @@
+"""
+Asynchronous account deactivation for `DeactivateLogoutViewExtended`.
+
+The request only does what must be done before answering: it makes the
+password unusable, deletes the user's OAuth tokens and ends the session. The
+retirement request, the rest of the account changes and the deletion email
+are handled by the `deactivate_account` task, whose status is kept in the
+Django cache under an unguessable job id the client can poll.
+
+The task is retried on failure. If its last attempt fails, the account has
+an unusable password and no tokens but no retirement request, which is
+logged as an error to be finished by hand.
+"""
+import logging
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, logout
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+
+from .site_config import get_current_site_id, site_request
+
+log = logging.getLogger(__name__)
+User = get_user_model()
+
+JOB_PENDING = 'pending'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+
+
+def get_job_cache_key(job_id):
+    return f'mobile_api_extensions.deactivation_job.{job_id}'
+
+
+def set_job_status(job_id, status, timeout=DEFAULT_TIMEOUT):
+    """
+    Store the status of a deactivation job for `timeout` seconds, `MOBILE_DEACTIVATION_JOB_TIMEOUT` by default.
+    """
+    if timeout is DEFAULT_TIMEOUT:
+        timeout = getattr(settings, 'MOBILE_DEACTIVATION_JOB_TIMEOUT', 24 * 60 * 60)
+    cache.set(get_job_cache_key(job_id), status, timeout)
+
+
+def get_job_status(job_id):
+    """
+    Return the status of a deactivation job or None if it is unknown or expired.
+    """
+    return cache.get(get_job_cache_key(job_id))
+
+
+def start_deactivation(request):
+    """
+    Lock the requesting user out, queue the rest of the deactivation and return its job id.
+    """
+    # Deferred imports, the task module pulls in the rest of the plugin tasks.
+    # pylint: disable=import-outside-toplevel
+    from openedx.core.djangoapps.user_api.accounts.utils import retire_dot_oauth2_models
+
+    from .tasks import deactivate_account, schedule_task
+
+    user = request.user
+    job_id = uuid.uuid4().hex
+    with transaction.atomic():
+        user.set_unusable_password()
+        user.save(update_fields=['password'])
+        retire_dot_oauth2_models(user)
+        set_job_status(job_id, JOB_PENDING)
+        # The worker has no current request, the email is branded for the site of this one.
+        schedule_task(deactivate_account, user.id, job_id, get_current_site_id())
+    logout(request)
+    return job_id
+
+
+def finish_deactivation(user_id, job_id, site_id=None, last_attempt=True):
+    """
+    Create the retirement request of the user, deactivate the account and
+    send the deletion notification of `site_id`, like `DeactivateLogoutView` does.
+
+    Attempts after a failure skip the retirement request if it was created.
+    The job is only marked failed when `last_attempt` fails.
+    """
+    # Deferred imports, only the worker needs the retirement machinery.
+    # pylint: disable=import-outside-toplevel
+    from edx_ace import ace
+    from edx_ace.recipient import Recipient
+    from openedx.core.djangoapps.ace_common.template_context import get_base_template_context
+    from openedx.core.djangoapps.lang_pref import LANGUAGE_KEY
+    from openedx.core.djangoapps.user_api.accounts.utils import create_retirement_request_and_deactivate_account
+    from openedx.core.djangoapps.user_api.message_types import DeletionNotificationMessage
+    from openedx.core.djangoapps.user_api.models import UserRetirementStatus
+    from openedx.core.djangoapps.user_api.preferences.api import get_user_preference
+
+    try:
+        user = User.objects.select_related('profile').get(id=user_id)
+        retirement_status = UserRetirementStatus.objects.filter(user=user).first()
+        if retirement_status is None:
+            user_email = user.email
+            with transaction.atomic():
+                create_retirement_request_and_deactivate_account(user)
+        else:
+            # A previous attempt replaced the email of the account with its retired value.
+            user_email = retirement_status.original_email
+
+        with site_request(site_id) as site:
+            notification_context = get_base_template_context(site)
+            notification_context.update({'full_name': user.profile.name})
+            notification = DeletionNotificationMessage().personalize(
+                recipient=Recipient(lms_user_id=0, email_address=user_email),
+                language=get_user_preference(user, LANGUAGE_KEY) or settings.LANGUAGE_CODE,
+                user_context=notification_context,
+            )
+            ace.send(notification)
+    except Exception:
+        if last_attempt:
+            # Failed jobs are kept until the cache evicts them, the client may poll late.
+            set_job_status(job_id, JOB_FAILED, timeout=None)
+            log.exception(  # pylint: disable=logging-fstring-interpolation
+                f'Mobile deactivation job {job_id} of user {user_id} failed, the user can no longer log in but '
+                f'may have no retirement request. Finish it with `./manage.py lms retire_user` or the retirement '
+                f'API once the error is fixed.'
+            )
+        raise
+    set_job_status(job_id, JOB_SUCCEEDED)
@@ -0,0 +1,147 @@
+"""
+Bulk revocation of mobile authorization codes and OAuth tokens.
+
+Only the tokens of the mobile applications, `MOBILE_OAUTH_CLIENT_IDS`, are
+deleted unless tokens of every OAuth application are explicitly asked for.
+Rows are changed in batches of primary keys, each batch in its own short
+transaction, so revoking credentials of many users does not keep the token
+tables locked.
+"""
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from oauth2_provider.models import get_access_token_model, get_refresh_token_model
+
+from .models import MobileUserAuth
+
+
+def get_provider_user_ids(provider):
+    """
+    Return a subquery of the ids of users linked to a third party auth provider.
+
+    `provider` is a social auth backend name, SAML IdPs are selected with
+    `tpa-saml:<idp slug>`.
+    """
+    from social_django.models import UserSocialAuth  # pylint: disable=import-outside-toplevel
+
+    backend_name, __, idp_slug = provider.partition(':')
+    social_auths = UserSocialAuth.objects.filter(provider=backend_name)
+    if idp_slug:
+        social_auths = social_auths.filter(uid__startswith=f'{idp_slug}:')
+    return social_auths.values('user_id')
+
+
+def _in_batches(queryset, apply, batch_size, pause, progress, label):
+    """
+    Call `apply` with querysets of at most `batch_size` rows of `queryset` until none is left.
+    """
+    total = 0
+    while True:
+        ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return total
+        with transaction.atomic():
+            apply(queryset.model.objects.filter(pk__in=ids))
+        total += len(ids)
+        if progress:
+            progress(label, total)
+        if pause:
+            time.sleep(pause)
+
+
+def revoke_mobile_credentials(
+    user_ids=None,
+    provider=None,
+    client_ids=None,
+    all_applications=False,
+    created_after=None,
+    created_before=None,
+    batch_size=1000,
+    pause=0,
+    dry_run=False,
+    progress=None,
+):
+    """
+    Clear authorization codes and delete OAuth refresh and access tokens.
+
+    Arguments:
+        user_ids: ids (or a subquery of ids) of the users to revoke, all users by default.
+        provider (str): only revoke users linked to this provider, see `get_provider_user_ids`.
+        client_ids (list[str]): only delete tokens of these OAuth applications,
+            `MOBILE_OAUTH_CLIENT_IDS` by default.
+        all_applications (bool): delete the tokens of every OAuth application,
+            service and backend clients included.
+        created_after, created_before (datetime): only delete tokens created in this range.
+        batch_size (int): rows changed per statement.
+        pause (float): seconds to sleep between batches.
+        dry_run (bool): only count the rows which would be changed.
+        progress: called with a label and the number of rows changed so far after every batch.
+
+    Authorization codes are not tied to a client and have no creation date.
+    Without explicit client ids or a date filter the codes of all selected
+    users are cleared, otherwise only the codes of the users whose tokens are
+    revoked.
+
+    Raises ValueError when no client ids are given or configured and
+    `all_applications` is not set.
+
+    Returns a dict of the number of authorization codes, refresh tokens and
+    access tokens revoked (or to revoke on a dry run).
+    """
+    codes = MobileUserAuth.objects.filter(authorization_code__isnull=False)
+    refresh_tokens = get_refresh_token_model().objects.filter(revoked__isnull=True)
+    access_tokens = get_access_token_model().objects.all()
+
+    if client_ids and all_applications:
+        raise ValueError('Pass either client ids or all_applications.')
+    token_filters = {}
+    if client_ids:
+        token_filters['application__client_id__in'] = client_ids
+    if created_after:
+        token_filters['created__gte'] = created_after
+    if created_before:
+        token_filters['created__lt'] = created_before
+    # Codes are only limited to the users of the revoked tokens by explicit filters.
+    limit_codes = bool(token_filters)
+    if not client_ids and not all_applications:
+        client_ids = getattr(settings, 'MOBILE_OAUTH_CLIENT_IDS', None)
+        if not client_ids:
+            raise ValueError('Set MOBILE_OAUTH_CLIENT_IDS or pass the client ids of the mobile applications.')
+        token_filters['application__client_id__in'] = client_ids
+    refresh_tokens = refresh_tokens.filter(**token_filters)
+    access_tokens = access_tokens.filter(**token_filters)
+
+    for user_filter in (user_ids, get_provider_user_ids(provider) if provider else None):
+        if user_filter is not None:
+            codes = codes.filter(user_id__in=user_filter)
+            refresh_tokens = refresh_tokens.filter(user_id__in=user_filter)
+            access_tokens = access_tokens.filter(user_id__in=user_filter)
+
+    if limit_codes:
+        # The codes are cleared before any token is deleted, so the subqueries still match.
+        codes = codes.filter(
+            Q(user_id__in=refresh_tokens.values('user_id')) | Q(user_id__in=access_tokens.values('user_id'))
+        )
+
+    if dry_run:
+        return {
+            'authorization_codes': codes.count(),
+            'refresh_tokens': refresh_tokens.count(),
+            'access_tokens': access_tokens.count(),
+        }
+
+    batch_options = {'batch_size': batch_size, 'pause': pause, 'progress': progress}
+    return {
+        'authorization_codes': _in_batches(
+            codes, lambda batch: batch.update(authorization_code=None), label='authorization_codes', **batch_options
+        ),
+        # Refresh tokens first, deleting an access token leaves its refresh token usable.
+        'refresh_tokens': _in_batches(
+            refresh_tokens, lambda batch: batch.delete(), label='refresh_tokens', **batch_options
+        ),
+        'access_tokens': _in_batches(
+            access_tokens, lambda batch: batch.delete(), label='access_tokens', **batch_options
+        ),
+    }
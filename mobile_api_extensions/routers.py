@@ -0,0 +1,116 @@
+"""
+Database routing for the read-only mobile_api_extensions views.
+"""
+import contextlib
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Atomic block depth of the default connection when the replica was enabled, None when it is not.
+_read_replica_active = ContextVar('mobile_api_extensions_read_replica', default=None)
+
+
+def _atomic_depth():
+    """
+    Return the number of `transaction.atomic` blocks open on the default connection.
+    """
+    connection = connections[DEFAULT_DB_ALIAS]
+    return len(connection.savepoint_ids) + 1 if connection.in_atomic_block else 0
+
+
+def get_read_replica_alias():
+    return getattr(settings, 'MOBILE_READ_REPLICA_DATABASE', None)
+
+
+def _primary_pin_cache_key(user_id):
+    return f'mobile_api_extensions.primary_pin.{user_id}'
+
+
+def pin_to_primary(user_id):
+    """
+    Serve the user's reads from the primary database for a while after a write.
+
+    Protects read-your-writes cases such as listing enrollments right after
+    enrolling, while the replica may still lag behind.
+    """
+    if get_read_replica_alias():
+        cache.set(_primary_pin_cache_key(user_id), True, getattr(settings, 'MOBILE_READ_REPLICA_PIN_SECONDS', 30))
+
+
+def can_use_read_replica(user):
+    """
+    Return True if a replica is configured and the user is not pinned to the primary.
+    """
+    if not get_read_replica_alias():
+        return False
+    return not (user.is_authenticated and cache.get(_primary_pin_cache_key(user.id)))
+
+
+def enable_read_replica():
+    """
+    Route the following reads of the current context to the read replica.
+
+    Returns a token for `reset_read_replica`.
+    """
+    return _read_replica_active.set(_atomic_depth())
+
+
+def reset_read_replica(token):
+    _read_replica_active.reset(token)
+
+
+@contextlib.contextmanager
+def read_replica():
+    """
+    Route the reads made inside the block to the read replica.
+    """
+    token = enable_read_replica()
+    try:
+        yield
+    finally:
+        reset_read_replica(token)
+
+
+def _reads_primary(model, replica_depth):
+    """
+    Return True for reads which must see the primary even inside `read_replica()` blocks.
+
+    Reads in a transaction opened after the replica was enabled usually
+    precede a write, and the models of `MOBILE_READ_REPLICA_PRIMARY_MODELS`
+    are created or updated on a miss by the GET paths (e.g.
+    `CourseOverview.get_from_id`). Reading them from a lagging replica would
+    redo the write or fail with an IntegrityError. The transaction of
+    `ATOMIC_REQUESTS`, opened before, does not count.
+    """
+    if _atomic_depth() > replica_depth:
+        return True
+    primary_models = getattr(settings, 'MOBILE_READ_REPLICA_PRIMARY_MODELS', ())
+    return model._meta.label in primary_models  # pylint: disable=protected-access
+
+
+class MobileReadReplicaRouter:
+    """
+    Send reads to `MOBILE_READ_REPLICA_DATABASE` inside `read_replica()` blocks.
+
+    Outside of those blocks, for the reads `_reads_primary` keeps on the
+    primary and for all writes, the router has no opinion and Django falls
+    back to the next router or the default database.
+    """
+
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        replica_depth = _read_replica_active.get()
+        if replica_depth is not None and not _reads_primary(model, replica_depth):
+            return get_read_replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):  # pylint: disable=unused-argument
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        replica_alias = get_read_replica_alias()
+        databases = {obj1._state.db, obj2._state.db}  # pylint: disable=protected-access
+        if replica_alias and databases <= {DEFAULT_DB_ALIAS, replica_alias}:
+            return True
+        return None
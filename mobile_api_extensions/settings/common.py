@@ -42,3 +42,107 @@ def plugin_settings(settings):
     """
     settings.MOBILE_SSO_DEEPLINK = 'openedx://sso'
     settings.FEATURES['ENABLE_MOBILE_THIRD_PARTY_AUTH'] = True
+    # Send deferred work (activation emails etc.) to Celery, otherwise run it
+    # in a local thread pool after the transaction commits.
+    settings.MOBILE_API_EXTENSIONS_USE_CELERY = True
+    settings.MOBILE_API_EXTENSIONS_THREAD_POOL_SIZE = 2
+    # Seconds third party auth providers and SSO login URLs stay memoized per process.
+    settings.MOBILE_PROVIDER_CACHE_TIMEOUT = 300
+    # Seconds the per-site configuration snapshot stays in process memory.
+    settings.MOBILE_SITE_CONFIG_CACHE_TIMEOUT = 300
+    # Render plugin API responses with orjson (needs the `orjson` package).
+    settings.MOBILE_FAST_JSON_RENDERER = False
+    # Seconds the certificate download URLs of a user stay in the Django cache.
+    settings.MOBILE_CERTIFICATE_CACHE_TIMEOUT = 300
+    # Compress plugin API responses larger than this many bytes, None disables compression.
+    settings.MOBILE_COMPRESSION_MIN_SIZE = 16 * 1024
+    # Courses loaded per query by the streaming mode of the course list endpoint.
+    settings.MOBILE_COURSE_LIST_STREAM_CHUNK_SIZE = 500
+    # Database alias serving the GET requests of the read-only plugin views, None keeps them on the primary.
+    settings.MOBILE_READ_REPLICA_DATABASE = None
+    # Seconds a user's reads stay on the primary after they change an enrollment.
+    settings.MOBILE_READ_REPLICA_PIN_SECONDS = 30
+    # Models read from the primary even by the replica-routed views, since those views write them on a miss.
+    settings.MOBILE_READ_REPLICA_PRIMARY_MODELS = (
+        'course_overviews.CourseOverview',
+        'course_overviews.CourseOverviewImageSet',
+        'course_overviews.CourseOverviewTab',
+        'block_structure.BlockStructureModel',
+    )
+    settings.DATABASE_ROUTERS = [
+        'mobile_api_extensions.routers.MobileReadReplicaRouter',
+        *getattr(settings, 'DATABASE_ROUTERS', []),
+    ]
+    # Warm the mobile course caches from a task when a course is published.
+    settings.MOBILE_WARM_COURSE_CACHES_ON_PUBLISH = True
+    # Courses warmed concurrently by the warm_mobile_course_caches command.
+    settings.MOBILE_CACHE_WARMER_WORKERS = 4
+    # Seconds precomputed course progress is served for, None disables the precomputation.
+    settings.MOBILE_PROGRESS_MAX_AGE = 24 * 60 * 60
+    # Progress rows recomputed per task run.
+    settings.MOBILE_PROGRESS_BATCH_SIZE = 100
+    # Seconds score changes are collected before a progress recomputation runs.
+    settings.MOBILE_PROGRESS_BATCH_DELAY = 30
+    # Celery queue of the progress recomputation, None uses the default queue.
+    settings.MOBILE_PROGRESS_CELERY_QUEUE = None
+    # Build offline download packages of courses when they are published.
+    settings.MOBILE_OFFLINE_PACKAGES_ENABLED = False
+    # Dotted path of the storage class of the offline packages, None uses the default storage.
+    settings.MOBILE_OFFLINE_PACKAGE_STORAGE = None
+    # Storage directory of the offline packages.
+    settings.MOBILE_OFFLINE_PACKAGE_DIR = 'mobile_course_packages'
+    # Seconds publishes are collected before an offline package is rebuilt.
+    settings.MOBILE_OFFLINE_PACKAGE_BUILD_DELAY = 60
+    # Block types whose student_view_data is included in the offline packages.
+    settings.MOBILE_OFFLINE_PACKAGE_STUDENT_VIEW_DATA = ['video', 'html', 'discussion']
+    # Local directory the profiles of plugin requests are written to, None disables profiling.
+    settings.MOBILE_PROFILING_DIR = None
+    # Share of the requests to MOBILE_PROFILING_PATH_PREFIXES that are profiled.
+    settings.MOBILE_PROFILING_SAMPLE_RATE = 0.001
+    settings.MOBILE_PROFILING_PATH_PREFIXES = ('/mobile_api_extensions/', '/auth/complete/', '/auth/login/mobile/')
+    # Requests sending this header with MOBILE_PROFILING_SECRET as value, or from staff session users, are profiled.
+    settings.MOBILE_PROFILING_HEADER = 'X-Mobile-Profile'
+    settings.MOBILE_PROFILING_SECRET = None
+    # Store the parameters of the profiled SQL queries, they contain user data.
+    settings.MOBILE_PROFILING_SQL_PARAMS = False
+    settings.MIDDLEWARE = [
+        *getattr(settings, 'MIDDLEWARE', []),
+        'mobile_api_extensions.profiling.MobileProfilingMiddleware',
+    ]
+    # Seconds a single-flight lock is held at most and seconds other requests wait for it.
+    settings.MOBILE_SINGLE_FLIGHT_LOCK_TIMEOUT = 30
+    settings.MOBILE_SINGLE_FLIGHT_WAIT = 5
+    # Seconds a course is considered warm after a request loaded its caches.
+    settings.MOBILE_COURSE_WARM_TIMEOUT = 60 * 60
+    # Seconds the course list of anonymous users is cached, None disables it.
+    settings.MOBILE_ANONYMOUS_CATALOG_CACHE_TIMEOUT = 60
+    # Finish mobile account deactivations in a background task, the request returns 202 with a job id.
+    settings.MOBILE_ASYNC_DEACTIVATION = False
+    # Seconds the status of a deactivation job can be polled.
+    settings.MOBILE_DEACTIVATION_JOB_TIMEOUT = 24 * 60 * 60
+    # Warn when a view runs more queries than its declared query budget, None follows DEBUG.
+    settings.MOBILE_QUERY_BUDGET_WARNINGS = None
+    # Seconds a process keeps its course catalogs, they are also rebuilt when a course overview changes.
+    settings.MOBILE_CATALOG_CACHE_TIMEOUT = 300
+    # Course overviews loaded at a time to build a catalog or check access to its courses.
+    settings.MOBILE_CATALOG_CHUNK_SIZE = 500
+    # Seconds the ids of the catalog courses a user can see are cached, role changes show up after this delay.
+    settings.MOBILE_CATALOG_ACCESS_CACHE_TIMEOUT = 60
+    # Export Prometheus metrics of the plugin endpoints, needs prometheus_client.
+    settings.MOBILE_METRICS_ENABLED = False
+    settings.MOBILE_METRICS_PATH_PREFIXES = ('/mobile_api_extensions/', '/auth/complete/', '/auth/login/mobile/')
+    # Serve the metrics at /mobile_api_extensions/metrics/, keep it off where Prometheus scrapes another exporter.
+    settings.MOBILE_METRICS_ENDPOINT = False
+    # Bearer token Prometheus sends to the metrics endpoint, staff users logged in with a session are also let in.
+    settings.MOBILE_METRICS_TOKEN = None
+    settings.MIDDLEWARE = [
+        *settings.MIDDLEWARE,
+        'mobile_api_extensions.metrics.MobileMetricsMiddleware',
+    ]
+    # Client ids of the OAuth applications of the mobile apps, the only ones whose tokens are revoked by default.
+    settings.MOBILE_OAUTH_CLIENT_IDS = []
+    # Token buckets for exchange_authorization_code: burst capacity and tokens regained per second.
+    settings.MOBILE_EXCHANGE_RATE_LIMITS = {
+        'ip': {'capacity': 30, 'refill_rate': 0.5},
+        'client': {'capacity': 600, 'refill_rate': 20},
+    }
@@ -15,3 +15,120 @@ def plugin_settings(settings):
     settings.MOBILE_SSO_DEEPLINK = settings.ENV_TOKENS.get(
         'MOBILE_SSO_DEEPLINK', settings.MOBILE_SSO_DEEPLINK
     )
+    settings.MOBILE_API_EXTENSIONS_USE_CELERY = settings.ENV_TOKENS.get(
+        'MOBILE_API_EXTENSIONS_USE_CELERY', settings.MOBILE_API_EXTENSIONS_USE_CELERY
+    )
+    settings.MOBILE_API_EXTENSIONS_THREAD_POOL_SIZE = settings.ENV_TOKENS.get(
+        'MOBILE_API_EXTENSIONS_THREAD_POOL_SIZE', settings.MOBILE_API_EXTENSIONS_THREAD_POOL_SIZE
+    )
+    settings.MOBILE_OAUTH_CLIENT_IDS = settings.ENV_TOKENS.get(
+        'MOBILE_OAUTH_CLIENT_IDS', settings.MOBILE_OAUTH_CLIENT_IDS
+    )
+    settings.MOBILE_EXCHANGE_RATE_LIMITS = settings.ENV_TOKENS.get(
+        'MOBILE_EXCHANGE_RATE_LIMITS', settings.MOBILE_EXCHANGE_RATE_LIMITS
+    )
+    settings.MOBILE_FAST_JSON_RENDERER = settings.ENV_TOKENS.get(
+        'MOBILE_FAST_JSON_RENDERER', settings.MOBILE_FAST_JSON_RENDERER
+    )
+    settings.MOBILE_COMPRESSION_MIN_SIZE = settings.ENV_TOKENS.get(
+        'MOBILE_COMPRESSION_MIN_SIZE', settings.MOBILE_COMPRESSION_MIN_SIZE
+    )
+    settings.MOBILE_READ_REPLICA_DATABASE = settings.ENV_TOKENS.get(
+        'MOBILE_READ_REPLICA_DATABASE', settings.MOBILE_READ_REPLICA_DATABASE
+    )
+    settings.MOBILE_READ_REPLICA_PIN_SECONDS = settings.ENV_TOKENS.get(
+        'MOBILE_READ_REPLICA_PIN_SECONDS', settings.MOBILE_READ_REPLICA_PIN_SECONDS
+    )
+    settings.MOBILE_WARM_COURSE_CACHES_ON_PUBLISH = settings.ENV_TOKENS.get(
+        'MOBILE_WARM_COURSE_CACHES_ON_PUBLISH', settings.MOBILE_WARM_COURSE_CACHES_ON_PUBLISH
+    )
+    settings.MOBILE_PROGRESS_MAX_AGE = settings.ENV_TOKENS.get(
+        'MOBILE_PROGRESS_MAX_AGE', settings.MOBILE_PROGRESS_MAX_AGE
+    )
+    settings.MOBILE_PROGRESS_BATCH_SIZE = settings.ENV_TOKENS.get(
+        'MOBILE_PROGRESS_BATCH_SIZE', settings.MOBILE_PROGRESS_BATCH_SIZE
+    )
+    settings.MOBILE_PROGRESS_BATCH_DELAY = settings.ENV_TOKENS.get(
+        'MOBILE_PROGRESS_BATCH_DELAY', settings.MOBILE_PROGRESS_BATCH_DELAY
+    )
+    settings.MOBILE_PROGRESS_CELERY_QUEUE = settings.ENV_TOKENS.get(
+        'MOBILE_PROGRESS_CELERY_QUEUE', settings.MOBILE_PROGRESS_CELERY_QUEUE
+    )
+    settings.MOBILE_OFFLINE_PACKAGES_ENABLED = settings.ENV_TOKENS.get(
+        'MOBILE_OFFLINE_PACKAGES_ENABLED', settings.MOBILE_OFFLINE_PACKAGES_ENABLED
+    )
+    settings.MOBILE_OFFLINE_PACKAGE_STORAGE = settings.ENV_TOKENS.get(
+        'MOBILE_OFFLINE_PACKAGE_STORAGE', settings.MOBILE_OFFLINE_PACKAGE_STORAGE
+    )
+    settings.MOBILE_OFFLINE_PACKAGE_DIR = settings.ENV_TOKENS.get(
+        'MOBILE_OFFLINE_PACKAGE_DIR', settings.MOBILE_OFFLINE_PACKAGE_DIR
+    )
+    settings.MOBILE_OFFLINE_PACKAGE_BUILD_DELAY = settings.ENV_TOKENS.get(
+        'MOBILE_OFFLINE_PACKAGE_BUILD_DELAY', settings.MOBILE_OFFLINE_PACKAGE_BUILD_DELAY
+    )
+    settings.MOBILE_COURSE_LIST_STREAM_CHUNK_SIZE = settings.ENV_TOKENS.get(
+        'MOBILE_COURSE_LIST_STREAM_CHUNK_SIZE', settings.MOBILE_COURSE_LIST_STREAM_CHUNK_SIZE
+    )
+    settings.MOBILE_PROFILING_DIR = settings.ENV_TOKENS.get(
+        'MOBILE_PROFILING_DIR', settings.MOBILE_PROFILING_DIR
+    )
+    settings.MOBILE_PROFILING_SAMPLE_RATE = settings.ENV_TOKENS.get(
+        'MOBILE_PROFILING_SAMPLE_RATE', settings.MOBILE_PROFILING_SAMPLE_RATE
+    )
+    settings.MOBILE_PROFILING_PATH_PREFIXES = settings.ENV_TOKENS.get(
+        'MOBILE_PROFILING_PATH_PREFIXES', settings.MOBILE_PROFILING_PATH_PREFIXES
+    )
+    settings.MOBILE_PROFILING_HEADER = settings.ENV_TOKENS.get(
+        'MOBILE_PROFILING_HEADER', settings.MOBILE_PROFILING_HEADER
+    )
+    settings.MOBILE_PROFILING_SECRET = settings.ENV_TOKENS.get(
+        'MOBILE_PROFILING_SECRET', settings.MOBILE_PROFILING_SECRET
+    )
+    settings.MOBILE_PROFILING_SQL_PARAMS = settings.ENV_TOKENS.get(
+        'MOBILE_PROFILING_SQL_PARAMS', settings.MOBILE_PROFILING_SQL_PARAMS
+    )
+    settings.MOBILE_SINGLE_FLIGHT_LOCK_TIMEOUT = settings.ENV_TOKENS.get(
+        'MOBILE_SINGLE_FLIGHT_LOCK_TIMEOUT', settings.MOBILE_SINGLE_FLIGHT_LOCK_TIMEOUT
+    )
+    settings.MOBILE_SINGLE_FLIGHT_WAIT = settings.ENV_TOKENS.get(
+        'MOBILE_SINGLE_FLIGHT_WAIT', settings.MOBILE_SINGLE_FLIGHT_WAIT
+    )
+    settings.MOBILE_COURSE_WARM_TIMEOUT = settings.ENV_TOKENS.get(
+        'MOBILE_COURSE_WARM_TIMEOUT', settings.MOBILE_COURSE_WARM_TIMEOUT
+    )
+    settings.MOBILE_ANONYMOUS_CATALOG_CACHE_TIMEOUT = settings.ENV_TOKENS.get(
+        'MOBILE_ANONYMOUS_CATALOG_CACHE_TIMEOUT', settings.MOBILE_ANONYMOUS_CATALOG_CACHE_TIMEOUT
+    )
+    settings.MOBILE_ASYNC_DEACTIVATION = settings.ENV_TOKENS.get(
+        'MOBILE_ASYNC_DEACTIVATION', settings.MOBILE_ASYNC_DEACTIVATION
+    )
+    settings.MOBILE_DEACTIVATION_JOB_TIMEOUT = settings.ENV_TOKENS.get(
+        'MOBILE_DEACTIVATION_JOB_TIMEOUT', settings.MOBILE_DEACTIVATION_JOB_TIMEOUT
+    )
+    settings.MOBILE_METRICS_ENABLED = settings.ENV_TOKENS.get(
+        'MOBILE_METRICS_ENABLED', settings.MOBILE_METRICS_ENABLED
+    )
+    settings.MOBILE_METRICS_PATH_PREFIXES = settings.ENV_TOKENS.get(
+        'MOBILE_METRICS_PATH_PREFIXES', settings.MOBILE_METRICS_PATH_PREFIXES
+    )
+    settings.MOBILE_METRICS_ENDPOINT = settings.ENV_TOKENS.get(
+        'MOBILE_METRICS_ENDPOINT', settings.MOBILE_METRICS_ENDPOINT
+    )
+    settings.MOBILE_METRICS_TOKEN = settings.ENV_TOKENS.get(
+        'MOBILE_METRICS_TOKEN', settings.MOBILE_METRICS_TOKEN
+    )
+    settings.MOBILE_CATALOG_CACHE_TIMEOUT = settings.ENV_TOKENS.get(
+        'MOBILE_CATALOG_CACHE_TIMEOUT', settings.MOBILE_CATALOG_CACHE_TIMEOUT
+    )
+    settings.MOBILE_CATALOG_CHUNK_SIZE = settings.ENV_TOKENS.get(
+        'MOBILE_CATALOG_CHUNK_SIZE', settings.MOBILE_CATALOG_CHUNK_SIZE
+    )
+    settings.MOBILE_CATALOG_ACCESS_CACHE_TIMEOUT = settings.ENV_TOKENS.get(
+        'MOBILE_CATALOG_ACCESS_CACHE_TIMEOUT', settings.MOBILE_CATALOG_ACCESS_CACHE_TIMEOUT
+    )
+    settings.MOBILE_READ_REPLICA_PRIMARY_MODELS = settings.ENV_TOKENS.get(
+        'MOBILE_READ_REPLICA_PRIMARY_MODELS', settings.MOBILE_READ_REPLICA_PRIMARY_MODELS
+    )
+    settings.MOBILE_OFFLINE_PACKAGE_STUDENT_VIEW_DATA = settings.ENV_TOKENS.get(
+        'MOBILE_OFFLINE_PACKAGE_STUDENT_VIEW_DATA', settings.MOBILE_OFFLINE_PACKAGE_STUDENT_VIEW_DATA
+    )
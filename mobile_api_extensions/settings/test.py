@@ -32,6 +32,7 @@ SITE_ID = 1
 SITE_NAME = 'localhost:8000'
 
 INSTALLED_APPS = (
+    'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
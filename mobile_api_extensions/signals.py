@@ -0,0 +1,103 @@
+"""
+Signal receivers for mobile_api_extensions.
+"""
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.third_party_auth.models import (
+    LTIProviderConfig,
+    OAuth2ProviderConfig,
+    SAMLConfiguration,
+    SAMLProviderConfig,
+)
+from lms.djangoapps.certificates.models import GeneratedCertificate
+from lms.djangoapps.grades.signals.signals import PROBLEM_WEIGHTED_SCORE_CHANGED, SUBSECTION_SCORE_CHANGED
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview, CourseOverviewImageSet
+from openedx.core.djangoapps.site_configuration.models import SiteConfiguration
+
+from .catalog import invalidate_catalogs
+from .certificates import invalidate_certificate_download_urls
+from .models import MobileCourseProgress
+from .providers import clear_provider_cache
+from .routers import pin_to_primary
+from .site_config import refresh_site_config
+from .tasks import schedule_progress_precomputation
+
+
+def invalidate_provider_cache(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drop memoized third party auth providers when their configuration changes.
+    """
+    clear_provider_cache()
+
+
+for provider_config_model in (LTIProviderConfig, OAuth2ProviderConfig, SAMLConfiguration, SAMLProviderConfig):
+    for model_signal in (post_save, post_delete):
+        model_signal.connect(
+            invalidate_provider_cache,
+            sender=provider_config_model,
+            dispatch_uid=f'mobile_api_extensions.provider_cache.{provider_config_model.__name__}',
+        )
+
+
+@receiver(post_save, sender=SiteConfiguration)
+@receiver(post_delete, sender=SiteConfiguration)
+def invalidate_site_config(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drop the configuration snapshot of the changed site, and the catalogs since
+    the site configuration filters the visible courses.
+    """
+    refresh_site_config(instance.site_id)
+    invalidate_catalogs()
+
+
+@receiver(post_save, sender=CourseOverview)
+@receiver(post_delete, sender=CourseOverview)
+@receiver(post_save, sender=CourseOverviewImageSet)
+@receiver(post_delete, sender=CourseOverviewImageSet)
+def invalidate_course_catalogs(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Rebuild the shared course catalogs when a course overview or its images change.
+    """
+    invalidate_catalogs()
+
+
+@receiver(post_save, sender=GeneratedCertificate)
+@receiver(post_delete, sender=GeneratedCertificate)
+def invalidate_user_certificates(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drop the cached certificate download URLs of a user when a certificate is generated or revoked.
+    """
+    invalidate_certificate_download_urls(instance.user_id)
+
+
+@receiver(post_save, sender=CourseEnrollment)
+def pin_enrolled_user_to_primary(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Read the user's data from the primary database right after an enrollment change.
+    """
+    pin_to_primary(instance.user_id)
+
+
+@receiver(PROBLEM_WEIGHTED_SCORE_CHANGED)
+def invalidate_precomputed_progress(sender, user_id, course_id, **kwargs):  # pylint: disable=unused-argument
+    """
+    Stop serving the precomputed progress of a learner as soon as they submit.
+
+    The subsection grades are only updated later by the grades task, which
+    sends SUBSECTION_SCORE_CHANGED once it is done.
+    """
+    if getattr(settings, 'MOBILE_PROGRESS_MAX_AGE', None) is not None:
+        MobileCourseProgress.mark_stale(user_id, course_id)
+
+
+@receiver(SUBSECTION_SCORE_CHANGED)
+def precompute_progress(sender, course, user, **kwargs):  # pylint: disable=unused-argument
+    """
+    Queue the recomputation of a learner's progress once their grades are updated.
+    """
+    if getattr(settings, 'MOBILE_PROGRESS_MAX_AGE', None) is not None:
+        MobileCourseProgress.mark_stale(user.id, course.id, create=True)
+        schedule_progress_precomputation()
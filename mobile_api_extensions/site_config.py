@@ -0,0 +1,102 @@
+"""
+Per-site snapshot of the configuration values read by the plugin helpers.
+
+Resolving a value through `configuration_helpers` looks up the current
+site's configuration every time. The values the catalog and auth helpers
+need are instead read once per site and kept in process memory for
+`MOBILE_SITE_CONFIG_CACHE_TIMEOUT` seconds. Saving a `SiteConfiguration`
+bumps the version of its site in the shared cache, and every process reads
+the configuration again on its next request to the site.
+"""
+from collections import namedtuple
+from contextlib import contextmanager
+from uuid import uuid4
+
+from crum import get_current_request, set_current_request
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.test import RequestFactory
+from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
+
+from common.djangoapps.third_party_auth import is_enabled as tpa_is_enabled
+
+from .cache import ProcessCache
+from .metrics import record_cache
+
+SiteConfig = namedtuple('SiteConfig', [
+    'catalog_visibility_permission',
+    'mobile_third_party_auth_enabled',
+])
+
+SITE_CONFIG_VERSION_KEY = 'mobile_api_extensions.site_config_version.{}'
+
+_site_configs = ProcessCache(timeout=getattr(settings, 'MOBILE_SITE_CONFIG_CACHE_TIMEOUT', 300))
+
+
+def get_current_site_id():
+    """
+    Return the id of the site serving the current request.
+    """
+    site = getattr(get_current_request(), 'site', None)
+    return site.id if site else settings.SITE_ID
+
+
+@contextmanager
+def site_request(site_id):
+    """
+    Serve `site_id`, or the `SITE_ID` site, as the site of the current request
+    to code running outside of a request, such as tasks, and yield the site.
+
+    `configuration_helpers` then resolve the values of that site.
+    """
+    site = Site.objects.get(id=site_id) if site_id else Site.objects.get_current()
+    request = RequestFactory().get('/', HTTP_HOST=site.domain)
+    request.site = site
+    previous_request = get_current_request()
+    set_current_request(request)
+    try:
+        yield site
+    finally:
+        set_current_request(previous_request)
+
+
+def _load_site_config():
+    """
+    Read the configuration of the current site.
+    """
+    return SiteConfig(
+        catalog_visibility_permission=configuration_helpers.get_value(
+            'COURSE_CATALOG_VISIBILITY_PERMISSION',
+            settings.COURSE_CATALOG_VISIBILITY_PERMISSION
+        ),
+        mobile_third_party_auth_enabled=bool(tpa_is_enabled() and configuration_helpers.get_value(
+            'ENABLE_MOBILE_THIRD_PARTY_AUTH',
+            settings.FEATURES.get('ENABLE_MOBILE_THIRD_PARTY_AUTH')
+        )),
+    )
+
+
+def get_site_config():
+    """
+    Return the `SiteConfig` snapshot of the current site.
+    """
+    site_id = get_current_site_id()
+    version = cache.get(SITE_CONFIG_VERSION_KEY.format(site_id))
+    cached = _site_configs.get(site_id)
+    if cached is not None and cached[0] == version:
+        record_cache('site_config', 'hit')
+        return cached[1]
+
+    record_cache('site_config', 'miss')
+    site_config = _load_site_config()
+    _site_configs.set(site_id, (version, site_config))
+    return site_config
+
+
+def refresh_site_config(site_id):
+    """
+    Make every process read the configuration of a site again on next use.
+    """
+    cache.set(SITE_CONFIG_VERSION_KEY.format(site_id), uuid4().hex, None)
+    _site_configs.delete(site_id)
@@ -0,0 +1,6 @@
+"""
+Studio side of mobile_api_extensions.
+
+Studio only installs this app, it forwards `course_published` to the LMS
+workers and loads none of the LMS views, routers, middlewares or receivers.
+"""
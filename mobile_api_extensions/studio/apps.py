@@ -0,0 +1,37 @@
+"""
+App configuration of the Studio hook of mobile_api_extensions.
+"""
+from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from openedx.core.djangoapps.plugins.constants import ProjectType, SettingsType, PluginSettings
+
+
+class MobileApiExtensionsStudioConfig(AppConfig):
+    """
+    Studio hook configuration.
+    """
+    name = 'mobile_api_extensions.studio'
+    label = 'mobile_api_extensions_studio'
+    verbose_name = ' Mobile API extensions (Studio)'
+
+    plugin_app = {
+        PluginSettings.CONFIG: {
+            ProjectType.CMS: {
+                SettingsType.PRODUCTION: {
+                    PluginSettings.RELATIVE_PATH: 'settings.production',
+                },
+            },
+        }
+    }
+
+    def ready(self):
+        """
+        Connect the publish receiver, it needs the Celery queue of the LMS workers.
+        """
+        if not getattr(settings, 'MOBILE_PUBLISH_CELERY_QUEUE', None):
+            raise ImproperlyConfigured(
+                'Set MOBILE_PUBLISH_CELERY_QUEUE to a Celery queue consumed by the LMS workers.'
+            )
+        from . import signals  # pylint: disable=unused-import,import-outside-toplevel
@@ -0,0 +1,13 @@
+"""
+Studio production settings for mobile_api_extensions.
+"""
+
+
+def plugin_settings(settings):
+    """
+    Set Studio production settings.
+    """
+    # Celery queue of the LMS workers running the tasks of published courses, required.
+    settings.MOBILE_PUBLISH_CELERY_QUEUE = settings.ENV_TOKENS.get(
+        'MOBILE_PUBLISH_CELERY_QUEUE', getattr(settings, 'MOBILE_PUBLISH_CELERY_QUEUE', None)
+    )
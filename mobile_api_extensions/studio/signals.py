@@ -0,0 +1,24 @@
+"""
+Signal receivers of the Studio hook.
+"""
+from celery import current_app
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import receiver
+
+from xmodule.modulestore.django import SignalHandler
+
+# Sent by name, Studio does not import the LMS tasks.
+REFRESH_PUBLISHED_COURSE_TASK = 'mobile_api_extensions.tasks.refresh_published_course'
+
+
+@receiver(SignalHandler.course_published)
+def enqueue_published_course(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Let the LMS workers refresh the mobile data of a published course.
+    """
+    transaction.on_commit(lambda: current_app.send_task(
+        REFRESH_PUBLISHED_COURSE_TASK,
+        args=(str(course_key),),
+        queue=settings.MOBILE_PUBLISH_CELERY_QUEUE,
+    ))
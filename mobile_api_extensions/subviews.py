@@ -0,0 +1,55 @@
+"""
+Helpers running plugin list views inside another API request, see `api.AppLaunchView`.
+"""
+import copy
+
+from rest_framework.request import Request
+
+
+def sub_request(request, **query_params):
+    """
+    Return a copy of the DRF request with the given query parameters set.
+
+    The copy shares the authenticated user but none of the parsed state of
+    `request`, so every view reads its own query parameters.
+    """
+    django_request = copy.copy(request._request)  # pylint: disable=protected-access
+    django_request.GET = django_request.GET.copy()
+    for name, value in query_params.items():
+        django_request.GET[name] = value
+    new_request = Request(
+        django_request,
+        parsers=request.parsers,
+        authenticators=request.authenticators,
+        negotiator=request.negotiator,
+        parser_context=request.parser_context,
+    )
+    new_request.user = request.user
+    new_request.auth = request.auth
+    return new_request
+
+
+def init_view(view_class, request, query_params=None, **kwargs):
+    """
+    Instantiate an API view for its own copy of an authenticated request.
+
+    The permissions and throttles of the view are checked like `dispatch`
+    would, raising `PermissionDenied`, `NotAuthenticated` or `Throttled`.
+    """
+    view_request = sub_request(request, **(query_params or {}))
+    view = view_class(request=view_request, args=(), kwargs=kwargs, format_kwarg=None)
+    view.headers = {}
+    view.check_permissions(view_request)
+    view.check_throttles(view_request)
+    return view
+
+
+def list_page(view):
+    """
+    Return the objects of the requested page of a list view and its response data.
+    """
+    objects = view.filter_queryset(view.get_queryset())
+    page = view.paginate_queryset(objects)
+    if page is None:
+        return objects, view.get_serializer(objects, many=True).data
+    return page, view.get_paginated_response(view.get_serializer(page, many=True).data).data
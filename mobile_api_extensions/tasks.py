@@ -0,0 +1,233 @@
+"""
+Asynchronous tasks for mobile_api_extensions.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from celery import shared_task
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.monitoring import set_code_owner_attribute
+from opaque_keys.edx.keys import CourseKey
+
+from .site_config import site_request
+from .warming import forget_course_warm, warm_course
+
+log = logging.getLogger(__name__)
+User = get_user_model()
+
+PROGRESS_BATCH_SCHEDULED_KEY = 'mobile_api_extensions.progress_batch_scheduled'
+COURSE_PACKAGE_SCHEDULED_KEY = 'mobile_api_extensions.course_package_scheduled.{}'
+DEACTIVATION_MAX_RETRIES = 5
+
+_executor = None
+
+
+def _get_executor():
+    """
+    Return the process-wide thread pool used when Celery is disabled.
+    """
+    global _executor  # pylint: disable=global-statement
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'MOBILE_API_EXTENSIONS_THREAD_POOL_SIZE', 2),
+            thread_name_prefix='mobile_api_extensions',
+        )
+    return _executor
+
+
+def _run_in_thread(func, *args):
+    """
+    Run `func` in the fallback thread pool with its own database connection and
+    a request cache which does not outlive the task.
+    """
+    close_old_connections()
+    try:
+        func(*args)
+    except Exception:  # pylint: disable=broad-except
+        log.exception(f'Background task {func.__name__} failed.')  # pylint: disable=logging-fstring-interpolation
+    finally:
+        RequestCache.clear_all_namespaces()
+        close_old_connections()
+
+
+def schedule_task(task, *args, **options):
+    """
+    Run `task` with `args` once the current transaction commits.
+
+    The task goes to Celery unless `MOBILE_API_EXTENSIONS_USE_CELERY` is disabled,
+    in which case it is executed by a local thread pool (useful for devstack and
+    deployments without workers). `options` (countdown, queue...) are passed to
+    `apply_async`, the thread pool only honours `countdown`.
+    """
+    if getattr(settings, 'MOBILE_API_EXTENSIONS_USE_CELERY', True):
+        transaction.on_commit(lambda: task.apply_async(args, **options))
+        return
+
+    def submit():
+        _get_executor().submit(_run_in_thread, task, *args)
+
+    countdown = options.get('countdown')
+    if countdown:
+        def start_timer():
+            timer = threading.Timer(countdown, submit)
+            timer.daemon = True
+            timer.start()
+        transaction.on_commit(start_timer)
+    else:
+        transaction.on_commit(submit)
+
+
+def schedule_coalesced_task(cache_key, delay, task, *args, **options):
+    """
+    Run `task` in `delay` seconds unless a run scheduled under `cache_key` is pending.
+
+    Events received before the pending run starts are handled by that run.
+    """
+    if cache.add(cache_key, True, delay):
+        schedule_task(task, *args, countdown=delay, **options)
+
+
+@shared_task
+@set_code_owner_attribute
+def send_activation_email(user_id, site_id=None):
+    """
+    Send the account activation email of `site_id` to a user who has not activated yet.
+    """
+    # Deferred import, the student app is heavy and only needed by the worker.
+    from common.djangoapps.student.models import UserProfile
+    from common.djangoapps.student.views import compose_and_send_activation_email
+
+    try:
+        user = User.objects.get(id=user_id)
+        profile = UserProfile.objects.get(user=user)
+    except (User.DoesNotExist, UserProfile.DoesNotExist):
+        log.exception(f'Could not find UserProfile for user {user_id}')  # pylint: disable=logging-fstring-interpolation
+        return
+
+    if not user.is_active:
+        # The worker has no current request, the email is branded for the site the user signed in on.
+        with site_request(site_id):
+            compose_and_send_activation_email(user, profile)
+
+
+@shared_task
+@set_code_owner_attribute
+def warm_course_caches(course_key_string):
+    """
+    Warm the caches of the mobile course views for a published course.
+    """
+    warm_course(CourseKey.from_string(course_key_string))
+
+
+def schedule_progress_precomputation():
+    """
+    Schedule a `precompute_course_progress` run.
+
+    Score changes received within `MOBILE_PROGRESS_BATCH_DELAY` seconds are
+    coalesced into a single run.
+    """
+    options = {}
+    if getattr(settings, 'MOBILE_PROGRESS_CELERY_QUEUE', None):
+        options['queue'] = settings.MOBILE_PROGRESS_CELERY_QUEUE
+    schedule_coalesced_task(
+        PROGRESS_BATCH_SCHEDULED_KEY,
+        getattr(settings, 'MOBILE_PROGRESS_BATCH_DELAY', 30),
+        precompute_course_progress,
+        **options,
+    )
+
+
+@shared_task
+@set_code_owner_attribute
+def precompute_course_progress():
+    """
+    Compute a batch of stale `MobileCourseProgress` rows, and schedule the next
+    batch while stale rows remain.
+    """
+    # Deferred import, grades are only needed by the worker.
+    from .progress import precompute_progress_batch
+
+    if precompute_progress_batch(getattr(settings, 'MOBILE_PROGRESS_BATCH_SIZE', 100)):
+        cache.delete(PROGRESS_BATCH_SCHEDULED_KEY)
+        schedule_progress_precomputation()
+
+
+def schedule_course_package_build(course_key):
+    """
+    Rebuild the offline package of a course, publishes in quick succession are coalesced.
+    """
+    schedule_coalesced_task(
+        COURSE_PACKAGE_SCHEDULED_KEY.format(course_key),
+        getattr(settings, 'MOBILE_OFFLINE_PACKAGE_BUILD_DELAY', 60),
+        build_course_package,
+        str(course_key),
+    )
+
+
+@shared_task
+@set_code_owner_attribute
+def refresh_published_course(course_key_string):
+    """
+    Precompute the mobile course data and offline package of a course right
+    after it is published, and outdate the precomputed progress if the grading
+    structure changed.
+
+    Sent by the Studio hook, see `studio.signals`.
+    """
+    # Deferred import, the progress module loads the grades machinery.
+    from .progress import outdate_published_course_progress
+
+    course_key = CourseKey.from_string(course_key_string)
+    forget_course_warm(course_key)
+    if getattr(settings, 'MOBILE_WARM_COURSE_CACHES_ON_PUBLISH', True):
+        schedule_task(warm_course_caches, course_key_string)
+    if getattr(settings, 'MOBILE_OFFLINE_PACKAGES_ENABLED', False):
+        schedule_course_package_build(course_key)
+    if getattr(settings, 'MOBILE_PROGRESS_MAX_AGE', None) is not None:
+        if outdate_published_course_progress(course_key):
+            schedule_progress_precomputation()
+
+
+@shared_task
+@set_code_owner_attribute
+def build_course_package(course_key_string):
+    """
+    Build the offline download package of a course.
+    """
+    # Deferred import, the package builder loads the modulestore.
+    from .offline import build_course_package as build_package
+
+    build_package(CourseKey.from_string(course_key_string))
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), max_retries=DEACTIVATION_MAX_RETRIES, retry_backoff=True)
+@set_code_owner_attribute
+def deactivate_account(self, user_id, job_id, site_id=None):
+    """
+    Finish the account deactivation started by the mobile deactivate_logout endpoint.
+    """
+    # Deferred import, the retirement machinery is only needed by the worker.
+    from .retirement import finish_deactivation
+
+    # Runs in the thread pool are not retried.
+    last_attempt = self.request.called_directly or self.request.retries >= self.max_retries
+    finish_deactivation(user_id, job_id, site_id, last_attempt=last_attempt)
+
+
+@shared_task
+@set_code_owner_attribute
+def revoke_user_credentials(user_ids):
+    """
+    Revoke the mobile codes and tokens of users in batches, see `revocation.revoke_mobile_credentials`.
+    """
+    # Deferred import, the OAuth models are only needed by the worker.
+    from .revocation import revoke_mobile_credentials
+
+    # Pause between batches like the revoke_mobile_tokens command.
+    counts = revoke_mobile_credentials(user_ids=user_ids, pause=0.1)
+    log.info('Revoked the mobile credentials of %d users: %s', len(user_ids), counts)
@@ -1,14 +1,97 @@
+import os
 from unittest import mock
 
+import django
 import pytest
+from django.db import connection, models, transaction
+from django.test.utils import override_settings
 from pytest_stub.toolbox import stub_global
 
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mobile_api_extensions.settings.test')
+
+from .platform import PLATFORM_MODULES  # noqa: E402, pylint: disable=wrong-import-position
+
+
+class CourseKeyField(models.CharField):
+    """
+    Stand-in for the opaque_keys field, course keys are stored as strings.
+    """
+
+
+class Application:
+    """
+    Stand-in for the django-oauth-toolkit application model.
+    """
+
+    class DoesNotExist(Exception):
+        pass
+
+
+def shared_task(*args, **kwargs):  # pylint: disable=unused-argument
+    """
+    Stand-in for the Celery task decorator.
+    """
+    if args and callable(args[0]):
+        return args[0]
+    return lambda func: func
+
+
 stub_global(
     {
-        "openedx.core.djangoapps.plugins.constants": "[mock]",
+        "openedx.core.djangoapps.plugins.constants": {"__module__": "[mock_persist]"},
+        "opaque_keys.edx.django.models": {"CourseKeyField": CourseKeyField},
+        "oauth2_provider.models": {
+            "Application": Application,
+            "get_access_token_model": lambda: oauth.AccessToken,
+            "get_refresh_token_model": lambda: oauth.RefreshToken,
+        },
+        # The receivers connect to platform models and signals only.
+        "mobile_api_extensions.signals": {},
+        # Platform modules imported at module level by the plugin helpers, tests
+        # replace the ones they exercise with the `stub` fixture.
+        "crum": {"get_current_request": lambda: None, "set_current_request": lambda request: None},
+        "common.djangoapps.third_party_auth": {"__module__": "[mock_persist]"},
+        "openedx.core.djangoapps.site_configuration": {"__module__": "[mock_persist]"},
+        "edx_django_utils.cache": {"__module__": "[mock_persist]"},
+        "edx_django_utils.monitoring": {
+            "function_trace": lambda name: lambda func: func,
+            "set_code_owner_attribute": lambda func: func,
+            "__module__": "[mock_persist]",
+        },
+        "lms.djangoapps.courseware.courses": {"__module__": "[mock_persist]"},
+        "lms.djangoapps.grades.course_grade_factory": {"__module__": "[mock_persist]"},
+        "xmodule.graders": {"__module__": "[mock_persist]"},
+        "celery": {"shared_task": shared_task, "current_app": mock.Mock()},
+        "opaque_keys.edx.keys": {"__module__": "[mock_persist]"},
+        **PLATFORM_MODULES,
     }
 )
 
+django.setup()
+
+from . import course_overviews, oauth  # noqa: E402, pylint: disable=wrong-import-position
+
+
+@pytest.fixture(scope='session')
+def django_db_setup():
+    """
+    Create the test database, the plugin tables are created from the models.
+    """
+    with override_settings(MIGRATION_MODULES={'mobile_api_extensions': None}):
+        old_name = connection.creation.create_test_db(verbosity=0)
+    yield
+    connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+@pytest.fixture
+def db(django_db_setup):  # pylint: disable=unused-argument
+    """
+    Run the test in a transaction rolled back at the end.
+    """
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
 
 @pytest.fixture
 def json_response():
@@ -0,0 +1,41 @@
+"""
+Stand-ins for the course overview models the catalog reads, their tables are created in the test database.
+"""
+from django.db import models
+
+
+class CourseOverview(models.Model):
+    id = models.CharField(max_length=255, primary_key=True)
+    display_name_with_default_escaped = models.CharField(max_length=255, default='Course')
+    display_org_with_default = models.CharField(max_length=255, default='edX')
+    mobile_available = models.BooleanField(default=True)
+    catalog_visibility = models.CharField(max_length=255, default='both')
+    pacing = models.CharField(max_length=255, default='self')
+
+    display_number_with_default = short_description = effort = None
+    start = end = advertised_start = enrollment_start = enrollment_end = None
+    invitation_only = False
+    course_image_url = course_video_url = None
+
+    class Meta:
+        app_label = 'mobile_api_extensions'
+
+    @property
+    def image_urls(self):
+        return {'raw': f'/{self.id}.png'}
+
+
+class CourseMode(models.Model):
+    course = models.ForeignKey(CourseOverview, related_name='modes', on_delete=models.CASCADE)
+    mode_slug = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = 'mobile_api_extensions'
+
+
+class CourseOverviewImageSet(models.Model):
+    course_overview = models.OneToOneField(CourseOverview, related_name='image_set', on_delete=models.CASCADE)
+    small_url = models.TextField(blank=True, default='')
+
+    class Meta:
+        app_label = 'mobile_api_extensions'
@@ -0,0 +1,32 @@
+"""
+Stand-ins for the django-oauth-toolkit token models, their tables are created in the test database.
+"""
+from django.conf import settings
+from django.db import models
+
+
+class OAuthApplication(models.Model):
+    client_id = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        app_label = 'mobile_api_extensions'
+
+
+class AccessToken(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    application = models.ForeignKey(OAuthApplication, on_delete=models.CASCADE)
+    created = models.DateTimeField()
+
+    class Meta:
+        app_label = 'mobile_api_extensions'
+
+
+class RefreshToken(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    application = models.ForeignKey(OAuthApplication, on_delete=models.CASCADE)
+    access_token = models.OneToOneField(AccessToken, null=True, on_delete=models.SET_NULL)
+    created = models.DateTimeField()
+    revoked = models.DateTimeField(null=True)
+
+    class Meta:
+        app_label = 'mobile_api_extensions'
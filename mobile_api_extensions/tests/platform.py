@@ -0,0 +1,163 @@
+"""
+Stand-ins for the platform views, serializers and helpers the plugin views extend.
+
+They keep the plugin modules importable without edx-platform, tests patch
+the behaviour they exercise.
+"""
+from types import SimpleNamespace
+
+from django.dispatch import Signal
+from rest_framework import serializers
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.generics import ListAPIView
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.viewsets import ViewSet
+
+
+class InvalidKeyError(Exception):
+    pass
+
+
+class CourseAccessRedirect(Exception):
+    pass
+
+
+class PlatformAuthentication(BaseAuthentication):
+
+    def authenticate(self, request):
+        return None
+
+
+class DefaultPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+
+
+def view_auth_classes(is_user=False, is_authenticated=True):  # pylint: disable=unused-argument
+    return lambda view_class: view_class
+
+
+class CourseEnrollmentSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    certificate = serializers.SerializerMethodField()
+
+    def get_certificate(self, model):
+        return {}
+
+
+class CourseEnrollmentSerializerv05(CourseEnrollmentSerializer):  # pylint: disable=abstract-method
+    pass
+
+
+class UserCourseEnrollmentsList(ListAPIView):
+    serializer_class = CourseEnrollmentSerializer
+
+    def get_queryset(self):
+        return []
+
+
+class BlocksInCourseView(ListAPIView):
+
+    def list(self, request, hide_access_denials=False):  # pylint: disable=unused-argument
+        return Response({'blocks': {}})
+
+
+class CourseDetailView(APIView):
+
+    def get(self, request, course_key_string):  # pylint: disable=unused-argument
+        return Response({'id': course_key_string})
+
+
+class CourseSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    id = serializers.CharField()
+    name = serializers.CharField()
+
+
+class CourseListView(ListAPIView):
+    serializer_class = CourseSerializer
+    pagination_class = DefaultPagination
+
+    def get_queryset(self):
+        return []
+
+
+class CommentViewSet(ViewSet):
+    pass
+
+
+def psa(redirect_uri=None):  # pylint: disable=unused-argument
+    return lambda view: view
+
+
+def setting_name(*names):
+    return '_'.join(('SOCIAL_AUTH',) + names)
+
+
+class DeactivateLogoutView(APIView):
+
+    def post(self, request):  # pylint: disable=unused-argument
+        return Response(status=204)
+
+    def _verify_user_password(self, request):  # pylint: disable=unused-argument
+        return Response(status=204)
+
+
+class SignalHandler:
+    course_published = Signal()
+
+
+class FakeRequestCache:
+    """
+    In-memory stand-in for edx_django_utils' RequestCache.
+    """
+    namespaces = {}
+
+    def __init__(self, namespace):
+        self.data = self.namespaces.setdefault(namespace, {})
+
+    def get_cached_response(self, key):
+        is_found = key in self.data
+        value = self.data.get(key)
+        return SimpleNamespace(
+            is_found=is_found,
+            value=value,
+            get_value_or_default=lambda default: value if is_found else default,
+        )
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def clear(self):
+        self.data.clear()
+
+
+PLATFORM_MODULES = {
+    "opaque_keys": {"InvalidKeyError": InvalidKeyError},
+    "common.djangoapps.student.models": {"__module__": "[mock_persist]"},
+    "edx_rest_framework_extensions.auth.jwt.authentication": {"JwtAuthentication": PlatformAuthentication},
+    "edx_rest_framework_extensions.paginators": {"DefaultPagination": DefaultPagination},
+    "lms.djangoapps.course_api.blocks.views": {"BlocksInCourseView": BlocksInCourseView},
+    "lms.djangoapps.course_api.views": {"CourseDetailView": CourseDetailView, "CourseListView": CourseListView},
+    "lms.djangoapps.course_api.forms": {"__module__": "[mock_persist]"},
+    "lms.djangoapps.courseware.exceptions": {"CourseAccessRedirect": CourseAccessRedirect},
+    "lms.djangoapps.discussion.rest_api.views": {"CommentViewSet": CommentViewSet},
+    "lms.djangoapps.mobile_api.users.serializers": {
+        "CourseEnrollmentSerializer": CourseEnrollmentSerializer,
+        "CourseEnrollmentSerializerv05": CourseEnrollmentSerializerv05,
+    },
+    "lms.djangoapps.mobile_api.users.views": {"UserCourseEnrollmentsList": UserCourseEnrollmentsList},
+    "openedx.core.djangoapps.content.course_overviews.models": {"__module__": "[mock_persist]"},
+    "openedx.core.djangoapps.user_api.accounts.serializers": {"__module__": "[mock_persist]"},
+    "openedx.core.djangoapps.user_api.accounts.views": {"DeactivateLogoutView": DeactivateLogoutView},
+    "openedx.core.lib.api.authentication": {"BearerAuthentication": PlatformAuthentication},
+    "openedx.core.lib.api.view_utils": {"view_auth_classes": view_auth_classes},
+    "oauthlib.oauth2.rfc6749.tokens": {"__module__": "[mock_persist]"},
+    "oauth2_provider.settings": {"__module__": "[mock_persist]"},
+    "openedx.core.djangoapps.oauth_dispatch": {"__module__": "[mock_persist]"},
+    "social_core.actions": {"__module__": "[mock_persist]"},
+    "social_core.utils": {"setting_name": setting_name, "__module__": "[mock_persist]"},
+    "social_django.utils": {"psa": psa},
+    "social_django.views": {"__module__": "[mock_persist]"},
+    "xmodule.modulestore.django": {"SignalHandler": SignalHandler},
+}
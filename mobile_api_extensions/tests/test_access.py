@@ -0,0 +1,57 @@
+"""
+Tests for the request-scoped access memoization.
+"""
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from mobile_api_extensions import access
+
+from .platform import FakeRequestCache
+
+
+@pytest.fixture
+def courseware_has_access(stub, mocker):
+    FakeRequestCache.namespaces.clear()
+    mocker.patch.object(access, 'RequestCache', FakeRequestCache)
+    mocker.patch.object(access, 'accumulate')
+    courseware_access = mock.Mock(has_access=mock.Mock(return_value=True))
+    stub.apply({'lms.djangoapps.courseware.access': {'has_access': courseware_access.has_access}})
+    return courseware_access.has_access
+
+
+def test_decisions_are_computed_once_per_request(courseware_has_access):
+    user = SimpleNamespace(id=1)
+    course = SimpleNamespace(id='course-v1:edX+DemoX+Demo_Course')
+
+    assert access.has_access(user, 'load', course)
+    assert access.has_access(user, 'load', course)
+    assert access.has_access(user, 'staff', course)
+    assert access.has_access(SimpleNamespace(id=2), 'load', course)
+
+    assert courseware_has_access.call_count == 3
+    assert access.get_access_check_counts() == {'computed': 3, 'avoided': 1}
+    access.accumulate.assert_called_once_with(access.AVOIDED_CHECKS_ATTRIBUTE, 1)
+
+
+def test_objects_without_id_are_not_memoized(courseware_has_access):
+    user = SimpleNamespace(id=1)
+    block = SimpleNamespace()
+
+    access.has_access(user, 'load', block)
+    access.has_access(user, 'load', block)
+
+    assert courseware_has_access.call_count == 2
+
+
+def test_clear_access_cache(courseware_has_access):
+    user = SimpleNamespace(id=1)
+    course = SimpleNamespace(id='course-v1:edX+DemoX+Demo_Course')
+
+    access.has_access(user, 'load', course)
+    access.clear_access_cache()
+    courseware_has_access.return_value = False
+
+    assert not access.has_access(user, 'load', course)
+    assert access.get_access_check_counts() == {'computed': 1, 'avoided': 0}
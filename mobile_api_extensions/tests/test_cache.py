@@ -0,0 +1,88 @@
+"""
+Tests for the single-flight cache helpers.
+"""
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+
+from mobile_api_extensions.cache import single_flight, single_flight_call
+
+WORKERS = 10
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def run_concurrently(func):
+    """
+    Start `func` in WORKERS threads at once and return their results.
+    """
+    barrier = threading.Barrier(WORKERS)
+    results = [None] * WORKERS
+
+    def worker(index):
+        barrier.wait()
+        results[index] = func()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(WORKERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def slow_counter():
+    """
+    Return a slow compute function and the list recording its calls.
+    """
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return len(calls)
+
+    return compute, calls
+
+
+def test_single_flight_computes_once_for_concurrent_misses():
+    compute, calls = slow_counter()
+
+    results = run_concurrently(lambda: single_flight('key', compute, timeout=60))
+
+    assert len(calls) == 1
+    assert results == [1] * WORKERS
+
+
+def test_single_flight_serves_stale_value_while_recomputing():
+    compute, calls = slow_counter()
+    cache.set('key', (time.time() - 1, 'stale'), 60)
+
+    results = run_concurrently(lambda: single_flight('key', compute, timeout=60))
+
+    assert len(calls) == 1
+    assert results.count(1) == 1
+    assert results.count('stale') == WORKERS - 1
+    assert single_flight('key', compute, timeout=60) == 1
+
+
+def test_single_flight_call_waits_for_the_running_call():
+    events = []
+
+    def warm():
+        events.append('start')
+        time.sleep(0.2)
+        events.append('end')
+
+    run_concurrently(lambda: single_flight_call('key', warm))
+
+    assert events[:2] == ['start', 'end']
+    assert events.count('start') == WORKERS
+    assert cache.get('key.lock') is None
@@ -0,0 +1,132 @@
+"""
+Tests for the shared course catalog.
+"""
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from mobile_api_extensions import catalog, utils
+from mobile_api_extensions.catalog import CatalogEntry, get_catalog, invalidate_catalogs, iter_chunked
+
+
+class FakeCourseQuerySet:
+    """
+    The subset of the course overview queryset API used by `iter_chunked`, recording the loaded chunks.
+    """
+
+    def __init__(self, courses, loaded_chunks, related=True):
+        self.courses = courses
+        self.loaded_chunks = loaded_chunks
+        self.related = related
+
+    def _clone(self, courses, related=None):
+        return FakeCourseQuerySet(courses, self.loaded_chunks, self.related if related is None else related)
+
+    def order_by(self, field):
+        return self._clone(sorted(self.courses, key=lambda course: getattr(course, field)))
+
+    def filter(self, id__gt):
+        return self._clone([course for course in self.courses if course.id > id__gt])
+
+    def prefetch_related(self, *lookups):
+        return self._clone(self.courses, related=lookups != (None,))
+
+    def select_related(self, *fields):
+        return self._clone(self.courses, related=fields != (None,))
+
+    def __getitem__(self, item):
+        chunk = self.courses[item]
+        self.loaded_chunks.append((len(chunk), self.related))
+        return chunk
+
+
+def make_course(course_id):
+    values = {name: None for name in CatalogEntry.__slots__}
+    values.update(id=course_id, pacing='self', catalog_visibility='both', image_urls={'raw': f'/{course_id}.png'})
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    cache.clear()
+    catalog._catalogs.clear()  # pylint: disable=protected-access
+    yield
+    cache.clear()
+    catalog._catalogs.clear()  # pylint: disable=protected-access
+
+
+@pytest.fixture
+def course_queryset():
+    return FakeCourseQuerySet([make_course(course_id) for course_id in (3, 1, 2)], [])
+
+
+def test_iter_chunked_loads_courses_by_chunks(course_queryset):
+    assert [course.id for course in iter_chunked(course_queryset, 2)] == [1, 2, 3]
+    assert course_queryset.loaded_chunks == [(2, True), (1, True)]
+
+
+def test_catalog_is_shared_until_invalidated(course_queryset):
+    entries = get_catalog(('site',), course_queryset)
+    assert [entry.id for entry in entries] == [1, 2, 3]
+    assert get_catalog(('site',), course_queryset) is entries
+
+    invalidate_catalogs()
+    assert get_catalog(('site',), course_queryset) is not entries
+
+
+def test_catalog_entries_are_compact(course_queryset):
+    entry = get_catalog(('site',), course_queryset)[0]
+    assert not hasattr(entry, '__dict__')
+    with pytest.raises(TypeError):
+        entry.image_urls['raw'] = '/other.png'
+
+
+@pytest.fixture
+def courses_platform(stub, mocker, course_queryset):
+    """
+    Serve `course_queryset` as the visible courses, users can see the odd course ids only.
+    """
+    stub.apply({'openedx.core.lib.api.view_utils': {'LazySequence': lambda iterable, est_len: list(iterable)}})
+    mocker.patch.object(utils, '_visible_courses', return_value=course_queryset)
+    mocker.patch.object(utils, 'get_current_site_id', return_value=1)
+    mocker.patch.object(utils, 'get_site_config', return_value=SimpleNamespace(
+        catalog_visibility_permission='see_in_catalog',
+    ))
+    return mocker.patch.object(utils, 'has_access', side_effect=lambda user, permission, course: course.id % 2)
+
+
+def test_get_courses_checks_access_while_building_the_catalog(courses_platform, course_queryset):
+    user = SimpleNamespace(id=1)
+
+    assert [entry.id for entry in utils.get_courses(user)] == [1, 3]
+    assert course_queryset.loaded_chunks == [(3, True)]
+    assert courses_platform.call_count == 3
+
+
+@override_settings(MOBILE_CATALOG_CHUNK_SIZE=500)
+def test_get_courses_caches_the_accessible_ids(courses_platform, course_queryset):
+    utils.get_courses(SimpleNamespace(id=1))
+    courses_platform.reset_mock()
+    course_queryset.loaded_chunks.clear()
+
+    assert [entry.id for entry in utils.get_courses(SimpleNamespace(id=1))] == [1, 3]
+    assert course_queryset.loaded_chunks == []
+    courses_platform.assert_not_called()
+
+    # Another user checks access on overviews loaded without their modes and image sets.
+    assert [entry.id for entry in utils.get_courses(SimpleNamespace(id=2))] == [1, 3]
+    assert course_queryset.loaded_chunks == [(3, False)]
+    assert courses_platform.call_count == 3
+
+
+def test_get_courses_checks_access_again_when_the_catalog_changes(courses_platform, course_queryset):
+    user = SimpleNamespace(id=1)
+    utils.get_courses(user)
+
+    invalidate_catalogs()
+    course_queryset.courses.append(make_course(5))
+
+    assert [entry.id for entry in utils.get_courses(user)] == [1, 3, 5]
+    assert courses_platform.call_count == 3 + 4
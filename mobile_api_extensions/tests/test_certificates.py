@@ -0,0 +1,87 @@
+"""
+Tests for the bulk certificate download URLs.
+"""
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from mobile_api_extensions import certificates
+
+CERTIFICATES = [
+    {'course_id': 'course-v1:edX+PDF+1', 'download_url': 'https://certs.example.com/pdf.pdf', 'verify_uuid': 'a'},
+    {'course_id': 'course-v1:edX+HTML+1', 'download_url': '', 'verify_uuid': 'b'},
+    {'course_id': 'course-v1:edX+Hidden+1', 'download_url': 'https://certs.example.com/hidden.pdf', 'verify_uuid': 'c'},
+    {'course_id': 'course-v1:edX+NoView+1', 'download_url': '', 'verify_uuid': 'd'},
+    {'course_id': 'course-v1:edX+Deleted+1', 'download_url': 'https://certs.example.com/gone.pdf', 'verify_uuid': 'e'},
+]
+
+
+def course_overview(course_id, viewable=True, html_certificates=False):
+    return SimpleNamespace(id=course_id, viewable=viewable, html_certificates=html_certificates)
+
+
+@pytest.fixture
+def platform(stub, mocker):
+    """
+    Stub the certificate and course overview models, returns their managers.
+    """
+    cache.clear()
+    generated_certificates = mock.Mock()
+    generated_certificates.filter.return_value.values.return_value = CERTIFICATES
+    course_overviews = mock.Mock()
+    course_overviews.filter.return_value = [
+        course_overview('course-v1:edX+PDF+1'),
+        course_overview('course-v1:edX+HTML+1', html_certificates=True),
+        course_overview('course-v1:edX+Hidden+1', viewable=False),
+        course_overview('course-v1:edX+NoView+1'),
+    ]
+    stub.apply({
+        'lms.djangoapps.certificates.api': {
+            'certificates_viewable_for_course': lambda course: course.viewable,
+            'has_html_certificates_enabled': lambda course: course.html_certificates,
+        },
+        'lms.djangoapps.certificates.data': {'CertificateStatuses': SimpleNamespace(downloadable='downloadable')},
+        'lms.djangoapps.certificates.models': {
+            'GeneratedCertificate': SimpleNamespace(eligible_certificates=generated_certificates),
+        },
+        'openedx.core.djangoapps.content.course_overviews.models': {
+            'CourseOverview': SimpleNamespace(objects=course_overviews),
+        },
+    })
+    mocker.patch.object(
+        certificates, 'reverse', side_effect=lambda name, kwargs: f'/certificates/{kwargs["certificate_uuid"]}'
+    )
+    yield SimpleNamespace(generated_certificates=generated_certificates, course_overviews=course_overviews)
+    cache.clear()
+
+
+def test_download_urls_are_resolved_in_bulk(platform):
+    user = SimpleNamespace(id=1, is_authenticated=True)
+
+    assert certificates.get_certificate_download_urls(user) == {
+        'course-v1:edX+PDF+1': 'https://certs.example.com/pdf.pdf',
+        'course-v1:edX+HTML+1': '/certificates/b',
+    }
+    platform.generated_certificates.filter.assert_called_once_with(user=user, status='downloadable')
+    platform.course_overviews.filter.assert_called_once_with(
+        id__in=[certificate['course_id'] for certificate in CERTIFICATES]
+    )
+
+
+def test_download_urls_are_cached_until_invalidated(platform):
+    user = SimpleNamespace(id=1, is_authenticated=True)
+
+    certificates.get_certificate_download_urls(user)
+    certificates.get_certificate_download_urls(user)
+    assert platform.generated_certificates.filter.call_count == 1
+
+    certificates.invalidate_certificate_download_urls(user.id)
+    certificates.get_certificate_download_urls(user)
+    assert platform.generated_certificates.filter.call_count == 2
+
+
+def test_anonymous_users_have_no_certificates(platform):
+    assert certificates.get_certificate_download_urls(SimpleNamespace(is_authenticated=False)) == {}
+    platform.generated_certificates.filter.assert_not_called()
@@ -0,0 +1,65 @@
+"""
+Tests for the authorization code exchange form.
+"""
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from mobile_api_extensions.forms import AuthorizationCodeExchangeForm
+from mobile_api_extensions.models import MobileUserAuth
+
+User = get_user_model()
+AUTHORIZATION_CODE = '0123456789abcdef0123456789abcdef'
+
+
+def exchange_form(**data):
+    adapter = mock.Mock()
+    return AuthorizationCodeExchangeForm(request=None, oauth2_adapter=adapter, data=data), adapter
+
+
+@pytest.mark.parametrize('authorization_code', ['', 'abc', 'g' * 32, AUTHORIZATION_CODE.upper()])
+def test_malformed_authorization_code(authorization_code):
+    form, __ = exchange_form(authorization_code=authorization_code, client_id='mobile-app')
+    with mock.patch.object(AuthorizationCodeExchangeForm, 'clean', lambda self: self.cleaned_data):
+        assert not form.is_valid()
+    assert 'authorization_code' in form.errors
+
+
+@pytest.mark.parametrize('client_id', ['', 'client id', 'client/id', 'c' * 101])
+def test_malformed_client_id(client_id):
+    form, __ = exchange_form(authorization_code=AUTHORIZATION_CODE, client_id=client_id)
+    with mock.patch.object(AuthorizationCodeExchangeForm, 'clean', lambda self: self.cleaned_data):
+        assert not form.is_valid()
+    assert list(form.errors) == ['client_id']
+
+
+def test_malformed_values_skip_the_lookups(db):  # pylint: disable=unused-argument
+    form, adapter = exchange_form(authorization_code='abc', client_id='client id')
+    with CaptureQueriesContext(connection) as queries:
+        assert not form.is_valid()
+    assert set(form.errors) == {'authorization_code', 'client_id'}
+    assert not adapter.get_client.called
+    assert len(queries) == 0
+
+
+def test_malformed_client_id_only_skips_the_client_lookup(db):  # pylint: disable=unused-argument
+    form, adapter = exchange_form(authorization_code=AUTHORIZATION_CODE, client_id='client id')
+    with CaptureQueriesContext(connection) as queries:
+        assert not form.is_valid()
+    assert set(form.errors) == {'authorization_code', 'client_id'}
+    assert "Can't find user" in form.errors['authorization_code'][0]
+    assert not adapter.get_client.called
+    assert len(queries) == 1
+
+
+def test_valid_exchange(db):  # pylint: disable=unused-argument
+    user = User.objects.create(username='learner')
+    MobileUserAuth.objects.create(user=user, authorization_code=AUTHORIZATION_CODE)
+    form, adapter = exchange_form(authorization_code=AUTHORIZATION_CODE, client_id='mobile-app')
+    assert form.is_valid(), form.errors
+    assert form.cleaned_data['user'] == user
+    assert form.cleaned_data['client'] is adapter.get_client.return_value
+    adapter.get_client.assert_called_once_with(client_id='mobile-app')
@@ -0,0 +1,130 @@
+"""
+Tests for the Prometheus metrics, `prometheus_client` is replaced by mocks.
+"""
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+
+from mobile_api_extensions import metrics
+
+METRIC_NAMES = (
+    'REQUEST_LATENCY', 'RESPONSE_SIZE', 'ACCESS_CHECKS', 'CACHE_REQUESTS', 'SSO_COMPLETIONS', 'CODE_EXCHANGES',
+)
+
+
+@pytest.fixture
+def prometheus(mocker):
+    """
+    Replace `prometheus_client` and the plugin metrics with mocks, returns the metrics.
+    """
+    client = mocker.patch.object(metrics, 'prometheus_client', create=True)
+    client.generate_latest.return_value = b'metrics'
+    client.CONTENT_TYPE_LATEST = 'text/plain; version=0.0.4'
+    for name in METRIC_NAMES:
+        mocker.patch.object(metrics, name, create=True)
+    return SimpleNamespace(client=client, **{name: getattr(metrics, name) for name in METRIC_NAMES})
+
+
+@override_settings(MOBILE_METRICS_ENABLED=False)
+def test_record_helpers_are_noops_when_disabled(prometheus):
+    metrics.record_cache('catalog', 'hit')
+    metrics.record_sso_completion('tpa-saml', 'success')
+    metrics.record_code_exchange('success')
+
+    prometheus.CACHE_REQUESTS.labels.assert_not_called()
+    prometheus.SSO_COMPLETIONS.labels.assert_not_called()
+    prometheus.CODE_EXCHANGES.labels.assert_not_called()
+
+
+@override_settings(MOBILE_METRICS_ENABLED=True)
+def test_record_helpers(prometheus):
+    metrics.record_cache('catalog', 'hit')
+    metrics.record_sso_completion('tpa-saml', 'success')
+    metrics.record_code_exchange('success')
+
+    prometheus.CACHE_REQUESTS.labels.assert_called_once_with('catalog', 'hit')
+    prometheus.CACHE_REQUESTS.labels.return_value.inc.assert_called_once_with()
+    prometheus.SSO_COMPLETIONS.labels.assert_called_once_with('tpa-saml', 'success')
+    prometheus.CODE_EXCHANGES.labels.assert_called_once_with('success')
+
+
+@override_settings(MOBILE_METRICS_ENABLED=True)
+def test_metrics_are_disabled_without_prometheus_client(mocker):
+    mocker.patch.object(metrics, 'prometheus_client', None)
+    assert not metrics.is_enabled()
+    metrics.record_cache('catalog', 'hit')
+
+
+@override_settings(MOBILE_METRICS_ENABLED=False)
+def test_middleware_is_not_used_when_disabled(prometheus):  # pylint: disable=unused-argument
+    with pytest.raises(MiddlewareNotUsed):
+        metrics.MobileMetricsMiddleware(lambda request: HttpResponse())
+
+
+@override_settings(MOBILE_METRICS_ENABLED=True, MOBILE_METRICS_PATH_PREFIXES=('/mobile_api_extensions/',))
+def test_middleware_records_plugin_requests(prometheus, mocker):
+    mocker.patch('mobile_api_extensions.access.get_access_check_counts', return_value={'computed': 2, 'avoided': 1})
+    middleware = metrics.MobileMetricsMiddleware(lambda request: HttpResponse(b'12345', status=201))
+    request = RequestFactory().get('/mobile_api_extensions/v1/courses/')
+    request.resolver_match = SimpleNamespace(url_name='course-list')
+
+    assert middleware(request).status_code == 201
+
+    prometheus.REQUEST_LATENCY.labels.assert_called_once_with('course-list', 'GET', 201)
+    prometheus.REQUEST_LATENCY.labels.return_value.observe.assert_called_once()
+    prometheus.RESPONSE_SIZE.labels.return_value.observe.assert_called_once_with(5)
+    prometheus.ACCESS_CHECKS.labels.assert_has_calls([
+        mock.call('course-list', 'computed'), mock.call().observe(2),
+        mock.call('course-list', 'avoided'), mock.call().observe(1),
+    ])
+
+
+@override_settings(MOBILE_METRICS_ENABLED=True, MOBILE_METRICS_PATH_PREFIXES=('/mobile_api_extensions/',))
+def test_middleware_skips_other_paths_and_streamed_bodies(prometheus, mocker):
+    mocker.patch('mobile_api_extensions.access.get_access_check_counts', return_value={})
+    middleware = metrics.MobileMetricsMiddleware(lambda request: StreamingHttpResponse(iter([b'{}'])))
+
+    middleware(RequestFactory().get('/courses/'))
+    prometheus.REQUEST_LATENCY.labels.assert_not_called()
+
+    middleware(RequestFactory().get('/mobile_api_extensions/v1/courses/'))
+    prometheus.REQUEST_LATENCY.labels.assert_called_once_with('unknown', 'GET', 200)
+    prometheus.RESPONSE_SIZE.labels.assert_not_called()
+
+
+@override_settings(MOBILE_METRICS_ENABLED=True, MOBILE_METRICS_ENDPOINT=True, MOBILE_METRICS_TOKEN='secret')
+@pytest.mark.parametrize('headers, user, status_code', [
+    ({'HTTP_AUTHORIZATION': 'Bearer secret'}, None, 200),
+    ({}, SimpleNamespace(is_authenticated=True, is_staff=True), 200),
+    ({}, None, 403),
+    ({'HTTP_AUTHORIZATION': 'Bearer wrong'}, None, 403),
+    ({'HTTP_AUTHORIZATION': 'Basic secret'}, None, 403),
+    ({}, SimpleNamespace(is_authenticated=True, is_staff=False), 403),
+])
+def test_metrics_view_access(prometheus, headers, user, status_code):
+    request = RequestFactory().get('/mobile_api_extensions/metrics/', **headers)
+    if user is not None:
+        request.user = user
+
+    response = metrics.metrics_view(request)
+
+    assert response.status_code == status_code
+    if status_code == 200:
+        assert response.content == b'metrics'
+        prometheus.client.generate_latest.assert_called_once_with(prometheus.client.REGISTRY)
+
+
+@override_settings(MOBILE_METRICS_ENABLED=True, MOBILE_METRICS_ENDPOINT=True, MOBILE_METRICS_TOKEN=None)
+def test_metrics_view_without_token_rejects_bearer_requests(prometheus):  # pylint: disable=unused-argument
+    request = RequestFactory().get('/mobile_api_extensions/metrics/', HTTP_AUTHORIZATION='Bearer ')
+    assert metrics.metrics_view(request).status_code == 403
+
+
+@override_settings(MOBILE_METRICS_ENABLED=True, MOBILE_METRICS_ENDPOINT=False)
+def test_metrics_view_is_hidden_when_disabled(prometheus):  # pylint: disable=unused-argument
+    with pytest.raises(Http404):
+        metrics.metrics_view(RequestFactory().get('/mobile_api_extensions/metrics/'))
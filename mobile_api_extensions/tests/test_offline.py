@@ -0,0 +1,149 @@
+"""
+Tests for the offline course packages.
+"""
+import json
+import zipfile
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from mobile_api_extensions import offline
+from mobile_api_extensions.models import MobileCoursePackage
+
+COURSE_ID = 'course-v1:edX+DemoX+Demo_Course'
+
+COURSE_BLOCKS = {
+    'course': {'type': 'course', 'display_name': 'Demo', 'children': ['week1', 'staff_notes']},
+    'week1': {'type': 'chapter', 'display_name': 'Week 1', 'children': ['video1']},
+    'video1': {'type': 'video', 'display_name': 'Intro', 'student_view_data': {'duration': 60}},
+    'staff_notes': {'type': 'chapter', 'display_name': 'Staff notes', 'children': ['answers'],
+                    'visible_to_staff_only': True},
+    'answers': {'type': 'video', 'display_name': 'Answers', 'student_view_data': {'duration': 30}},
+}
+
+
+def get_blocks(request, usage_key, user=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Return the blocks the Course Blocks API serves to `user`, dropping the staff
+    only subtrees like the visibility transformer does.
+    """
+    blocks = {}
+    block_ids = ['course']
+    while block_ids:
+        block_id = block_ids.pop()
+        block = COURSE_BLOCKS[block_id]
+        if block.get('visible_to_staff_only') and user is not None and not user.is_staff:
+            continue
+        blocks[block_id] = {key: value for key, value in block.items() if key != 'visible_to_staff_only'}
+        blocks[block_id]['id'] = block_id
+        block_ids.extend(block.get('children', []))
+    for block in blocks.values():
+        if 'children' in block:
+            block['children'] = [child for child in block['children'] if child in blocks]
+    return {'root': 'course', 'blocks': blocks}
+
+
+@pytest.fixture
+def next_release():
+    return timezone.now() + timedelta(days=7)
+
+
+@pytest.fixture
+def platform(stub, next_release):
+    """
+    Stub the Course Blocks API, the modulestore and the contentstore.
+    """
+    blocks_api = mock.Mock(get_blocks=mock.Mock(side_effect=get_blocks))
+    store = mock.MagicMock()
+    store.get_items.return_value = [
+        SimpleNamespace(start=timezone.now() - timedelta(days=1)),
+        SimpleNamespace(start=next_release + timedelta(days=7)),
+        SimpleNamespace(start=next_release),
+    ]
+    assets = [
+        {'asset_key': '/asset/handout.pdf', 'displayname': 'handout.pdf', 'contentType': 'application/pdf'},
+        {'asset_key': '/asset/exam.pdf', 'displayname': 'exam.pdf', 'contentType': 'application/pdf', 'locked': True},
+    ]
+    stub.apply({
+        'lms.djangoapps.course_api.blocks.api': {'get_blocks': blocks_api.get_blocks},
+        'xmodule.modulestore': {'ModuleStoreEnum': mock.Mock()},
+        'xmodule.modulestore.django': {'modulestore': lambda: store},
+        'xmodule.contentstore.content': {'StaticContent': mock.Mock(serialize_asset_key_with_slash=str)},
+        'xmodule.contentstore.django': {
+            'contentstore': lambda: mock.Mock(get_all_content_for_course=mock.Mock(return_value=(assets, 2))),
+        },
+    })
+    return blocks_api
+
+
+@override_settings(LMS_BASE='lms.example.com', MOBILE_OFFLINE_PACKAGE_STUDENT_VIEW_DATA=['video'])
+def test_package_content_is_what_every_learner_sees(platform):
+    content = offline.collect_course_content(COURSE_ID)
+
+    assert [block['id'] for block in content['outline']] == ['course', 'week1', 'video1']
+    assert content['outline'][0]['children'] == ['week1']
+    assert content['student_views'] == {'video1': {'duration': 60}}
+    assert [asset['name'] for asset in content['assets']] == ['handout.pdf']
+
+    call_kwargs = platform.get_blocks.call_args[1]
+    assert not call_kwargs['user'].is_staff
+    assert call_kwargs['hide_access_denials'] is True
+    assert call_kwargs['student_view_data'] == ['video']
+
+
+@override_settings(
+    LMS_BASE='lms.example.com',
+    MOBILE_OFFLINE_PACKAGE_STUDENT_VIEW_DATA=['video'],
+    MOBILE_OFFLINE_PACKAGE_STORAGE='django.core.files.storage.FileSystemStorage',
+    MOBILE_OFFLINE_PACKAGE_DIR='packages',
+)
+def test_build_course_package(platform, next_release, tmp_path, db):  # pylint: disable=unused-argument
+    with override_settings(MEDIA_ROOT=str(tmp_path)):
+        package = offline.build_course_package(COURSE_ID)
+        assert package.expires == next_release
+        with zipfile.ZipFile(tmp_path / package.file_name) as archive:
+            outline = json.loads(archive.read('outline.json'))
+            manifest = json.loads(archive.read('manifest.json'))
+        assert 'staff_notes' not in {block['id'] for block in outline}
+        assert manifest['version'] == package.version
+        assert manifest['format'] == offline.PACKAGE_FORMAT
+
+        assert offline.build_course_package(COURSE_ID).file_name == package.file_name
+
+
+def test_expired_package_is_rebuilt(mocker, db):  # pylint: disable=unused-argument
+    schedule_build = mocker.patch.object(offline, 'schedule_course_package_build')
+    package = MobileCoursePackage.objects.create(
+        course_id=COURSE_ID, version='v1', file_name='v1.zip', size=10, expires=timezone.now() + timedelta(hours=1)
+    )
+    assert offline.get_course_package(COURSE_ID) == package
+    schedule_build.assert_not_called()
+
+    MobileCoursePackage.objects.filter(pk=package.pk).update(expires=timezone.now() - timedelta(hours=1))
+    assert offline.get_course_package(COURSE_ID) == package
+    schedule_build.assert_called_once_with(COURSE_ID)
+
+
+@pytest.mark.parametrize('range_header, expected', [
+    (None, None),
+    ('bytes=0-9', (0, 9)),
+    ('bytes=90-', (90, 99)),
+    ('bytes=-10', (90, 99)),
+    ('bytes=-500', (0, 99)),
+    ('bytes=50-500', (50, 99)),
+    ('bytes=-', None),
+    ('bytes=0-9,20-29', None),
+    ('items=0-9', None),
+])
+def test_parse_range(range_header, expected):
+    assert offline.parse_range(range_header, 100) == expected
+
+
+@pytest.mark.parametrize('range_header', ['bytes=100-', 'bytes=20-10'])
+def test_parse_range_unsatisfiable(range_header):
+    with pytest.raises(ValueError):
+        offline.parse_range(range_header, 100)
@@ -0,0 +1,91 @@
+"""
+Tests for the profiling middleware.
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from mobile_api_extensions import profiling
+from mobile_api_extensions.profiling import MobileProfilingMiddleware
+
+
+@pytest.fixture
+def profiling_dir(tmp_path):
+    with override_settings(
+        MOBILE_PROFILING_DIR=str(tmp_path),
+        MOBILE_PROFILING_SAMPLE_RATE=0,
+        MOBILE_PROFILING_PATH_PREFIXES=('/mobile_api_extensions/',),
+        MOBILE_PROFILING_HEADER='X-Mobile-Profile',
+        MOBILE_PROFILING_SECRET='s3cret',
+    ):
+        yield tmp_path
+
+
+def profile(user, header_value=None, view=lambda: None):
+    headers = {} if header_value is None else {'HTTP_X_MOBILE_PROFILE': header_value}
+    request = RequestFactory().get('/mobile_api_extensions/v1/app_launch/', **headers)
+    request.user = user
+    return MobileProfilingMiddleware(lambda request: view() or HttpResponse('ok'))(request)
+
+
+def staff_user(is_staff):
+    return SimpleNamespace(id=1, is_authenticated=True, is_staff=is_staff)
+
+
+@pytest.mark.parametrize('user, header_value', [
+    (AnonymousUser(), None),
+    (AnonymousUser(), '1'),
+    (AnonymousUser(), 's3cre'),
+    (staff_user(False), '1'),
+])
+def test_requests_are_not_profiled_without_authorization(profiling_dir, user, header_value):
+    assert profile(user, header_value).content == b'ok'
+    assert not list(profiling_dir.iterdir())
+
+
+@pytest.mark.parametrize('user, header_value', [
+    (AnonymousUser(), 's3cret'),
+    (staff_user(True), '1'),
+])
+def test_authorized_requests_are_profiled(profiling_dir, user, header_value):
+    assert profile(user, header_value).content == b'ok'
+    assert sorted(path.suffix for path in profiling_dir.iterdir()) == ['.json', '.prof']
+
+
+def test_staff_session_needs_the_header(profiling_dir):
+    profile(staff_user(True))
+    assert not list(profiling_dir.iterdir())
+
+
+@pytest.fixture
+def replica(mocker):
+    replica_connection = DatabaseWrapper({**connection.settings_dict, 'NAME': ':memory:'}, alias='replica')
+    mocker.patch.object(profiling, 'connections', {'default': connection, 'replica': replica_connection})
+    yield replica_connection
+    replica_connection.close()
+
+
+def run_queries(replica):
+    for database in (connection, replica):
+        with database.cursor() as cursor:
+            cursor.execute('SELECT %s', ['secret-email@example.com'])
+
+
+@pytest.mark.usefixtures('db')
+@pytest.mark.parametrize('with_params', [False, True])
+def test_queries_of_every_database_are_stored(profiling_dir, replica, with_params):
+    with override_settings(MOBILE_PROFILING_SQL_PARAMS=with_params):
+        profile(AnonymousUser(), 's3cret', view=lambda: run_queries(replica))
+
+    stored = json.loads(next(profiling_dir.glob('*.json')).read_text())
+    assert stored['query_count'] == 2
+    assert [(query['database'], query['sql']) for query in stored['queries']] == [
+        ('default', 'SELECT %s'), ('replica', 'SELECT %s'),
+    ]
+    assert ('secret-email@example.com' in json.dumps(stored)) == with_params
@@ -0,0 +1,141 @@
+"""
+Tests for the precomputed course progress.
+"""
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.utils import timezone
+
+from mobile_api_extensions import progress
+from mobile_api_extensions.models import MobileCourseProgress
+
+COURSE_ID = 'course-v1:edX+DemoX+Demo_Course'
+
+
+@pytest.fixture
+def clock():
+    return SimpleNamespace(now=timezone.now())
+
+
+@pytest.fixture
+def grades(mocker, clock):
+    """
+    Stub the grades of a course with one subsection due in an hour, whose
+    scores are shown once it is past due.
+    """
+    subsection = SimpleNamespace(
+        all_total=SimpleNamespace(earned=1.0, possible=2.0),
+        percent_graded=0.5,
+        display_name='Homework 1',
+        problem_scores={'problem': SimpleNamespace(earned=1.0, possible=2.0)},
+        due=clock.now + timedelta(hours=1),
+        show_correctness='past_due',
+        graded=True,
+        format='Homework',
+    )
+    course_grade = SimpleNamespace(chapter_grades={'chapter': {'display_name': 'Week 1', 'sections': [subsection]}})
+    grade_factory = mock.Mock(read=mock.Mock(return_value=course_grade))
+    mocker.patch.object(progress, 'CourseGradeFactory', return_value=grade_factory)
+    mocker.patch.object(progress, 'get_course_by_id', side_effect=lambda course_key: SimpleNamespace(id=course_key))
+    mocker.patch.object(progress, 'has_access', return_value=False)
+    mocker.patch.object(progress.ShowCorrectness, 'correctness_available', side_effect=(
+        lambda show_correctness, due, staff_access: staff_access or due is None or due < clock.now
+    ))
+    return subsection
+
+
+@pytest.fixture
+def user(db):  # pylint: disable=unused-argument
+    return get_user_model().objects.create(username='learner')
+
+
+def precompute(user):
+    MobileCourseProgress.objects.create(user=user, course_id=COURSE_ID)
+    assert not progress.precompute_progress_batch(10)
+
+
+@override_settings(MOBILE_PROGRESS_MAX_AGE=3600)
+def test_precomputed_progress_matches_live_progress(grades, user):  # pylint: disable=unused-argument
+    precompute(user)
+    course = SimpleNamespace(id=COURSE_ID)
+    assert progress.get_precomputed_progress(user, course) == progress.get_progress_sections(user, course)
+    assert progress.get_precomputed_progress(user, course) == [{
+        'display_name': 'Week 1',
+        'subsections': [{
+            'earned': 1.0,
+            'total': 2.0,
+            'percentageString': '50%',
+            'display_name': 'Homework 1',
+            'score': [{'earned': 1.0, 'possible': 2.0}],
+            'graded': True,
+            'grade_type': 'Homework',
+            'show_grades': False,
+        }],
+    }]
+
+
+@override_settings(MOBILE_PROGRESS_MAX_AGE=24 * 3600)
+def test_show_grades_is_computed_when_the_progress_is_read(grades, user, clock):  # pylint: disable=unused-argument
+    precompute(user)
+    course = SimpleNamespace(id=COURSE_ID)
+    assert progress.get_precomputed_progress(user, course)[0]['subsections'][0]['show_grades'] is False
+
+    clock.now += timedelta(hours=2)
+    assert progress.get_precomputed_progress(user, course)[0]['subsections'][0]['show_grades'] is True
+
+
+@override_settings(MOBILE_PROGRESS_MAX_AGE=3600)
+def test_show_grades_follows_staff_access(grades, user):  # pylint: disable=unused-argument
+    precompute(user)
+    progress.has_access.return_value = True
+    course = SimpleNamespace(id=COURSE_ID)
+    assert progress.get_precomputed_progress(user, course)[0]['subsections'][0]['show_grades'] is True
+
+
+@override_settings(MOBILE_PROGRESS_MAX_AGE=3600)
+def test_stale_progress_is_not_served(grades, user):  # pylint: disable=unused-argument
+    precompute(user)
+    MobileCourseProgress.mark_stale(user.id, COURSE_ID)
+    assert progress.get_precomputed_progress(user, SimpleNamespace(id=COURSE_ID)) is None
+
+
+def block(location, children=(), **fields):
+    return SimpleNamespace(location=location, display_name=location, get_children=lambda: list(children), **fields)
+
+
+@pytest.fixture
+def published_course(mocker):
+    """
+    Stub a course with one chapter holding a graded subsection of one problem.
+    """
+    problem = block('problem', has_score=True, weight=1.0)
+    subsection = block(
+        'subsection', [block('unit', [problem])], due=None, show_correctness='always', graded=True, format='Homework',
+    )
+    course = block('course', [block('chapter', [subsection])], grading_policy={'GRADER': [], 'GRADE_CUTOFFS': {}})
+    mocker.patch.object(progress, 'get_course_by_id', return_value=course)
+    return SimpleNamespace(course=course, subsection=subsection, problem=problem)
+
+
+def test_publish_outdates_progress_only_when_the_grading_changes(published_course, user):
+    precomputed = MobileCourseProgress.objects.create(user=user, course_id=COURSE_ID, is_stale=False)
+
+    def is_outdated():
+        outdated = progress.outdate_published_course_progress(COURSE_ID)
+        assert MobileCourseProgress.objects.get(pk=precomputed.pk).is_stale == outdated
+        MobileCourseProgress.objects.update(is_stale=False)
+        return outdated
+
+    assert is_outdated()
+    assert not is_outdated()
+    published_course.problem.weight = 2.0
+    assert is_outdated()
+    published_course.subsection.format = 'Exam'
+    assert is_outdated()
+    published_course.course.grading_policy['GRADE_CUTOFFS'] = {'Pass': 0.5}
+    assert is_outdated()
+    assert not is_outdated()
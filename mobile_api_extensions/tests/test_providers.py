@@ -0,0 +1,95 @@
+"""
+Tests for the memoized third party auth lookups.
+"""
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+
+from mobile_api_extensions import providers
+
+
+@pytest.fixture(autouse=True)
+def clear_provider_cache():
+    providers.clear_provider_cache()
+    yield
+    providers.clear_provider_cache()
+
+
+@pytest.fixture
+def registry(stub):
+    """
+    Stub the third party auth provider registry and pipeline.
+    """
+    registry = mock.Mock()
+    registry.get_from_pipeline.side_effect = lambda running_pipeline: object()
+    pipeline = mock.Mock()
+    pipeline._get_url.side_effect = (
+        lambda name, backend_name, extra_params: f'/auth/login/{backend_name}/?idp={extra_params.get("idp")}'
+    )
+    stub.apply({
+        'common.djangoapps.third_party_auth': {'provider': mock.Mock(Registry=registry), 'pipeline': pipeline},
+        'common.djangoapps.third_party_auth.lti': {'LTI_PARAMS_KEY': 'tpa-lti-params'},
+    })
+    return registry
+
+
+@pytest.fixture
+def site_id():
+    with mock.patch('mobile_api_extensions.providers.get_current_site_id', return_value=1) as get_current_site_id:
+        yield get_current_site_id
+
+
+def lti_pipeline(consumer_key):
+    return {'backend': 'lti', 'kwargs': {'response': {'tpa-lti-params': {'oauth_consumer_key': consumer_key}}}}
+
+
+def test_provider_is_memoized(registry, site_id):  # pylint: disable=unused-argument
+    running_pipeline = {'backend': 'tpa-saml', 'kwargs': {'response': {'idp_name': 'idp'}}}
+    provider = providers.get_provider_from_pipeline(running_pipeline)
+    assert providers.get_provider_from_pipeline(running_pipeline) is provider
+    assert registry.get_from_pipeline.call_count == 1
+
+
+def test_lti_providers_are_keyed_by_consumer_key(registry, site_id):  # pylint: disable=unused-argument
+    first = providers.get_provider_from_pipeline(lti_pipeline('consumer-1'))
+    second = providers.get_provider_from_pipeline(lti_pipeline('consumer-2'))
+    assert first is not second
+    assert providers.get_provider_from_pipeline(lti_pipeline('consumer-1')) is first
+
+
+def test_providers_are_keyed_by_site(registry, site_id):  # pylint: disable=unused-argument
+    running_pipeline = {'backend': 'google-oauth2', 'kwargs': {'response': {}}}
+    first = providers.get_provider_from_pipeline(running_pipeline)
+    site_id.return_value = 2
+    assert providers.get_provider_from_pipeline(running_pipeline) is not first
+
+
+@override_settings(MOBILE_SSO_DEEPLINK='openedx://sso')
+def test_login_url_of_enabled_idp_is_cached(registry, site_id):  # pylint: disable=unused-argument
+    registry.get.return_value = object()
+    url = providers.get_mobile_login_url('tpa-saml', idp='known')
+    assert url == '/auth/login/tpa-saml/?idp=known'
+    registry.get.assert_called_once_with('saml-known')
+    assert providers.get_mobile_login_url('tpa-saml', idp='known') == url
+    registry.get.assert_called_once_with('saml-known')
+
+
+@override_settings(MOBILE_SSO_DEEPLINK='openedx://sso')
+def test_login_url_of_unknown_idp_is_not_cached(registry, site_id):  # pylint: disable=unused-argument
+    registry.get.return_value = None
+    assert providers.get_mobile_login_url('tpa-saml', idp='unknown') == '/auth/login/tpa-saml/?idp=unknown'
+    providers.get_mobile_login_url('tpa-saml', idp='unknown')
+    assert registry.get.call_count == 2
+    assert not providers._login_url_cache._data  # pylint: disable=protected-access
+
+
+def test_providers_of_other_processes_are_dropped(registry, site_id):  # pylint: disable=unused-argument
+    running_pipeline = {'backend': 'tpa-saml', 'kwargs': {'response': {'idp_name': 'idp'}}}
+    provider = providers.get_provider_from_pipeline(running_pipeline)
+
+    # Another process saved a provider configuration, the process memory of this one is untouched.
+    providers.cache.set(providers.PROVIDER_CACHE_VERSION_KEY, 'other-process')
+
+    assert providers.get_provider_from_pipeline(running_pipeline) is not provider
+    assert registry.get_from_pipeline.call_count == 2
@@ -0,0 +1,258 @@
+"""
+Tests for the query budget helpers and the budgets of the plugin views.
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from mobile_api_extensions import access, api, catalog, query_budget as query_budget_module, utils, views
+from mobile_api_extensions.models import MobileCourseProgress, MobileUserAuth
+from mobile_api_extensions.query_budget import QueryBudgetWarning, assert_query_budget, query_budget
+
+from .course_overviews import CourseMode, CourseOverview, CourseOverviewImageSet
+from .platform import FakeRequestCache
+
+COURSE_ID = 'course-v1:edX+DemoX+Demo_Course'
+
+pytestmark = pytest.mark.usefixtures('db')
+
+
+def run_queries(count):
+    with connection.cursor() as cursor:
+        for __ in range(count):
+            cursor.execute('SELECT 1')
+
+
+class FakePaginator:
+
+    def __init__(self, page_size):
+        self.page_size = page_size
+
+    def get_page_size(self, request):
+        return self.page_size
+
+
+class FakeView:
+    paginator = FakePaginator(page_size=5)
+
+    def __init__(self, query_count):
+        self.query_count = query_count
+
+    @query_budget(2, per_item=1)
+    def list(self, request):
+        run_queries(self.query_count)
+        return 'response'
+
+
+def test_assert_query_budget_within_budget():
+    with assert_query_budget(3) as context:
+        run_queries(3)
+    assert len(context) == 3
+
+
+def test_assert_query_budget_lists_queries_over_budget():
+    with pytest.raises(AssertionError, match=r'3 queries executed, the budget is 2:\n1\. SELECT 1'):
+        with assert_query_budget(2):
+            run_queries(3)
+
+
+def test_budget_scales_with_page_size():
+    budget = FakeView.list.query_budget
+    assert budget.limit() == 2
+    assert budget.limit(page_size=5) == 7
+
+
+@override_settings(MOBILE_QUERY_BUDGET_WARNINGS=True)
+def test_warns_over_budget():
+    with pytest.warns(QueryBudgetWarning, match='FakeView.list ran 8 queries, its budget is 7'):
+        assert FakeView(query_count=8).list(None) == 'response'
+
+
+@override_settings(MOBILE_QUERY_BUDGET_WARNINGS=True)
+def test_no_warning_within_budget(recwarn):
+    FakeView(query_count=7).list(None)
+    assert not [warning for warning in recwarn if issubclass(warning.category, QueryBudgetWarning)]
+
+
+@override_settings(MOBILE_QUERY_BUDGET_WARNINGS=False)
+def test_disabled_warnings_do_not_count(recwarn):
+    FakeView(query_count=20).list(None)
+    assert not [warning for warning in recwarn if issubclass(warning.category, QueryBudgetWarning)]
+
+
+@pytest.fixture
+def replica(mocker):
+    """
+    A second database connection, as the read replica views read from.
+    """
+    replica_connection = DatabaseWrapper({**connection.settings_dict, 'NAME': ':memory:'}, alias='replica')
+    mocker.patch.object(query_budget_module, 'connections', {'default': connection, 'replica': replica_connection})
+    mocker.patch.dict(settings.DATABASES, {'replica': replica_connection.settings_dict})
+    yield replica_connection
+    replica_connection.close()
+
+
+def test_queries_of_every_database_are_counted(replica):
+    with pytest.raises(AssertionError, match='4 queries executed, the budget is 3'):
+        with assert_query_budget(3):
+            run_queries(2)
+            with replica.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.execute('SELECT 2')
+
+
+def test_queries_of_one_database_are_counted_with_using(replica):
+    with assert_query_budget(0, using='replica'):
+        run_queries(2)
+
+
+@pytest.fixture
+def user(db):  # pylint: disable=unused-argument
+    return get_user_model().objects.create_user('learner', password='secret')
+
+
+def get(view, user, path='/', data=None, **kwargs):
+    request = APIRequestFactory().get(path, data)
+    force_authenticate(request, user=user)
+    return view.as_view()(request, **kwargs)
+
+
+@override_settings(MOBILE_PROGRESS_MAX_AGE=60)
+def test_course_progress_budget(user, mocker):
+    MobileCourseProgress.objects.create(user=user, course_id=COURSE_ID, sections=json.dumps([]), is_stale=False)
+    mocker.patch.object(api, 'get_course_overview_with_access', return_value=SimpleNamespace(id=COURSE_ID))
+    mocker.patch('mobile_api_extensions.progress.has_access', return_value=False)
+
+    with assert_query_budget(api.CourseProgressView.get.query_budget.limit()):
+        response = get(api.CourseProgressView, user, course_id=COURSE_ID)
+
+    assert response.status_code == 200
+    assert response.data == {'sections': []}
+
+
+def test_course_enrollments_budget(user, mocker):
+    enrollments = [SimpleNamespace(user=user, course_id=f'{COURSE_ID}{index}') for index in range(10)]
+    mocker.patch.object(api.UserCourseEnrollmentsList, 'get_queryset', return_value=enrollments)
+    mocker.patch.object(api, 'get_certificate_download_urls', return_value={})
+
+    with assert_query_budget(api.UserCourseEnrollmentsListExtended.list.query_budget.limit(page_size=10)):
+        response = get(api.UserCourseEnrollmentsListExtended, user)
+
+    assert response.status_code == 200
+    assert len(response.data['results']) == 10
+
+
+def test_blocks_in_course_budget(user, mocker):
+    mocker.patch.object(api, 'ensure_course_warm')
+    mocker.patch.object(api, 'has_access')
+    mocker.patch.object(api, 'get_certificate_download_urls', return_value={})
+    mocker.patch.object(api, 'get_course_summary', wraps=api.get_course_summary)
+
+    with assert_query_budget(api.BlocksInCourseViewExtended.list.query_budget.limit()):
+        response = get(api.BlocksInCourseViewExtended, user, data={'course_id': COURSE_ID})
+
+    assert response.status_code == 200
+    assert 'blocks' in response.data
+    api.get_course_summary.assert_called_once()
+
+
+@override_settings(MOBILE_ANONYMOUS_CATALOG_CACHE_TIMEOUT=0)
+def test_course_list_budget(user, mocker):
+    form = mocker.patch.object(api, 'CourseListGetForm').return_value
+    form.is_valid.return_value = True
+    form.cleaned_data = {'username': user.username, 'org': None, 'filter_': None, 'search_term': None}
+    courses = [SimpleNamespace(id=f'{COURSE_ID}{index}', name='Course') for index in range(10)]
+    mocker.patch.object(api, 'list_courses', return_value=courses)
+
+    with assert_query_budget(api.CourseListViewExtended.list.query_budget.limit(page_size=10)):
+        response = get(api.CourseListViewExtended, user)
+
+    assert response.status_code == 200
+    assert len(response.data['results']) == 10
+
+
+@override_settings(MOBILE_EXCHANGE_RATE_LIMITS={
+    'ip': {'capacity': 10, 'refill_rate': 1}, 'client': {'capacity': 10, 'refill_rate': 1},
+})
+def test_authorization_code_exchange_budget(user, mocker):
+    authorization_code = MobileUserAuth.objects.create(user=user).set_authorization_code()
+    mocker.patch.object(views, 'is_enabled_mobile', return_value=True)
+    mocker.patch.object(views.AuthorizationCodeExchangeView, 'create_access_token', return_value={'access_token': 'a'})
+    request = APIRequestFactory().post('/', {'authorization_code': authorization_code, 'client_id': 'mobile'})
+
+    with assert_query_budget(views.AuthorizationCodeExchangeView.post.query_budget.limit()):
+        response = views.AuthorizationCodeExchangeView.as_view()(request)
+
+    assert response.status_code == 200
+    assert not MobileUserAuth.objects.get(user=user).authorization_code
+
+
+@pytest.fixture
+def catalog_platform(stub, mocker):
+    """
+    Serve the stand-in course overviews as the visible courses, users can see
+    the courses available on mobile.
+    """
+    cache.clear()
+    catalog._catalogs.clear()  # pylint: disable=protected-access
+    FakeRequestCache.namespaces.clear()
+    stub.apply({
+        'lms.djangoapps': {'branding': SimpleNamespace(
+            get_visible_courses=lambda org, filter_: CourseOverview.objects.all(),
+        )},
+        'lms.djangoapps.courseware.access': {
+            'has_access': lambda user, action, course, course_key=None: course.mobile_available,
+        },
+        'openedx.core.lib.api.view_utils': {'LazySequence': lambda iterable, est_len: list(iterable)},
+    })
+    mocker.patch.object(access, 'RequestCache', FakeRequestCache)
+    mocker.patch.object(utils, 'get_current_site_id', return_value=1)
+    mocker.patch.object(utils, 'get_site_config', return_value=SimpleNamespace(
+        catalog_visibility_permission='see_in_catalog',
+    ))
+    yield
+    cache.clear()
+    catalog._catalogs.clear()  # pylint: disable=protected-access
+
+
+def add_courses(count):
+    start = CourseOverview.objects.count()
+    for index in range(start, start + count):
+        course = CourseOverview.objects.create(id=f'{COURSE_ID}{index:03}', mobile_available=bool(index % 2))
+        CourseMode.objects.create(course=course, mode_slug='audit')
+        CourseOverviewImageSet.objects.create(course_overview=course)
+
+
+def count_get_courses_queries(user):
+    """
+    Return the number of queries of `get_courses` with a cold catalog, with
+    the catalog built by another user and with the cached accessible ids.
+    """
+    catalog.invalidate_catalogs()
+    counts = []
+    for requester in (get_user_model().objects.create_user(f'other{CourseOverview.objects.count()}'), user, user):
+        FakeRequestCache.namespaces.clear()
+        with assert_query_budget(api.CourseListViewExtended.list.query_budget.base) as context:
+            courses = utils.get_courses(requester)
+        assert [course.id for course in courses] == list(
+            CourseOverview.objects.filter(mobile_available=True).order_by('id').values_list('id', flat=True)
+        )
+        counts.append(len(context))
+    return counts
+
+
+@override_settings(MOBILE_CATALOG_CHUNK_SIZE=500)
+def test_get_courses_queries_do_not_grow_with_the_courses(catalog_platform, user):  # pylint: disable=unused-argument
+    add_courses(3)
+    few_courses = count_get_courses_queries(user)
+    add_courses(30)
+
+    assert count_get_courses_queries(user) == few_courses == [2, 1, 0]
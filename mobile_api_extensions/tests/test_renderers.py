@@ -0,0 +1,150 @@
+"""
+Tests for the plugin renderers and response compression.
+"""
+import datetime
+import gzip
+import json
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from rest_framework.renderers import JSONRenderer
+
+from mobile_api_extensions import renderers
+from mobile_api_extensions.renderers import FastJSONRenderer, compress_response
+
+DATA = {
+    'name': 'Demo',
+    'start': datetime.datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.timezone.utc),
+    'price': Decimal('9.90'),
+    'blocks': [1, 2, 3],
+}
+LARGE_BODY = b'{"content": "' + b'x' * 2048 + b'"}'
+
+
+@pytest.mark.skipif(renderers.orjson is None, reason='orjson is not installed')
+def test_fast_json_renderer_matches_the_stock_renderer():
+    assert json.loads(FastJSONRenderer().render(DATA)) == json.loads(JSONRenderer().render(DATA))
+
+
+@pytest.mark.skipif(renderers.orjson is None, reason='orjson is not installed')
+def test_fast_json_renderer_keeps_microseconds_and_utc_suffix():
+    assert json.loads(FastJSONRenderer().render(DATA))['start'] == '2024-01-02T03:04:05.678000Z'
+
+
+def test_fast_json_renderer_falls_back_without_orjson(mocker):
+    mocker.patch.object(renderers, '_reported_missing_libraries', set())
+    warning = mocker.patch.object(renderers.log, 'warning')
+    with mock.patch.object(renderers, 'orjson', None):
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+        FastJSONRenderer().render(DATA)
+    warning.assert_called_once_with(mock.ANY, 'orjson', 'fast')
+
+
+def test_fast_json_renderer_falls_back_for_indented_responses():
+    rendered = FastJSONRenderer().render(DATA, 'application/json; indent=2')
+    assert rendered == JSONRenderer().render(DATA, 'application/json; indent=2')
+
+
+def test_fast_json_renderer_renders_none_as_empty_body():
+    assert FastJSONRenderer().render(None) == b''
+
+
+def compressed(accept_encoding, body=LARGE_BODY, status=200, **headers):
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+    response = HttpResponse(body, status=status, content_type='application/json')
+    for name, value in headers.items():
+        response[name] = value
+    with override_settings(MOBILE_COMPRESSION_MIN_SIZE=1024):
+        compress_response(request, response)
+    return response
+
+
+def test_brotli_is_preferred():
+    brotli = pytest.importorskip('brotli')
+    response = compressed('gzip, br')
+    assert response['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.content) == LARGE_BODY
+    assert response['Content-Length'] == str(len(response.content))
+    assert 'Accept-Encoding' in response['Vary']
+
+
+def test_gzip_without_brotli():
+    response = compressed('gzip, br;q=0')
+    assert response['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.content) == LARGE_BODY
+
+
+def test_gzip_when_brotli_is_missing(mocker):
+    mocker.patch.object(renderers, '_reported_missing_libraries', set())
+    mocker.patch.object(renderers, 'brotli', None)
+    warning = mocker.patch.object(renderers.log, 'warning')
+
+    assert compressed('gzip, br')['Content-Encoding'] == 'gzip'
+    compressed('gzip, br')
+
+    warning.assert_called_once_with(mock.ANY, 'brotli', 'brotli')
+
+
+def test_strong_etag_is_weakened():
+    assert compressed('gzip', ETag='"v1"')['ETag'] == 'W/"v1"'
+
+
+@pytest.mark.parametrize('accept_encoding, body, status, headers', [
+    ('identity', LARGE_BODY, 200, {}),
+    ('gzip', b'{}', 200, {}),
+    ('gzip', LARGE_BODY, 404, {}),
+    ('gzip', LARGE_BODY, 200, {'Content-Encoding': 'br'}),
+])
+def test_response_is_left_alone(accept_encoding, body, status, headers):
+    response = compressed(accept_encoding, body, status, **headers)
+    assert response.content == body
+    assert response.get('Content-Encoding') == headers.get('Content-Encoding')
+
+
+def test_compression_is_disabled_without_min_size():
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+    response = HttpResponse(LARGE_BODY)
+    with override_settings(MOBILE_COMPRESSION_MIN_SIZE=None):
+        compress_response(request, response)
+    assert response.content == LARGE_BODY
+
+
+def test_message_pack_round_trip():
+    msgpack = pytest.importorskip('msgpack')
+    assert msgpack.unpackb(renderers.MessagePackRenderer().render(DATA)) == {
+        'name': 'Demo',
+        'start': '2024-01-02T03:04:05.678000Z',
+        'price': 9.9,
+        'blocks': [1, 2, 3],
+    }
+
+
+def test_cbor_round_trip():
+    cbor2 = pytest.importorskip('cbor2')
+    assert cbor2.loads(renderers.CBORRenderer().render(DATA)) == {
+        'name': 'Demo',
+        'start': DATA['start'],
+        'price': Decimal('9.90'),
+        'blocks': [1, 2, 3],
+    }
+
+
+def test_cbor_treats_naive_datetimes_as_utc():
+    cbor2 = pytest.importorskip('cbor2')
+    naive = datetime.datetime(2024, 1, 2, 3, 4, 5)
+    assert cbor2.loads(renderers.CBORRenderer().render({'start': naive}))['start'] == naive.replace(
+        tzinfo=datetime.timezone.utc
+    )
+
+
+@pytest.mark.parametrize('renderer_class', [renderers.MessagePackRenderer, renderers.CBORRenderer])
+def test_binary_renderers_render_none_as_empty_body(renderer_class):
+    assert renderer_class().render(None) == b''
+
+
+def test_binary_renderers_need_their_library():
+    assert (renderers.MessagePackRenderer in renderers.BINARY_RENDERER_CLASSES) == (renderers.msgpack is not None)
+    assert (renderers.CBORRenderer in renderers.BINARY_RENDERER_CLASSES) == (renderers.cbor2 is not None)
@@ -0,0 +1,143 @@
+"""
+Tests for the asynchronous account deactivation.
+"""
+import logging
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from mobile_api_extensions import api, retirement, tasks
+from mobile_api_extensions.retirement import JOB_FAILED, JOB_PENDING, JOB_SUCCEEDED, get_job_status, set_job_status
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def account_utils(stub):
+    utils = mock.Mock()
+    stub.apply({'openedx.core.djangoapps.user_api.accounts.utils': {
+        'retire_dot_oauth2_models': utils.retire_dot_oauth2_models,
+        'create_retirement_request_and_deactivate_account': utils.create_retirement_request_and_deactivate_account,
+    }})
+    return utils
+
+
+@pytest.fixture
+def retirement_platform(stub, account_utils, mocker):
+    """
+    Stub the retirement, preference and notification helpers used by the task.
+    """
+    platform = SimpleNamespace(
+        account_utils=account_utils,
+        ace=mock.Mock(),
+        recipient=mock.Mock(),
+        get_base_template_context=mock.Mock(return_value={}),
+        retirement_statuses=mock.Mock(),
+    )
+    platform.retirement_statuses.filter.return_value.first.return_value = None
+    stub.apply({
+        'edx_ace': {'ace': platform.ace},
+        'edx_ace.recipient': {'Recipient': platform.recipient},
+        'openedx.core.djangoapps.ace_common.template_context': {
+            'get_base_template_context': platform.get_base_template_context,
+        },
+        'openedx.core.djangoapps.lang_pref': {'LANGUAGE_KEY': 'pref-lang'},
+        'openedx.core.djangoapps.user_api.message_types': {'DeletionNotificationMessage': mock.Mock()},
+        'openedx.core.djangoapps.user_api.models': {
+            'UserRetirementStatus': SimpleNamespace(objects=platform.retirement_statuses),
+        },
+        'openedx.core.djangoapps.user_api.preferences.api': {'get_user_preference': lambda user, key: None},
+    })
+    platform.user = SimpleNamespace(id=7, email='learner@example.com', profile=SimpleNamespace(name='Learner'))
+    mocker.patch.object(retirement, 'User').objects.select_related.return_value.get.return_value = platform.user
+    return platform
+
+
+@override_settings(MOBILE_ASYNC_DEACTIVATION=True, ALLOWED_HOSTS=['testserver'])
+def test_async_deactivation_returns_a_job(account_utils, mocker, db):  # pylint: disable=unused-argument
+    schedule_task = mocker.patch.object(tasks, 'schedule_task')
+    mocker.patch.object(api, 'reverse', side_effect=lambda name, kwargs: f'/deactivate_logout/{kwargs["job_id"]}/')
+    user = get_user_model().objects.create_user('learner', password='secret')
+    request = APIRequestFactory().post('/deactivate_logout/', {'password': 'secret'})
+    SessionMiddleware(lambda request: None).process_request(request)
+    force_authenticate(request, user=user)
+
+    response = api.DeactivateLogoutViewExtended.as_view()(request)
+
+    assert response.status_code == 202
+    job_id = response.data['job_id']
+    assert response.data['status_url'] == f'http://testserver/deactivate_logout/{job_id}/'
+    assert get_job_status(job_id) == JOB_PENDING
+    assert not get_user_model().objects.get(pk=user.pk).has_usable_password()
+    account_utils.retire_dot_oauth2_models.assert_called_once_with(user)
+    schedule_task.assert_called_once_with(tasks.deactivate_account, user.id, job_id, 1)
+
+
+def test_status_view():
+    set_job_status('job', JOB_PENDING)
+    view = api.DeactivationStatusView.as_view()
+
+    response = view(APIRequestFactory().get('/deactivate_logout/job/'), job_id='job')
+    assert response.status_code == 200
+    assert response.data == {'status': JOB_PENDING}
+
+    assert view(APIRequestFactory().get('/deactivate_logout/unknown/'), job_id='unknown').status_code == 404
+
+
+def test_finish_deactivation_uses_the_site_of_the_request(retirement_platform, db):  # pylint: disable=unused-argument
+    site = Site.objects.create(domain='mobile.example.com', name='Mobile')
+
+    retirement.finish_deactivation(7, 'job', site.id)
+
+    assert get_job_status('job') == JOB_SUCCEEDED
+    retirement_platform.get_base_template_context.assert_called_once_with(site)
+    retirement_platform.account_utils.create_retirement_request_and_deactivate_account.assert_called_once()
+    retirement_platform.ace.send.assert_called_once()
+    retirement_platform.recipient.assert_called_once_with(lms_user_id=0, email_address='learner@example.com')
+
+
+def test_job_fails_on_the_last_attempt(retirement_platform, caplog, db):  # pylint: disable=unused-argument
+    set_job_status('job', JOB_PENDING)
+    retirement_platform.ace.send.side_effect = ConnectionError
+
+    with pytest.raises(ConnectionError):
+        retirement.finish_deactivation(7, 'job', 1, last_attempt=False)
+    assert get_job_status('job') == JOB_PENDING
+
+    # The first attempt created the retirement request, which replaced the email.
+    retirement_platform.user.email = 'retired__user_7@retired.invalid'
+    retirement_platform.retirement_statuses.filter.return_value.first.return_value = SimpleNamespace(
+        original_email='learner@example.com',
+    )
+    retirement_platform.recipient.reset_mock()
+    with caplog.at_level(logging.ERROR), pytest.raises(ConnectionError):
+        retirement.finish_deactivation(7, 'job', 1, last_attempt=True)
+    assert get_job_status('job') == JOB_FAILED
+    assert 'retire_user' in caplog.text
+    retirement_platform.account_utils.create_retirement_request_and_deactivate_account.assert_called_once()
+    retirement_platform.recipient.assert_called_once_with(lms_user_id=0, email_address='learner@example.com')
+
+
+def test_retry_sends_the_notice_to_the_original_email(retirement_platform, db):  # pylint: disable=unused-argument
+    retirement_platform.user.email = 'retired__user_7@retired.invalid'
+    retirement_platform.retirement_statuses.filter.return_value.first.return_value = SimpleNamespace(
+        original_email='learner@example.com',
+    )
+
+    retirement.finish_deactivation(7, 'job', 1, last_attempt=False)
+
+    assert get_job_status('job') == JOB_SUCCEEDED
+    retirement_platform.account_utils.create_retirement_request_and_deactivate_account.assert_not_called()
+    retirement_platform.recipient.assert_called_once_with(lms_user_id=0, email_address='learner@example.com')
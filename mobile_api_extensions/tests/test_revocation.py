@@ -0,0 +1,139 @@
+"""
+Tests for the bulk revocation of mobile credentials.
+"""
+from datetime import datetime, timezone
+
+import pytest
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+
+from mobile_api_extensions import admin
+from mobile_api_extensions.models import MobileUserAuth
+from mobile_api_extensions.revocation import revoke_mobile_credentials
+
+from .oauth import AccessToken, OAuthApplication, RefreshToken
+
+OLD = datetime(2024, 1, 1, tzinfo=timezone.utc)
+NEW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+MOBILE_CLIENT_IDS = ['mobile', 'other']
+
+pytestmark = pytest.mark.usefixtures('mobile_clients')
+
+
+@pytest.fixture
+def mobile_clients():
+    with override_settings(MOBILE_OAUTH_CLIENT_IDS=MOBILE_CLIENT_IDS):
+        yield
+
+
+@pytest.fixture
+def credentials(db):  # pylint: disable=unused-argument
+    """
+    Three users with an authorization code, the first two with tokens of the
+    two mobile clients with different ages, the first one also with a token
+    of a backend service.
+    """
+    mobile = OAuthApplication.objects.create(client_id='mobile')
+    other = OAuthApplication.objects.create(client_id='other')
+    service = OAuthApplication.objects.create(client_id='service')
+    users = [get_user_model().objects.create_user(f'learner{index}') for index in range(3)]
+    for user in users:
+        MobileUserAuth.objects.create(user=user, authorization_code=f'code-{user.username}')
+    for user, application, created in ((users[0], mobile, OLD), (users[1], other, NEW), (users[0], service, OLD)):
+        access_token = AccessToken.objects.create(user=user, application=application, created=created)
+        RefreshToken.objects.create(user=user, application=application, access_token=access_token, created=created)
+    return users
+
+
+def remaining_codes():
+    return set(MobileUserAuth.objects.filter(authorization_code__isnull=False).values_list('user__username', flat=True))
+
+
+def mobile_token_users(token_model):
+    return set(token_model.objects.filter(
+        application__client_id__in=MOBILE_CLIENT_IDS
+    ).values_list('user__username', flat=True))
+
+
+def test_dry_run_only_counts(credentials):  # pylint: disable=unused-argument
+    assert revoke_mobile_credentials(dry_run=True) == {
+        'authorization_codes': 3, 'refresh_tokens': 2, 'access_tokens': 2,
+    }
+    assert revoke_mobile_credentials(dry_run=True, all_applications=True) == {
+        'authorization_codes': 3, 'refresh_tokens': 3, 'access_tokens': 3,
+    }
+    assert len(remaining_codes()) == 3
+    assert AccessToken.objects.count() == RefreshToken.objects.count() == 3
+
+
+def test_user_filter_clears_codes_and_mobile_tokens_of_the_users(credentials):
+    counts = revoke_mobile_credentials(user_ids=[credentials[0].id, credentials[2].id], batch_size=1)
+
+    assert counts == {'authorization_codes': 2, 'refresh_tokens': 1, 'access_tokens': 1}
+    assert remaining_codes() == {'learner1'}
+    assert mobile_token_users(AccessToken) == {'learner1'}
+    assert AccessToken.objects.filter(application__client_id='service').exists()
+
+
+@pytest.mark.parametrize('filters, revoked_user', [
+    ({'client_ids': ['mobile']}, 'learner0'),
+    ({'created_before': NEW}, 'learner0'),
+    ({'created_after': NEW}, 'learner1'),
+])
+def test_token_filters_only_clear_matched_codes(credentials, filters, revoked_user):  # pylint: disable=unused-argument
+    assert revoke_mobile_credentials(dry_run=True, **filters) == {
+        'authorization_codes': 1, 'refresh_tokens': 1, 'access_tokens': 1,
+    }
+
+    revoke_mobile_credentials(**filters)
+
+    assert remaining_codes() == {'learner0', 'learner1', 'learner2'} - {revoked_user}
+    assert revoked_user not in mobile_token_users(AccessToken)
+    assert revoked_user not in mobile_token_users(RefreshToken)
+
+
+def test_refresh_tokens_are_deleted_before_access_tokens(credentials):  # pylint: disable=unused-argument
+    progress = []
+
+    revoke_mobile_credentials(progress=lambda label, total: progress.append(label))
+
+    assert progress == ['authorization_codes', 'refresh_tokens', 'access_tokens']
+    assert not mobile_token_users(RefreshToken)
+    assert not mobile_token_users(AccessToken)
+
+
+def test_all_applications_is_explicit(credentials):  # pylint: disable=unused-argument
+    with override_settings(MOBILE_OAUTH_CLIENT_IDS=[]), pytest.raises(ValueError):
+        revoke_mobile_credentials()
+    with pytest.raises(ValueError):
+        revoke_mobile_credentials(client_ids=['mobile'], all_applications=True)
+
+    revoke_mobile_credentials(all_applications=True)
+    assert not AccessToken.objects.exists()
+
+
+def test_command_keeps_other_applications_unless_asked(credentials):  # pylint: disable=unused-argument
+    call_command('revoke_mobile_tokens', '--all', '--pause', '0')
+    assert list(AccessToken.objects.values_list('application__client_id', flat=True)) == ['service']
+
+    with pytest.raises(CommandError):
+        call_command('revoke_mobile_tokens', '--all', '--all-applications', '--client', 'mobile')
+    with override_settings(MOBILE_OAUTH_CLIENT_IDS=[]), pytest.raises(CommandError):
+        call_command('revoke_mobile_tokens', '--all')
+
+    call_command('revoke_mobile_tokens', '--all', '--all-applications', '--pause', '0')
+    assert not AccessToken.objects.exists()
+
+
+def test_admin_action_revokes_in_a_task(credentials, mocker):
+    schedule_task = mocker.patch.object(admin, 'schedule_task')
+    model_admin = admin.MobileUserAuthAdmin(MobileUserAuth, AdminSite())
+    message_user = mocker.patch.object(model_admin, 'message_user')
+
+    model_admin.revoke_credentials(None, MobileUserAuth.objects.filter(user=credentials[0]))
+
+    schedule_task.assert_called_once_with(admin.revoke_user_credentials, [credentials[0].id])
+    message_user.assert_called_once_with(None, 'Revoking the credentials of 1 users in the background.')
+    assert AccessToken.objects.count() == 3
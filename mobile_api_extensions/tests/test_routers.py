@@ -0,0 +1,40 @@
+"""
+Tests for the read replica database router.
+"""
+from django.db import transaction
+from django.test import override_settings
+
+from mobile_api_extensions.models import MobileCourseProgress, MobileUserAuth
+from mobile_api_extensions.routers import MobileReadReplicaRouter, read_replica
+
+router = MobileReadReplicaRouter()
+
+
+@override_settings(MOBILE_READ_REPLICA_DATABASE='replica', MOBILE_READ_REPLICA_PRIMARY_MODELS=())
+def test_reads_use_replica_inside_read_replica_block(db):  # pylint: disable=unused-argument
+    assert router.db_for_read(MobileUserAuth) is None
+    with read_replica():
+        assert router.db_for_read(MobileUserAuth) == 'replica'
+        assert router.db_for_write(MobileUserAuth) is None
+    assert router.db_for_read(MobileUserAuth) is None
+
+
+@override_settings(MOBILE_READ_REPLICA_DATABASE='replica', MOBILE_READ_REPLICA_PRIMARY_MODELS=())
+def test_reads_in_transactions_opened_inside_the_block_use_primary(db):  # pylint: disable=unused-argument
+    # The test transaction plays the part of ATOMIC_REQUESTS and does not pin the reads.
+    with read_replica():
+        with transaction.atomic():
+            assert router.db_for_read(MobileUserAuth) is None
+            with transaction.atomic():
+                assert router.db_for_read(MobileUserAuth) is None
+        assert router.db_for_read(MobileUserAuth) == 'replica'
+
+
+@override_settings(
+    MOBILE_READ_REPLICA_DATABASE='replica',
+    MOBILE_READ_REPLICA_PRIMARY_MODELS=('mobile_api_extensions.MobileCourseProgress',),
+)
+def test_models_written_on_read_paths_use_primary(db):  # pylint: disable=unused-argument
+    with read_replica():
+        assert router.db_for_read(MobileCourseProgress) is None
+        assert router.db_for_read(MobileUserAuth) == 'replica'
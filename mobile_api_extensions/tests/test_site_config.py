@@ -0,0 +1,65 @@
+"""
+Tests for the per-site configuration snapshot.
+"""
+import pytest
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.test import override_settings
+
+from mobile_api_extensions import site_config
+from mobile_api_extensions.cache import ProcessCache
+
+
+@pytest.fixture
+def site_values(mocker):
+    """
+    Stub the configuration of the current site, returns its mutable values.
+    """
+    values = {'COURSE_CATALOG_VISIBILITY_PERMISSION': 'see_exists', 'ENABLE_MOBILE_THIRD_PARTY_AUTH': True}
+    mocker.patch.object(site_config, 'get_current_site_id', return_value=1)
+    mocker.patch.object(site_config, 'tpa_is_enabled', return_value=True)
+    mocker.patch.object(site_config.configuration_helpers, 'get_value', side_effect=values.get)
+    cache.clear()
+    yield values
+    cache.clear()
+
+
+def use_process(mocker, process_cache):
+    mocker.patch.object(site_config, '_site_configs', process_cache)
+
+
+@override_settings(COURSE_CATALOG_VISIBILITY_PERMISSION='see_exists')
+def test_snapshot_is_kept_in_process(site_values, mocker):
+    use_process(mocker, ProcessCache(timeout=300))
+    assert site_config.get_site_config().catalog_visibility_permission == 'see_exists'
+
+    site_values['COURSE_CATALOG_VISIBILITY_PERMISSION'] = 'see_in_catalog'
+    assert site_config.get_site_config().catalog_visibility_permission == 'see_exists'
+
+
+@override_settings(COURSE_CATALOG_VISIBILITY_PERMISSION='see_exists')
+def test_refresh_reaches_other_processes(site_values, mocker):
+    saving_process, other_process = ProcessCache(timeout=300), ProcessCache(timeout=300)
+    use_process(mocker, other_process)
+    assert site_config.get_site_config().catalog_visibility_permission == 'see_exists'
+
+    site_values['COURSE_CATALOG_VISIBILITY_PERMISSION'] = 'see_in_catalog'
+    use_process(mocker, saving_process)
+    site_config.refresh_site_config(1)
+
+    use_process(mocker, other_process)
+    assert site_config.get_site_config().catalog_visibility_permission == 'see_in_catalog'
+
+
+def test_site_request_serves_the_site_outside_of_requests(mocker, db):  # pylint: disable=unused-argument
+    site = Site.objects.create(domain='mobile.example.com', name='Mobile')
+    mocker.patch.object(site_config, 'get_current_request', return_value=None)
+    set_current_request = mocker.patch.object(site_config, 'set_current_request')
+
+    with site_config.site_request(site.id) as served_site:
+        assert served_site == site
+        request = set_current_request.call_args[0][0]
+        assert request.site == site
+        assert request.META['HTTP_HOST'] == 'mobile.example.com'
+
+    set_current_request.assert_called_with(None)
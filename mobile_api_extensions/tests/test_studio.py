@@ -0,0 +1,49 @@
+"""
+Tests for the Studio publish hook and the LMS task it sends.
+"""
+from unittest import mock
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+
+from mobile_api_extensions import tasks
+from mobile_api_extensions.studio import signals as studio_signals
+from mobile_api_extensions.studio.apps import MobileApiExtensionsStudioConfig
+
+COURSE_ID = 'course-v1:edX+DemoX+Demo_Course'
+
+
+def test_studio_hook_requires_the_lms_queue():
+    config = MobileApiExtensionsStudioConfig('mobile_api_extensions.studio', mock.Mock(__path__=['.']))
+    with override_settings(MOBILE_PUBLISH_CELERY_QUEUE=None), pytest.raises(ImproperlyConfigured):
+        config.ready()
+
+
+def test_publish_is_sent_to_the_lms_queue(mocker, db):  # pylint: disable=unused-argument
+    send_task = mocker.patch.object(studio_signals.current_app, 'send_task')
+
+    with override_settings(MOBILE_PUBLISH_CELERY_QUEUE='edx.lms.core.default'):
+        studio_signals.SignalHandler.course_published.send(sender=None, course_key=COURSE_ID)
+        send_task.assert_not_called()
+        # Commit of the publish transaction.
+        for __, callback, *___ in studio_signals.transaction.get_connection().run_on_commit:
+            callback()
+
+    send_task.assert_called_once_with(
+        'mobile_api_extensions.tasks.refresh_published_course', args=(COURSE_ID,), queue='edx.lms.core.default',
+    )
+
+
+@override_settings(MOBILE_WARM_COURSE_CACHES_ON_PUBLISH=True, MOBILE_OFFLINE_PACKAGES_ENABLED=True)
+def test_refresh_published_course_schedules_the_lms_tasks(mocker):
+    mocker.patch.object(tasks, 'CourseKey').from_string.side_effect = lambda key: key
+    forget_course_warm = mocker.patch.object(tasks, 'forget_course_warm')
+    schedule_task = mocker.patch.object(tasks, 'schedule_task')
+    schedule_course_package_build = mocker.patch.object(tasks, 'schedule_course_package_build')
+
+    tasks.refresh_published_course(COURSE_ID)
+
+    forget_course_warm.assert_called_once_with(COURSE_ID)
+    schedule_task.assert_called_once_with(tasks.warm_course_caches, COURSE_ID)
+    schedule_course_package_build.assert_called_once_with(COURSE_ID)
@@ -0,0 +1,103 @@
+"""
+Tests for running list views inside another API request.
+"""
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from rest_framework.exceptions import PermissionDenied, Throttled
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import BasePermission, IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.serializers import IntegerField, Serializer
+from rest_framework.throttling import BaseThrottle
+
+from mobile_api_extensions import api
+from mobile_api_extensions.subviews import init_view, list_page, sub_request
+
+
+class DenyAll(BasePermission):
+    def has_permission(self, request, view):
+        return False
+
+
+class ThrottleAll(BaseThrottle):
+    def allow_request(self, request, view):
+        return False
+
+
+class NumberSerializer(Serializer):
+    value = IntegerField(source='*')
+
+
+class NumbersView(ListAPIView):
+    permission_classes = ()
+    throttle_classes = ()
+    serializer_class = NumberSerializer
+    pagination_class = None
+
+    def get_queryset(self):
+        return list(range(int(self.request.query_params.get('count', 3))))
+
+
+def launch_request(user=None, **query_params):
+    request = Request(RequestFactory().get('/v1/app_launch/', query_params))
+    request.user = user or mock.Mock(is_authenticated=True)
+    request.auth = None
+    return request
+
+
+def test_sub_request_copies_the_query_parameters():
+    request = launch_request(page='2')
+    copy = sub_request(request, username='learner')
+    assert copy.query_params.dict() == {'page': '2', 'username': 'learner'}
+    assert request.query_params.dict() == {'page': '2'}
+    assert copy.user is request.user
+    assert copy._request is not request._request  # pylint: disable=protected-access
+
+
+def test_init_view_runs_on_its_own_request():
+    request = launch_request()
+    view = init_view(NumbersView, request, query_params={'count': '2'}, username='learner')
+    assert view.request is not request
+    assert view.kwargs == {'username': 'learner'}
+    assert list_page(view) == ([0, 1], [{'value': 0}, {'value': 1}])
+
+
+@pytest.mark.parametrize('view_attrs, user, error', [
+    ({'permission_classes': (DenyAll,)}, None, PermissionDenied),
+    ({'permission_classes': (IsAuthenticated,)}, AnonymousUser(), PermissionDenied),
+    ({'throttle_classes': (ThrottleAll,)}, None, Throttled),
+])
+def test_init_view_checks_permissions_and_throttles(view_attrs, user, error):
+    view_class = type('RestrictedNumbersView', (NumbersView,), view_attrs)
+    with pytest.raises(error):
+        init_view(view_class, launch_request(user=user))
+
+
+def test_app_launch_builds_its_sections_in_the_request_thread(mocker):
+    threads = set()
+
+    def record_thread(result):
+        return lambda *args, **kwargs: threads.add(threading.get_ident()) or result
+
+    enrollments = [SimpleNamespace(course_overview=SimpleNamespace(id=course_id)) for course_id in ('a', 'b')]
+    mocker.patch.object(api, 'init_view', side_effect=lambda view_class, *args, **kwargs: view_class)
+    mocker.patch.object(api, 'list_page', side_effect=lambda view: record_thread((
+        enrollments if view is api.UserCourseEnrollmentsListExtended else [], view.__name__
+    ))())
+    mocker.patch.object(api, 'get_course_summary', side_effect=lambda *args: record_thread({})())
+    mocker.patch.object(api.AppLaunchView, '_get_progress', side_effect=record_thread([]))
+    request = launch_request(include_progress='true')
+
+    response = api.AppLaunchView().get(request)
+
+    assert threads == {threading.get_ident()}
+    assert response.data == {
+        'enrollments': 'UserCourseEnrollmentsListExtended',
+        'courses': 'CourseListViewExtended',
+        'course_summaries': {'a': {'sections': []}, 'b': {'sections': []}},
+    }
@@ -0,0 +1,49 @@
+"""
+Tests for the plugin tasks.
+"""
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from mobile_api_extensions import tasks
+
+
+@pytest.fixture
+def student(stub, mocker):
+    """
+    Stub the student models and activation email helper, returns the users by id.
+    """
+    users = {7: SimpleNamespace(id=7, is_active=False)}
+    send = mock.Mock()
+    stub.apply({
+        'common.djangoapps.student.models': {'UserProfile': SimpleNamespace(
+            DoesNotExist=LookupError, objects=mock.Mock(get=lambda user: SimpleNamespace(user=user)),
+        )},
+        'common.djangoapps.student.views': {'compose_and_send_activation_email': send},
+    })
+    user_model = mocker.patch.object(tasks, 'User')
+    user_model.DoesNotExist = LookupError
+    user_model.objects.get.side_effect = lambda id: users[id]  # pylint: disable=redefined-builtin
+    return SimpleNamespace(users=users, send=send)
+
+
+def test_activation_email_is_sent_for_the_site_of_the_login(student, mocker):
+    site_request = mocker.patch.object(tasks, 'site_request')
+    site_request.return_value.__enter__.side_effect = lambda: student.send.assert_not_called()
+
+    tasks.send_activation_email(7, 3)
+
+    site_request.assert_called_once_with(3)
+    student.send.assert_called_once()
+    site_request.return_value.__exit__.assert_called_once()
+
+
+def test_activation_email_is_not_sent_to_active_users(student, mocker):
+    site_request = mocker.patch.object(tasks, 'site_request')
+    student.users[7].is_active = True
+
+    tasks.send_activation_email(7, 3)
+
+    site_request.assert_not_called()
+    student.send.assert_not_called()
@@ -0,0 +1,65 @@
+"""
+Tests for the token bucket throttles of the code exchange endpoint.
+"""
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory, override_settings
+
+from mobile_api_extensions.throttling import ExchangeClientThrottle, ExchangeIPThrottle
+
+RATE_LIMITS = {
+    'ip': {'capacity': 2, 'refill_rate': 0.5},
+    'client': {'capacity': 2, 'refill_rate': 0.5},
+}
+
+
+@pytest.fixture(autouse=True)
+def rate_limits():
+    cache.clear()
+    with override_settings(MOBILE_EXCHANGE_RATE_LIMITS=RATE_LIMITS):
+        yield
+    cache.clear()
+
+
+@pytest.fixture
+def now():
+    with mock.patch('mobile_api_extensions.throttling.time.time', return_value=1000.0) as time_mock:
+        yield time_mock
+
+
+def exchange_request(client_id='mobile-app', ip='10.0.0.1'):
+    return RequestFactory().post('/oauth2/exchange_access_token/', {'client_id': client_id}, REMOTE_ADDR=ip)
+
+
+def test_bucket_allows_bursts_up_to_capacity(now):  # pylint: disable=unused-argument
+    throttle = ExchangeIPThrottle()
+    assert [throttle.allow_request(exchange_request(), None) for __ in range(3)] == [True, True, False]
+    assert throttle.wait() == pytest.approx(2)
+
+
+def test_bucket_refills_over_time(now):
+    throttle = ExchangeIPThrottle()
+    for __ in range(2):
+        throttle.allow_request(exchange_request(), None)
+    assert not throttle.allow_request(exchange_request(), None)
+
+    now.return_value += 2
+    assert throttle.allow_request(exchange_request(), None)
+    assert not throttle.allow_request(exchange_request(), None)
+
+
+def test_buckets_are_kept_per_ip(now):  # pylint: disable=unused-argument
+    throttle = ExchangeIPThrottle()
+    for __ in range(2):
+        throttle.allow_request(exchange_request(ip='10.0.0.1'), None)
+    assert not throttle.allow_request(exchange_request(ip='10.0.0.1'), None)
+    assert throttle.allow_request(exchange_request(ip='10.0.0.2'), None)
+
+
+def test_malformed_client_ids_get_no_bucket(now):  # pylint: disable=unused-argument
+    throttle = ExchangeClientThrottle()
+    request = exchange_request(client_id='not a client id')
+    assert throttle.get_cache_key(request, None) is None
+    assert all(throttle.allow_request(request, None) for __ in range(5))
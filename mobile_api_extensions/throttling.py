@@ -0,0 +1,81 @@
+"""
+Request throttling for mobile_api_extensions endpoints.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache as default_cache
+from rest_framework.throttling import BaseThrottle
+
+from .forms import CLIENT_ID_RE
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket throttle stored in the Django cache.
+
+    Every bucket holds up to `capacity` tokens and regains `refill_rate` tokens
+    per second. The bucket is read and written without a lock, so concurrent
+    workers may let a few extra requests through, which is acceptable for a
+    front door whose purpose is to shed bursts cheaply.
+    """
+    cache = default_cache
+    scope = None
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_rate(self):
+        """
+        Return (capacity, refill_rate) configured for the throttle scope.
+        """
+        rate = settings.MOBILE_EXCHANGE_RATE_LIMITS[self.scope]
+        return rate['capacity'], rate['refill_rate']
+
+    def get_cache_key(self, request, view):
+        raise NotImplementedError('.get_cache_key() must be overridden')
+
+    def allow_request(self, request, view):
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        capacity, refill_rate = self.get_rate()
+        now = time.time()
+        tokens, updated = self.cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        else:
+            self.wait_seconds = (1 - tokens) / refill_rate
+        self.cache.set(key, (tokens, now), int(capacity / refill_rate) + 1)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class ExchangeIPThrottle(TokenBucketThrottle):
+    """
+    Limit authorization code exchanges per client IP.
+    """
+    scope = 'ip'
+
+    def get_cache_key(self, request, view):
+        return f'mobile_api_extensions.throttle.exchange.ip.{self.get_ident(request)}'
+
+
+class ExchangeClientThrottle(TokenBucketThrottle):
+    """
+    Limit authorization code exchanges per OAuth client id.
+
+    Malformed client ids get no bucket of their own, they are rejected by the form.
+    """
+    scope = 'client'
+
+    def get_cache_key(self, request, view):
+        client_id = request.POST.get('client_id', '')
+        if not CLIENT_ID_RE.match(client_id):
+            return None
+        return f'mobile_api_extensions.throttle.exchange.client.{client_id}'
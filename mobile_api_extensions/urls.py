@@ -1,58 +1,78 @@
 """
 mobile_api_extensions URL Configuration
+
+Views are imported on their first request, see `lazy.LazyView`.
 """
 from django.conf import settings
-from django.urls import include, path, re_path
-from rest_framework.routers import SimpleRouter
-from common.djangoapps.util.views import ensure_valid_course_key
+from django.urls import path, re_path
 
-from .api import (
-    BlocksInCourseViewExtended,
-    CommentViewSetExtended,
-    UserCourseEnrollmentsListExtended,
-    CourseDetailViewExtended,
-    CourseListViewExtended,
-    CourseProgressView,
-    DeactivateLogoutViewExtended,
-)
+from .lazy import lazy_api_view, lazy_view
 
-ROUTER = SimpleRouter()
-ROUTER.register("comments", CommentViewSetExtended, basename="comment-extended")
+API = 'mobile_api_extensions.api.'
 
 
 urlpatterns = [
     re_path(
         r'^(?P<api_version>v(1|0.5))/users/' + settings.USERNAME_PATTERN + '/course_enrollments/$',
-        UserCourseEnrollmentsListExtended.as_view(),
+        lazy_api_view(API + 'UserCourseEnrollmentsListExtended'),
         name='courseenrollment-detail'
     ),
-    re_path(r'^discussion/v1/', include(ROUTER.urls)),
+    re_path(
+        r'^discussion/v1/comments/$',
+        lazy_api_view(
+            API + 'CommentViewSetExtended',
+            actions={'get': 'list', 'post': 'create'},
+            basename='comment-extended', detail=False, suffix='List',
+        ),
+        name='comment-extended-list'
+    ),
+    re_path(
+        r'^discussion/v1/comments/(?P<comment_id>[^/.]+)/$',
+        lazy_api_view(
+            API + 'CommentViewSetExtended',
+            actions={'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'},
+            basename='comment-extended', detail=True, suffix='Instance',
+        ),
+        name='comment-extended-detail'
+    ),
     path(
         'v1/blocks/',
-        BlocksInCourseViewExtended.as_view(),
+        lazy_api_view(API + 'BlocksInCourseViewExtended'),
         kwargs={'hide_access_denials': True},
         name="blocks_in_course"
     ),
     path(
         'v2/blocks/',
-        BlocksInCourseViewExtended.as_view(),
+        lazy_api_view(API + 'BlocksInCourseViewExtended'),
         name="blocks_in_course"
     ),
     re_path(r'^v1/courses/{}/progress/$'.format(settings.COURSE_ID_PATTERN),
-        ensure_valid_course_key(CourseProgressView.as_view()),
+        lazy_api_view(API + 'CourseProgressView', decorators=['common.djangoapps.util.views.ensure_valid_course_key']),
         name='api-course-progress'
     ),
+    re_path(r'^v1/courses/{}/offline_package/$'.format(settings.COURSE_ID_PATTERN),
+        lazy_api_view(
+            API + 'CourseOfflinePackageView', decorators=['common.djangoapps.util.views.ensure_valid_course_key']
+        ),
+        name='api-course-offline-package'
+    ),
     path(
         'courses/v1/courses/',
-        CourseListViewExtended.as_view(),
+        lazy_api_view(API + 'CourseListViewExtended'),
         name="course-list"
     ),
     re_path(fr'^v1/courses/{settings.COURSE_KEY_PATTERN}$',
-        CourseDetailViewExtended.as_view(),
+        lazy_api_view(API + 'CourseDetailViewExtended'),
         name="course-detail"
     ),
     path(
-        'user/v1/accounts/deactivate_logout/', DeactivateLogoutViewExtended.as_view(),
+        'user/v1/accounts/deactivate_logout/', lazy_api_view(API + 'DeactivateLogoutViewExtended'),
         name='deactivate_logout'
     ),
+    path(
+        'user/v1/accounts/deactivate_logout/<str:job_id>/', lazy_api_view(API + 'DeactivationStatusView'),
+        name='deactivate_logout_status'
+    ),
+    path('v1/app_launch/', lazy_api_view(API + 'AppLaunchView'), name='app-launch'),
+    path('metrics/', lazy_view('mobile_api_extensions.metrics.metrics_view'), name='metrics'),
 ]
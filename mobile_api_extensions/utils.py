@@ -1,25 +1,33 @@
-import search
+"""
+Helpers for mobile_api_extensions.
+
+This module is imported at startup by the signal receivers, so the heavy
+catalog dependencies (branding, courseware access, search) are imported
+inside the functions that need them.
+"""
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from crum import get_current_request, set_current_request
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
 from edx_django_utils.monitoring import function_trace
-from lms.djangoapps import branding
-from lms.djangoapps.courseware.access import has_access
-from lms.djangoapps.course_api.api import get_effective_user
-from lms.djangoapps.courseware.courses import get_courses
-from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
-from openedx.core.lib.api.view_utils import LazySequence
 
-from common.djangoapps.third_party_auth import is_enabled as tpa_is_enabled
+from .access import has_access
+from .catalog import get_catalog, get_catalog_version, iter_chunked
+from .metrics import record_cache
+from .site_config import get_current_site_id, get_site_config
 
 
-@function_trace('get_courses')
-def get_courses(user, org=None, filter_=None, permissions=None):
+def _visible_courses(org=None, filter_=None):
     """
-    Return a LazySequence of courses available, optionally filtered by org code
-    (case-insensitive) or a set of permissions to be satisfied for the specified
-    user.
+    Return the queryset of the courses visible on the current site.
     """
+    from lms.djangoapps import branding  # pylint: disable=import-outside-toplevel
 
-    courses = branding.get_visible_courses(
+    return branding.get_visible_courses(
         org=org,
         filter_=filter_,
     ).prefetch_related(
@@ -28,26 +36,80 @@ def get_courses(user, org=None, filter_=None, permissions=None):
         'image_set'
     )
 
+
+def _catalog_permissions(permissions=None):
+    """
+    Return the permissions a user needs on a course to see it in the catalog.
+    """
     permissions = set(permissions or '')
-    permission_name = configuration_helpers.get_value(
-        'COURSE_CATALOG_VISIBILITY_PERMISSION',
-        settings.COURSE_CATALOG_VISIBILITY_PERMISSION
-    )
-    permissions.add(permission_name)
+    permissions.add(get_site_config().catalog_visibility_permission)
+    return permissions
+
+
+def _accessible_ids_cache_key(user, catalog_key, permissions):
+    """
+    Return the cache key of the ids of the catalog courses the user has the permissions on.
+
+    The key changes with the catalog version, so new and changed courses are checked again.
+    """
+    scope = repr((get_catalog_version(), catalog_key, sorted(permissions))).encode()
+    return f'mobile_api_extensions.catalog_access.{user.id}.{hashlib.md5(scope).hexdigest()}'
+
 
-    courses = {c for c in courses if all(has_access(user, p, c) for p in permissions)}
+@function_trace('get_courses')
+def get_courses(user, org=None, filter_=None, permissions=None):
+    """
+    Return a LazySequence of courses available, optionally filtered by org code
+    (case-insensitive) or a set of permissions to be satisfied for the specified
+    user.
+
+    The courses are the shared `catalog.CatalogEntry` objects of the catalog,
+    ordered by id. Access is checked on the course overviews and the ids of
+    the accessible courses are cached per user and permissions for
+    `MOBILE_CATALOG_ACCESS_CACHE_TIMEOUT` seconds. When the catalog is built,
+    access is checked on the overviews it loads. Otherwise the overviews are
+    loaded `MOBILE_CATALOG_CHUNK_SIZE` at a time, without their modes and
+    image sets.
+    """
+    from openedx.core.lib.api.view_utils import LazySequence  # pylint: disable=import-outside-toplevel
+
+    course_qs = _visible_courses(org, filter_)
+    permissions = _catalog_permissions(permissions)
+    catalog_key = (get_current_site_id(), org, repr(sorted(filter_.items())) if filter_ else None)
+    cache_key = _accessible_ids_cache_key(user, catalog_key, permissions)
+    accessible_ids = cache.get(cache_key)
+    record_cache('catalog_access', 'miss' if accessible_ids is None else 'hit')
+
+    checked = {}
+
+    def check_access(course):
+        checked[str(course.id)] = all(has_access(user, p, course) for p in permissions)
+
+    catalog = get_catalog(catalog_key, course_qs, visit=None if accessible_ids is not None else check_access)
+    if accessible_ids is None:
+        if catalog and not checked:
+            # The catalog came from the process cache, the access checks do not read the modes and image sets.
+            access_qs = course_qs.prefetch_related(None).select_related(None)
+            for course in iter_chunked(access_qs, settings.MOBILE_CATALOG_CHUNK_SIZE):
+                check_access(course)
+        accessible_ids = {course_id for course_id, accessible in checked.items() if accessible}
+        cache.set(cache_key, accessible_ids, getattr(settings, 'MOBILE_CATALOG_ACCESS_CACHE_TIMEOUT', 60))
+    courses = [entry for entry in catalog if str(entry.id) in accessible_ids]
     return LazySequence(
         iter(courses),
         est_len=len(courses)
     )
 
 
-def _filter_by_search(course_queryset, search_term):
+def _search_course_ids(search_term):
     """
-    Filters a course queryset by the specified search term.
+    Return the ids of the courses matching the search term, or None if courses
+    are not filtered by search.
     """
+    import search  # pylint: disable=import-outside-toplevel
+
     if not settings.FEATURES['ENABLE_COURSEWARE_SEARCH'] or not search_term:
-        return course_queryset
+        return None
 
     # Return all the results, 10K is the maximum allowed value for ElasticSearch.
     # We should use 0 after upgrading to 1.1+:
@@ -59,7 +121,19 @@ def _filter_by_search(course_queryset, search_term):
         size=results_size_infinity,
     )
 
-    search_courses_ids = {course['data']['id'] for course in search_courses['results']}
+    return {course['data']['id'] for course in search_courses['results']}
+
+
+def _filter_by_search(course_queryset, search_term):
+    """
+    Filters a course queryset by the specified search term.
+    """
+    from openedx.core.lib.api.view_utils import LazySequence  # pylint: disable=import-outside-toplevel
+
+    search_courses_ids = _search_course_ids(search_term)
+    if search_courses_ids is None:
+        return course_queryset
+
     courses = [course for course in course_queryset if str(course.id) in search_courses_ids]
     return LazySequence(
         iter(courses),
@@ -103,24 +177,55 @@ def list_courses(request,
             checking if each permission specified is granted for the username.
 
     Return value:
-        Yield `CourseOverview` objects representing the collection of courses.
+        Yield `catalog.CatalogEntry` objects representing the collection of courses.
     """
+    from lms.djangoapps.course_api.api import get_effective_user  # pylint: disable=import-outside-toplevel
+
     user = get_effective_user(request.user, username)
     course_qs = get_courses(user, org=org, filter_=filter_, permissions=permissions)
     course_qs = _filter_by_search(course_qs, search_term)
     return course_qs
 
 
-def is_enabled_mobile():
-    """Check whether mobile third party authentication has been enabled. """
+def iter_courses(request,
+                 username,
+                 org=None,
+                 filter_=None,
+                 search_term=None,
+                 permissions=None,
+                 chunk_size=500):
+    """
+    Yield the course overviews of the courses `list_courses` returns, ordered by id.
 
-    # We do this import internally to avoid initializing settings prematurely
-    from django.conf import settings as django_settings
+    Only `chunk_size` course overviews are loaded at a time, so the memory
+    used does not grow with the size of the catalog. The user, permissions and
+    search results are resolved when this function is called, the courses
+    while the returned iterator is consumed.
+    """
+    from lms.djangoapps.course_api.api import get_effective_user  # pylint: disable=import-outside-toplevel
 
-    return tpa_is_enabled() and configuration_helpers.get_value(
-        "ENABLE_MOBILE_THIRD_PARTY_AUTH",
-        django_settings.FEATURES.get("ENABLE_MOBILE_THIRD_PARTY_AUTH")
-    )
+    user = get_effective_user(request.user, username)
+    course_qs = _visible_courses(org, filter_)
+    permissions = _catalog_permissions(permissions)
+    search_courses_ids = _search_course_ids(search_term)
+
+    def _iter_courses():
+        for course in iter_chunked(course_qs, chunk_size):
+            if search_courses_ids is not None and str(course.id) not in search_courses_ids:
+                continue
+            if all(has_access(user, p, course) for p in permissions):
+                yield course
+
+    return _iter_courses()
+
+
+def is_enabled_mobile():
+    """
+    Check whether mobile third party authentication has been enabled.
+
+    The decision is part of the site configuration snapshot, see `site_config`.
+    """
+    return get_site_config().mobile_third_party_auth_enabled
 
 
 def build_mobile_auth_url(base_url, authorization_code, status):
@@ -128,3 +233,29 @@ def build_mobile_auth_url(base_url, authorization_code, status):
 
     separator = '&' if '?' in base_url else '?'
     return f"{base_url}{separator}AuthorizationCode={authorization_code}&Status={status}"
+
+
+def run_concurrently(tasks, max_workers):
+    """
+    Call every function of the `tasks` dict and return a dict of their results.
+
+    With more than one worker the functions run in threads which share the
+    current request (for site aware helpers) and context variables (e.g. the
+    read replica routing) and close their own database connections when done.
+    Exceptions are re-raised in the calling thread.
+    """
+    if max_workers <= 1 or len(tasks) <= 1:
+        return {name: func() for name, func in tasks.items()}
+
+    request = get_current_request()
+
+    def _run(func):
+        set_current_request(request)
+        try:
+            return func()
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        futures = {name: executor.submit(copy_context().run, _run, func) for name, func in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
@@ -2,12 +2,13 @@ import logging
 
 from django.conf import settings
 from django.contrib.auth import REDIRECT_FIELD_NAME
-from django.contrib.auth.models import User
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
+from django.db import transaction
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from django.utils.translation import gettext as _
 from oauthlib.oauth2.rfc6749.tokens import BearerToken
 from oauth2_provider.settings import oauth2_settings
 from social_django.utils import psa
@@ -24,14 +25,18 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from common.djangoapps.student.models import UserProfile
-from common.djangoapps.student.views import compose_and_send_activation_email
-from common.djangoapps.third_party_auth import pipeline, provider
+from common.djangoapps.third_party_auth import pipeline
 from openedx.core.djangoapps.oauth_dispatch import adapters
 
 from .models import MobileUserAuth
 from .forms import AuthorizationCodeExchangeForm
-from .utils import build_mobile_auth_url
+from .metrics import record_code_exchange, record_sso_completion
+from .providers import get_mobile_login_url, get_provider_from_pipeline
+from .query_budget import query_budget
+from .site_config import get_current_site_id
+from .tasks import schedule_task, send_activation_email
+from .throttling import ExchangeClientThrottle, ExchangeIPThrottle
+from .utils import build_mobile_auth_url, is_enabled_mobile
 
 log = logging.getLogger(__name__)
 
@@ -39,6 +44,8 @@ URL_NAMESPACE = getattr(settings, setting_name('URL_NAMESPACE'), None) or 'socia
 MOBILE_ERROR_MSG = "error"
 MOBILE_SUCCESS_MSG = "success"
 
+_token_generators = {}
+
 
 # pylint: disable=unused-variable,unused-argument,logging-fstring-interpolation
 def _populate_authorization_code(user):
@@ -62,25 +69,24 @@ def _send_activation_email(user, request):
     """
     Send activation email for non active users.
 
+    Only the provider check runs inside the request, composing and sending
+    the email is deferred to `tasks.send_activation_email`.
+
     Arguments:
         user (`django.contrib.auth.models.User` obj): edX user object.
         request (HTTPRequest)
     """
 
-    try:
-        profile = UserProfile.objects.get(user=user)
-    except UserProfile.DoesNotExist:
-        log.exception(f'Could not find UserProfile for {user}')
+    if user_is_active(user):
+        return
+
+    running_pipeline = pipeline.get(request)
+    current_provider = get_provider_from_pipeline(running_pipeline)
+    if current_provider.skip_email_verification:
+        user.is_active = True
+        user.save(update_fields=['is_active'])
     else:
-        activated = user_is_active(user)
-        running_pipeline = pipeline.get(request)
-        current_provider = provider.Registry.get_from_pipeline(running_pipeline)
-        if current_provider.skip_email_verification and not activated:
-            user.is_active = True
-            user.save()
-            activated = True
-        if not activated:
-            compose_and_send_activation_email(user, profile)
+        schedule_task(send_activation_email, user.id, get_current_site_id())
 
 
 def mobile_do_complete(backend, login, user=None, redirect_name='next',  # pylint: disable=keyword-arg-before-vararg
@@ -124,6 +130,7 @@ def mobile_do_complete(backend, login, user=None, redirect_name='next',  # pylin
 
     mobile_status_message = (MOBILE_SUCCESS_MSG if mobile_auth_code
                              else MOBILE_ERROR_MSG)
+    record_sso_completion(backend.name, mobile_status_message)
 
     if mobile_auth_code:
         url = reverse('sso-deeplink')
@@ -166,6 +173,24 @@ def auth_mobile(request, backend):
     return do_auth(request.backend, redirect_name=REDIRECT_FIELD_NAME)
 
 
+def get_token_generator(expires_in):
+    """
+    Return a shared `BearerToken` generator for the given token lifetime.
+
+    Neither `BearerToken` nor the DOT validator keep per-request state, so one
+    instance per validator class and expiry is reused across requests.
+    """
+    validator_class = oauth2_settings.OAUTH2_VALIDATOR_CLASS
+    key = (validator_class, expires_in)
+    token_generator = _token_generators.get(key)
+    if token_generator is None:
+        token_generator = _token_generators.setdefault(key, BearerToken(
+            expires_in=expires_in,
+            request_validator=validator_class(),
+        ))
+    return token_generator
+
+
 class AuthorizationCodeExchangeView(APIView):
     """
     Exchange Authorization code for access token.
@@ -180,12 +205,16 @@ class AuthorizationCodeExchangeView(APIView):
         SAML authorization through SSO for mobile client
     """
     http_method_names = ['post']
+    throttle_classes = (ExchangeIPThrottle, ExchangeClientThrottle)
     dot_adapter = adapters.DOTAdapter()
 
     @method_decorator(csrf_exempt)
     def dispatch(self, *args, **kwargs):
+        if not is_enabled_mobile():
+            raise Http404
         return super().dispatch(*args, **kwargs)
 
+    @query_budget(12)
     def post(self, request, *args, **kwargs):
         """
         Exchange Authorization code for access token.
@@ -193,24 +222,30 @@ class AuthorizationCodeExchangeView(APIView):
         form = AuthorizationCodeExchangeForm(request=request, oauth2_adapter=self.dot_adapter, data=request.POST)
 
         if not form.is_valid():
+            record_code_exchange(f'invalid_{sorted(form.errors)[0]}')
             return self.error_response(form.errors)
 
         user = form.cleaned_data["user"]
         authorization_code = form.cleaned_data["authorization_code"]
         client = form.cleaned_data["client"]
-        token = self.create_access_token(request, user, client)
-        self._clean_authorization_code(authorization_code)
+        with transaction.atomic():
+            if not self._clean_authorization_code(authorization_code):
+                record_code_exchange('already_used')
+                return self.error_response({'authorization_code': [_('Authorization code has already been used.')]})
+            token = self.create_access_token(request, user, client)
+        record_code_exchange('success')
         return self.access_token_response(token)
 
+    def throttled(self, request, wait):
+        record_code_exchange('throttled')
+        super().throttled(request, wait)
+
     def create_access_token(self, request, user, client):
         """
         Create and return a new access token.
         """
         _days = 24 * 60 * 60
-        token_generator = BearerToken(
-            expires_in=settings.OAUTH_EXPIRE_PUBLIC_CLIENT_DAYS * _days,
-            request_validator=oauth2_settings.OAUTH2_VALIDATOR_CLASS(),
-        )
+        token_generator = get_token_generator(settings.OAUTH_EXPIRE_PUBLIC_CLIENT_DAYS * _days)
         self._populate_create_access_token_request(request, user, client)
         return token_generator.create_token(request, refresh_token=True)
 
@@ -227,7 +262,7 @@ class AuthorizationCodeExchangeView(APIView):
         request object to match these expectations
         """
         request.user = user
-        request.scopes = [scope for scope in settings.OAUTH2_DEFAULT_SCOPES]  # noqa: E501, pylint: disable=unnecessary-comprehension
+        request.scopes = list(settings.OAUTH2_DEFAULT_SCOPES)
         request.client = client
         request.state = None
         request.refresh_token = None
@@ -240,10 +275,13 @@ class AuthorizationCodeExchangeView(APIView):
 
         Args:
             authorization_code (str): MobileUserAuth.authorization_code
+
+        Returns:
+            bool: False if the code has already been cleaned by a concurrent request.
         """
-        user = User.objects.get(mobile_user_auth__authorization_code=authorization_code)
-        user.mobile_user_auth.authorization_code = None
-        user.save()
+        return bool(
+            MobileUserAuth.objects.filter(authorization_code=authorization_code).update(authorization_code=None)
+        )
 
     def error_response(self, form_errors, **kwargs):
         """
@@ -256,7 +294,9 @@ class AuthorizationCodeExchangeView(APIView):
 def redirect_to_mobile_deeplink(request):
     """Redirect to mobile app SSO endpoint."""
 
-    redirect_url = build_mobile_auth_url(settings.MOBILE_SSO_DEEPLINK, request.GET.get('AuthorizationCode'), request.GET.get('Status'))
+    redirect_url = build_mobile_auth_url(
+        settings.MOBILE_SSO_DEEPLINK, request.GET.get('AuthorizationCode'), request.GET.get('Status')
+    )
     response = HttpResponse(redirect_url, status=302)
     response['Location'] = redirect_url
     return response
@@ -264,20 +304,5 @@ def redirect_to_mobile_deeplink(request):
 
 def redirect_to_mobile(request, backend_name):
     """Redirect to SSO login endpoint with next params."""
-    extra_params = {
-        REDIRECT_FIELD_NAME: settings.MOBILE_SSO_DEEPLINK,
-    }
-
-    if backend_name == 'tpa-saml':
-        extra_params.update({
-            "auth_entry": "login",
-            "idp": request.GET.get("idp", "default")
-        })
-
-    redirect_url = pipeline._get_url(  # pylint: disable=protected-access
-        'social_login_override',
-        backend_name,
-        extra_params=extra_params
-    )
+    redirect_url = get_mobile_login_url(backend_name, idp=request.GET.get("idp", "default"))
     return redirect(redirect_url)
-
@@ -0,0 +1,106 @@
+"""
+Cache warming for the course data served by the mobile course views.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import single_flight_call
+from .metrics import record_cache
+from .utils import run_concurrently
+
+log = logging.getLogger(__name__)
+
+
+def warm_course(course_key):
+    """
+    Precompute the data `CourseListViewExtended`, `CourseDetailViewExtended`
+    and `BlocksInCourseViewExtended` need for a course.
+
+    Loads (and if needed creates) the `CourseOverview` with its image set and
+    the collected block structure the mobile outline is built from.
+    """
+    # Deferred imports, the block structure and overview apps are heavy and only
+    # needed by the worker and the management command.
+    from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
+    from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+    course_overview = CourseOverview.get_from_id(course_key)
+    course_overview.image_urls  # pylint: disable=pointless-statement
+    get_course_in_cache(course_key)
+
+
+def _warm_course_safely(course_key):
+    """
+    Warm a course, logging instead of raising failures.
+
+    Returns True if the course was warmed.
+    """
+    try:
+        warm_course(course_key)
+    except Exception:  # pylint: disable=broad-except
+        log.exception('Failed to warm mobile caches for course %s', course_key)
+        return False
+    return True
+
+
+def warm_courses(course_keys, max_workers):
+    """
+    Warm many courses with at most `max_workers` courses processed at once.
+
+    Returns a dict of course key strings to a success flag.
+    """
+    return run_concurrently({
+        str(course_key): (lambda course_key=course_key: _warm_course_safely(course_key))
+        for course_key in course_keys
+    }, max_workers)
+
+
+def get_course_warm_key(name, course_key):
+    return f'mobile_api_extensions.warm.{name}.{course_key}'
+
+
+def warm_once(name, course_key, func):
+    """
+    Call `func` to fill the caches of a course unless it was called within the
+    last `MOBILE_COURSE_WARM_TIMEOUT` seconds.
+
+    Concurrent requests hitting a cold course wait for a single call instead
+    of all loading the course from the modulestore at once. Failures are left
+    for the view to report.
+    """
+    warm_key = get_course_warm_key(name, course_key)
+    if cache.get(warm_key):
+        record_cache('course_warm', 'hit')
+        return
+    record_cache('course_warm', 'miss')
+    try:
+        single_flight_call(warm_key, func)
+    except Exception:  # pylint: disable=broad-except
+        return
+    cache.set(warm_key, True, getattr(settings, 'MOBILE_COURSE_WARM_TIMEOUT', 3600))
+
+
+def ensure_course_warm(course_key):
+    """
+    Make sure the course overview and block structure of a course are cached.
+    """
+    warm_once('course', course_key, lambda: warm_course(course_key))
+
+
+def ensure_course_overview_warm(course_key):
+    """
+    Make sure the course overview of a course is cached.
+    """
+    # Deferred import, the course overview models are not loaded at startup.
+    from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+    warm_once('overview', course_key, lambda: CourseOverview.get_from_id(course_key))
+
+
+def forget_course_warm(course_key):
+    """
+    Let the next request to the course check its caches again, e.g. after a publish.
+    """
+    cache.delete_many([get_course_warm_key(name, course_key) for name in ('course', 'overview')])
@@ -15,6 +15,7 @@ with open("README.rst", "r") as fh:
 
 VERSION = get_version('mobile_api_extensions', '__init__.py')
 APP_NAME = "mobile_api_extensions = mobile_api_extensions.apps:MobileApiExtensionsConfig"
+STUDIO_APP_NAME = "mobile_api_extensions_studio = mobile_api_extensions.studio.apps:MobileApiExtensionsStudioConfig"
 
 
 setup(
@@ -41,9 +42,23 @@ setup(
     ],
     packages=[
         'mobile_api_extensions',
+        'mobile_api_extensions.management',
+        'mobile_api_extensions.management.commands',
+        'mobile_api_extensions.studio',
+        'mobile_api_extensions.studio.settings',
     ],
     include_package_data=True,
     install_requires=load_requirements('requirements/base.in'),
+    extras_require={
+        'binary': ['cbor2', 'msgpack'],
+        'brotli': ['brotli'],
+        'fast': ['orjson'],
+        'metrics': ['prometheus-client'],
+    },
     zip_safe=False,
-    entry_points={"lms.djangoapp": [APP_NAME]},
+    entry_points={
+        "lms.djangoapp": [APP_NAME],
+        # Studio only forwards course_published to the LMS workers.
+        "cms.djangoapp": [STUDIO_APP_NAME],
+    },
 )